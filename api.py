@@ -0,0 +1,444 @@
+"""Headless HTTP API over the ATS engine.
+
+A dependency-free ASGI application exposing what the Streamlit tabs do, for
+integrations that need to call the scorer programmatically. Run it with any
+ASGI server, for example::
+
+    uvicorn api:app --port 8000
+    python api.py --port 8000        # same, if uvicorn is installed
+
+Endpoints (``POST`` unless noted):
+
+* ``/score`` - ``{"resume": {...}, "job_description": "..."}`` -> ATS result
+  plus the selected projects (Tab 2)
+* ``/select-projects`` - ``{"job_description": "...", "tech_skill_matches": [...],
+  "limit": 5, "max_similarity": 0.25}`` -> ranked projects
+* ``/extract`` - raw file bytes (``?filename=cv.pdf`` or a ``Content-Type``
+  header), or ``{"filename": "...", "content": "<base64>"}`` -> CV text plus
+  Auto-Fill fields (Tab 1); ``truncated`` is true (with ``pages_read``,
+  ``page_count`` and ``truncated_by``: ``"page_limit"`` or ``"time_budget"``)
+  when a long PDF hit the page or time budget
+* ``/render`` - ``{"resume": {...}, "format": "html" | "pdf" | "docx"}`` -> the
+  resume document (Tab 4); ``photo`` may be base64. PDFs whose text the core
+  fonts cannot show carry a ``warning`` (an ``X-Resume-Warning`` header for
+  single requests)
+* ``GET /metrics`` - stage timings and cache hits in Prometheus text format
+  (collected when ``ATS_METRICS=1``)
+
+Sending a JSON array instead of an object processes a batch and returns an
+array of results in the same order. Extraction runs in a process pool and at
+most ``MAX_CONCURRENT_EXTRACTIONS`` files are parsed at once, so a large PDF
+only ever occupies one worker; scoring and rendering run in threads.
+Requests beyond ``MAX_CONCURRENT_REQUESTS`` are rejected with 503.
+"""
+
+import argparse
+import asyncio
+import base64
+import binascii
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from urllib.parse import parse_qs
+
+import metrics
+from ats_engine import PROJECT_MAX_SIMILARITY, TOP_PROJECTS, analyze, select_projects
+from cv_extract import EXTRACTION_CACHE, KIND_BY_MIME, POOL_CONTEXT, content_hash, extract_cv, kind_from_name
+from cv_fields import extract_fields
+from resume_docx import render_docx
+from resume_pdf import render_pdf, unencodable_chars
+from resume_template import render_resume
+
+MAX_BODY_BYTES = 20 * 1024 * 1024
+MAX_BATCH_ITEMS = 100
+MAX_CONCURRENT_REQUESTS = 64
+EXTRACT_WORKERS = os.cpu_count() or 1
+MAX_CONCURRENT_EXTRACTIONS = EXTRACT_WORKERS
+
+# Shape of the resume object: scalar fields may be strings or numbers (sent on as strings)
+RESUME_TEXT_FIELDS = ("name", "email", "phone", "location", "linkedin", "github", "portfolio", "summary")
+RESUME_LIST_FIELDS = ("technical_skills", "certifications")
+RESUME_ENTRY_FIELDS = {
+    "experiences": ("title", "company", "start", "end"),
+    "projects": ("title", "description"),
+    "education": ("degree", "institution", "start", "end", "gpa"),
+}
+
+logger = logging.getLogger(__name__)
+
+_extract_pool = None
+_extract_pool_lock = threading.Lock()
+# Created on first use so they bind to the server's event loop
+_request_slots = None
+_extraction_slots = None
+
+
+@dataclass
+class Upload:
+    """A raw ``/extract`` request body; JSON clients cannot produce one."""
+    filename: str
+    kind: str
+    data: bytes
+
+
+class HttpError(Exception):
+    """An error answered with ``status`` and a JSON ``{"error": message}`` body."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _get_extract_pool():
+    global _extract_pool
+    with _extract_pool_lock:
+        if _extract_pool is None:
+            _extract_pool = ProcessPoolExecutor(max_workers=EXTRACT_WORKERS, mp_context=POOL_CONTEXT)
+        return _extract_pool
+
+
+def _get_slots():
+    global _request_slots, _extraction_slots
+    if _request_slots is None:
+        _request_slots = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        _extraction_slots = asyncio.Semaphore(MAX_CONCURRENT_EXTRACTIONS)
+    return _request_slots, _extraction_slots
+
+
+def _reset_extract_pool(pool):
+    """Drop a pool whose worker crashed so the next request starts a fresh one."""
+    global _extract_pool
+    with _extract_pool_lock:
+        if _extract_pool is pool:
+            _extract_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _shutdown():
+    global _extract_pool
+    with _extract_pool_lock:
+        if _extract_pool is not None:
+            _extract_pool.shutdown(cancel_futures=True)
+            _extract_pool = None
+
+
+def _extract_in_worker(data, kind):
+    extraction = extract_cv(data, kind, parallel=False)
+    return extraction, extract_fields(extraction.text)
+
+
+def _require(item, name, expected=None):
+    """Return ``item[name]``; 400 if the item is not an object, the field is missing or not ``expected``."""
+    if not isinstance(item, dict) or name not in item:
+        raise HttpError(400, f"Missing field: {name}")
+    if expected is not None and not isinstance(item[name], expected):
+        raise HttpError(400, f"{name} must be {'an object' if expected is dict else 'a string'}")
+    return item[name]
+
+
+def _optional(item, name, expected, default, description):
+    """Return ``item[name]`` or ``default``; 400 if it is present but not ``expected``."""
+    value = item.get(name, default)
+    if value is not default and (not isinstance(value, expected) or isinstance(value, bool)):
+        raise HttpError(400, f"{name} must be {description}")
+    return value
+
+
+def _text(value, name):
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    raise HttpError(400, f"{name} must be a string")
+
+
+def _string_list(value, name):
+    if not isinstance(value, list) or not all(isinstance(entry, str) for entry in value):
+        raise HttpError(400, f"{name} must be a list of strings")
+    return value
+
+
+def _validate_resume(resume):
+    """Check the nested resume fields and return a copy with numbers turned into strings."""
+    resume = dict(resume)
+    for name in RESUME_TEXT_FIELDS:
+        if resume.get(name) is not None:
+            resume[name] = _text(resume[name], name)
+    for name in RESUME_LIST_FIELDS:
+        if resume.get(name) is not None:
+            resume[name] = _string_list(resume[name], name)
+    for name, fields in RESUME_ENTRY_FIELDS.items():
+        if resume.get(name) is None:
+            continue
+        if not isinstance(resume[name], list):
+            raise HttpError(400, f"{name} must be a list of objects")
+        entries = []
+        for i, entry in enumerate(resume[name]):
+            if not isinstance(entry, dict):
+                raise HttpError(400, f"{name}[{i}] must be an object")
+            entry = dict(entry)
+            for field in fields:
+                if entry.get(field) is not None:
+                    entry[field] = _text(entry[field], f"{name}[{i}].{field}")
+            for field in ("responsibilities", "keywords"):
+                if entry.get(field) is not None:
+                    entry[field] = _string_list(entry[field], f"{name}[{i}].{field}")
+            entries.append(entry)
+        resume[name] = entries
+    photo = resume.get("photo")
+    if photo is not None and not isinstance(photo, str):
+        raise HttpError(400, "photo must be a base64 string")
+    return resume
+
+
+def _project_json(project, relevance):
+    return {**project, "relevance": relevance}
+
+
+def _decode_photo(resume):
+    photo = resume.get("photo")
+    if isinstance(photo, str):
+        try:
+            resume = {**resume, "photo": base64.b64decode(photo, validate=True)}
+        except binascii.Error:
+            raise HttpError(400, "photo must be base64") from None
+    return resume
+
+
+async def score_item(item):
+    resume = _validate_resume(_require(item, "resume", dict))
+    job_description = _require(item, "job_description", str)
+    max_similarity = _optional(item, "max_similarity", (int, float), PROJECT_MAX_SIMILARITY, "a number")
+    analysis = await asyncio.to_thread(analyze, _decode_photo(resume), job_description,
+                                       max_similarity=max_similarity)
+    return {
+        "result": analysis.result.to_dict(),
+        "projects": [_project_json(p, relevance) for p, relevance in analysis.project_scores],
+    }
+
+
+async def select_projects_item(item):
+    job_description = _require(item, "job_description", str)
+    tech_skill_matches = _string_list(item.get("tech_skill_matches", []), "tech_skill_matches")
+    project_scores = await asyncio.to_thread(
+        select_projects, job_description, tech_skill_matches,
+        limit=_optional(item, "limit", int, TOP_PROJECTS, "an integer"),
+        method=_optional(item, "method", str, "bm25", "a string"),
+        max_similarity=_optional(item, "max_similarity", (int, float), PROJECT_MAX_SIMILARITY, "a number"),
+    )
+    return {"projects": [_project_json(p, relevance) for p, relevance in project_scores]}
+
+
+async def extract_item(item):
+    if isinstance(item, Upload):
+        filename, kind, data = item.filename, item.kind, item.data
+    else:
+        filename = _require(item, "filename", str)
+        kind = kind_from_name(filename)
+        content = _require(item, "content", str)
+    if kind is None:
+        raise HttpError(415, f"Unsupported file type: {filename}")
+    if not isinstance(item, Upload):
+        try:
+            data = base64.b64decode(content, validate=True)
+        except binascii.Error:
+            raise HttpError(400, "content must be base64") from None
+
+    key = f"{kind}-{content_hash(data)}"
+    text = EXTRACTION_CACHE.get(key)
+    if text is not None:
+        return {"filename": filename, "text": text, "truncated": False,
+                "fields": await asyncio.to_thread(extract_fields, text)}
+
+    _, extraction_slots = _get_slots()
+    async with extraction_slots:
+        loop = asyncio.get_running_loop()
+        pool = _get_extract_pool()
+        try:
+            extraction, fields = await loop.run_in_executor(pool, _extract_in_worker, data, kind)
+        except BrokenProcessPool:
+            _reset_extract_pool(pool)
+            raise HttpError(503, f"Could not read {filename}: the extraction worker crashed, retry shortly") from None
+        except Exception as e:
+            raise HttpError(422, f"Could not read {filename}: {e}") from None
+    response = {"filename": filename, "text": extraction.text, "truncated": extraction.truncated, "fields": fields}
+    if extraction.truncated:
+        # Partial text is not cached, so the next request parses the whole file again
+        response["pages_read"] = extraction.pages_read
+        response["page_count"] = extraction.page_count
+        response["truncated_by"] = extraction.truncated_by
+    else:
+        EXTRACTION_CACHE.put(key, extraction.text)
+    return response
+
+
+# Binary documents are base64 in JSON (batch) responses
+BINARY_RENDERERS = {
+    "pdf": (render_pdf, "application/pdf"),
+    "docx": (render_docx, "application/vnd.openxmlformats-officedocument.wordprocessingml.document"),
+}
+
+
+async def render_item(item):
+    resume = _decode_photo(_validate_resume(_require(item, "resume", dict)))
+    output_format = _optional(item, "format", str, "html", "a string")
+    if output_format in BINARY_RENDERERS:
+        render, _ = BINARY_RENDERERS[output_format]
+        response = {output_format: base64.b64encode(await asyncio.to_thread(render, resume)).decode()}
+        missing_chars = unencodable_chars(resume) if output_format == "pdf" else []
+        if missing_chars:
+            response["warning"] = (f"PDF fonts cannot show {' '.join(missing_chars)}; "
+                                   "they appear as '?'. Use the html or docx format to keep them.")
+        return response
+    if output_format != "html":
+        raise HttpError(400, f"Unknown format: {output_format}")
+    return {"html": await asyncio.to_thread(render_resume, resume)}
+
+
+ENDPOINTS = {
+    "/score": score_item,
+    "/select-projects": select_projects_item,
+    "/extract": extract_item,
+    "/render": render_item,
+}
+
+
+async def _read_body(receive):
+    chunks, size = [], 0
+    while True:
+        message = await receive()
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > MAX_BODY_BYTES:
+            raise HttpError(413, f"Request body exceeds {MAX_BODY_BYTES} bytes")
+        chunks.append(chunk)
+        if not message.get("more_body"):
+            return b"".join(chunks)
+
+
+def _parse_request(scope, body):
+    """Return ``(items, is_batch)`` for a request body."""
+    headers = dict(scope.get("headers", []))
+    content_type = headers.get(b"content-type", b"").decode("latin-1").split(";")[0].strip()
+
+    if scope["path"] == "/extract" and content_type != "application/json":
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        filename = query.get("filename", ["upload"])[0]
+        kind = KIND_BY_MIME.get(content_type) or kind_from_name(filename)
+        return [Upload(filename, kind, body)], False
+
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HttpError(400, "Request body must be JSON") from None
+    if isinstance(payload, list):
+        if len(payload) > MAX_BATCH_ITEMS:
+            raise HttpError(413, f"Batches are limited to {MAX_BATCH_ITEMS} items")
+        return payload, True
+    return [payload], False
+
+
+async def _respond(send, status, body, content_type="application/json", warning=None):
+    if not isinstance(body, bytes):
+        body = json.dumps(body).encode("utf-8")
+    headers = [(b"content-type", content_type.encode("latin-1")),
+               (b"content-length", str(len(body)).encode("latin-1"))]
+    if warning:
+        # Header values must be latin-1; the JSON body of batch responses keeps the exact characters
+        headers.append((b"x-resume-warning", warning.encode("ascii", errors="backslashreplace")))
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            _shutdown()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    """ASGI entry point."""
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    request_slots, _ = _get_slots()
+    if request_slots.locked():
+        await _respond(send, 503, {"error": "Server busy, retry shortly"})
+        return
+
+    async with request_slots:
+        try:
+            if scope["path"] == "/metrics" and scope["method"] == "GET":
+                await _respond(send, 200, metrics.prometheus_text().encode("utf-8"), metrics.PROMETHEUS_CONTENT_TYPE)
+                return
+            handler = ENDPOINTS.get(scope["path"])
+            if handler is None:
+                raise HttpError(404, f"Unknown endpoint: {scope['path']}")
+            if scope["method"] != "POST":
+                raise HttpError(405, "Use POST")
+
+            items, is_batch = _parse_request(scope, await _read_body(receive))
+            if not is_batch:
+                result = await handler(items[0])
+                if handler is render_item:
+                    warning = result.pop("warning", None)
+                    [(output_format, document)] = result.items()
+                    if output_format in BINARY_RENDERERS:
+                        await _respond(send, 200, base64.b64decode(document), BINARY_RENDERERS[output_format][1],
+                                       warning)
+                    else:
+                        await _respond(send, 200, document.encode("utf-8"), "text/html; charset=utf-8")
+                else:
+                    await _respond(send, 200, result)
+                return
+
+            # Batch items run concurrently; one bad item does not fail the others
+            results = await asyncio.gather(*(handler(item) for item in items), return_exceptions=True)
+            for i, result in enumerate(results):
+                if isinstance(result, HttpError):
+                    results[i] = {"error": result.message, "status": result.status}
+                elif isinstance(result, ValueError):
+                    results[i] = {"error": str(result), "status": 400}
+                elif isinstance(result, Exception):
+                    logger.error("Batch item %d on %s failed", i, scope["path"], exc_info=result)
+                    results[i] = {"error": "Internal error", "status": 500}
+                elif isinstance(result, BaseException):
+                    raise result
+            await _respond(send, 200, results)
+        except HttpError as e:
+            await _respond(send, e.status, {"error": e.message})
+        except ValueError as e:
+            # Raised by the engine for bad options, e.g. an unknown ranking method
+            await _respond(send, 400, {"error": str(e)})
+        except Exception:
+            logger.exception("Request to %s failed", scope["path"])
+            await _respond(send, 500, {"error": "Internal error"})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args(argv)
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("Install uvicorn (pip install uvicorn) or run api:app with another ASGI server")
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
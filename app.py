@@ -2,169 +2,80 @@ import streamlit as st
 from datetime import datetime
 import hashlib
 import json
-import re
+import os
 from io import BytesIO
-import base64
-from pypdf import PdfReader
+import zipfile
 
+import batch
+import jobs
+import metrics
+from blob_store import get_blob_store, resolve_blobs, session_memory_report
+from ats_engine import (ANALYSIS_STAGES, PROJECT_CATALOG, PROJECT_MAX_SIMILARITY, TOP_PROJECTS, IncrementalScorer,
+                        analysis_key, analyze)
+from cv_extract import KIND_BY_MIME, cached_extract, content_hash, kind_from_name
+from cv_fields import extract_fields, extract_summary
+from cv_sections import index_cv
+from photo import prepare_photo
+from resume_docx import render_docx
+from resume_pdf import render_pdf, unencodable_chars
+from resume_template import render_resume
+from session_store import get_session_store, issue_session_id, session_issued
 
 
-# All available projects
-ALL_PROJECTS = [
-    {
-        "title": "Python Data Science Foundations Project",
-        "description": "Built foundational data-science skills through Python by practicing variables, operators, loops, functions, exceptions, and object-oriented concepts. Explored data structures, logical problem-solving, and clean code habits. Strengthened analytical thinking, automation abilities, and readiness for real-world data workflows—laying a solid base for advanced analytics, machine learning, and data-driven decision-making",
-        "keywords": ["python", "data science", "programming", "analytics", "foundations", "oop"]
-    },
-    {
-        "title": "Python Programming & Data Handling Project",
-        "description": "Developed strong Python skills by working with lists, dictionaries, functions, loops, and file handling to process and analyze data efficiently. Practiced writing modular, error-resistant code and automating repetitive tasks. Strengthened logical thinking, data manipulation techniques, and foundational problem-solving abilities essential for data science and real-world analytical workflows.",
-        "keywords": ["python", "data handling", "file handling", "automation", "data manipulation", "programming"]
-    },
-    {
-        "title": "Advanced Python Data Processing Project",
-        "description": "Enhanced data-science skills by using tuples, sets, comprehensions, and lambda functions to streamline data processing tasks. Built efficient, reusable code for organizing, transforming, and analyzing datasets. Strengthened logical reasoning, pattern recognition, and automation techniques essential for data cleaning, preprocessing, and building reliable analytical pipelines in real-world data-science projects",
-        "keywords": ["python", "data processing", "lambda", "comprehensions", "preprocessing", "data cleaning"]
-    },
-    {
-        "title": "Python Data Transformation & Automation Project",
-        "description": "Applied advanced Python techniques including string manipulation, regular expressions, modules, and file operations to clean and structure raw data. Built automated scripts for extracting patterns, validating inputs, and improving data quality. Strengthened analytical thinking, precision, and workflow efficiency essential for data preprocessing, feature engineering, and real-world data-science tasks.",
-        "keywords": ["python", "automation", "regex", "data transformation", "feature engineering", "etl"]
-    },
-    {
-        "title": "Python Data Analysis & Visualization Foundations Project",
-        "description": "Explored core data-science techniques using Python by practicing data organization, conditional logic, loops, and basic visualization. Applied structured problem-solving to clean, transform, and interpret datasets. Strengthened analytical thinking, automation skills, and the ability to build clear, functional scripts—forming a strong foundation for advanced analytics, machine learning, and real-world data workflows.",
-        "keywords": ["python", "data analysis", "visualization", "analytics", "machine learning", "matplotlib"]
-    },
-    {
-        "title": "Python Exploratory Data Processing & Automation Project",
-        "description": "Strengthened data-science foundations by working with Python functions, loops, comprehensions, and file operations to clean, organize, and transform datasets. Practiced writing efficient, modular code for automating routine tasks and extracting meaningful patterns. Enhanced logical reasoning, problem-solving, and data-handling skills essential for exploratory analysis, preprocessing, and building reliable analytical workflows.",
-        "keywords": ["python", "exploratory analysis", "automation", "data processing", "eda"]
-    },
-    {
-        "title": "Python Data Cleaning & Workflow Optimization Project",
-        "description": "Applied Python techniques such as functions, loops, conditional logic, and data structures to clean, filter, and organize datasets. Built efficient, reusable code to automate common tasks and improve processing speed. Strengthened analytical thinking, data-handling precision, and problem-solving abilities essential for preparing high-quality data and supporting accurate, real-world data-science workflows.",
-        "keywords": ["python", "data cleaning", "optimization", "workflow", "automation"]
-    },
-    {
-        "title": "Python Data Processing & Function Optimization Project",
-        "description": "Developed strong data-science foundations by creating optimized functions, using loops, conditional logic, and list comprehensions to transform and analyze data. Practiced modular coding, error handling, and workflow automation. Strengthened problem-solving, pattern recognition, and data-handling efficiency—key skills for building scalable analytical processes and preparing datasets for deeper statistical and machine-learning tasks.",
-        "keywords": ["python", "optimization", "functions", "data processing", "scalability"]
-    },
-    {
-        "title": "Statistical Foundations & Data Interpretation Project",
-        "description": "Built core statistical skills by exploring measures of central tendency, variability, and data distribution. Applied Python to calculate, visualize, and interpret statistical patterns. Strengthened analytical thinking, numerical reasoning, and data-driven decision-making—key abilities for understanding datasets, identifying trends, and supporting reliable insights in real-world data-science applications.",
-        "keywords": ["statistics", "python", "data interpretation", "analytics", "patterns", "visualization"]
-    },
-    {
-        "title": "Exploratory Statistics & Data Pattern Analysis Project",
-        "description": "Strengthened statistical understanding by analyzing distributions, variability, and relationships within datasets. Used Python to compute descriptive statistics, visualize patterns, and interpret meaningful trends. Enhanced analytical reasoning, data-cleaning precision, and insight-generation skills essential for preparing datasets, validating assumptions, and supporting accurate decision-making in real-world data-science environments.",
-        "keywords": ["statistics", "eda", "python", "data analysis", "patterns"]
-    },
-    {
-        "title": "Probability Concepts & Statistical Insight Development Project",
-        "description": "Explored foundational probability principles, including events, outcomes, and rule-based calculations. Applied Python to model scenarios, compute probabilities, and interpret results. Strengthened logical reasoning, analytical thinking, and quantitative problem-solving—building essential skills for uncertainty analysis, predictive modeling, and data-driven decision-making in real-world data-science applications.",
-        "keywords": ["probability", "statistics", "python", "modeling", "predictive analytics"]
-    },
-    {
-        "title": "Probability Distributions & Data Interpretation Project",
-        "description": "Studied key probability distributions and applied Python to compute, visualize, and interpret them. Gained practical experience analyzing randomness, variability, and real-world data behavior. Strengthened quantitative reasoning, statistical modeling skills, and the ability to draw meaningful insights—essential for building accurate predictive models and performing rigorous data-science analysis.",
-        "keywords": ["probability", "distributions", "statistics", "python", "modeling", "predictive"]
-    },
-    {
-        "title": "Statistical Inference & Data Variation Analysis Project",
-        "description": "Explored statistical inference concepts using Python to analyze variability, sampling behavior, and confidence measures. Practiced interpreting patterns, validating assumptions, and understanding dataset uncertainty. Strengthened analytical reasoning, data-interpretation accuracy, and foundational statistical skills essential for drawing reliable conclusions and supporting evidence-based decision-making in data-science workflows.",
-        "keywords": ["statistics", "inference", "python", "data validation", "analytics"]
-    },
-    {
-        "title": "Hypothesis Testing & Statistical Decision-Making Project",
-        "description": "Applied core hypothesis-testing techniques using Python to compare datasets, evaluate significance, and draw evidence-based conclusions. Explored p-values, test statistics, and error types to understand real-world uncertainty. Strengthened analytical judgment, statistical reasoning, and data-validation skills essential for accurate insights and scientifically grounded decision-making in data-science applications.",
-        "keywords": ["hypothesis testing", "statistics", "python", "data validation", "analytics", "a/b testing"]
-    },
-    {
-        "title": "Multivariable Statistical Testing & Comparative Analysis Project",
-        "description": "Performed advanced statistical tests on three or more paired variables using Python to evaluate differences, relationships, and significance. Strengthened understanding of variance, dependency, and multivariable behavior. Enhanced analytical precision, data interpretation, and statistical reasoning—key skills for modeling complex datasets and generating reliable insights in real-world data-science environments.",
-        "keywords": ["statistics", "multivariable analysis", "python", "anova", "comparative analysis"]
-    },
-    {
-        "title": "Generative AI Exploration & Model Interaction Project",
-        "description": "Explored foundational generative AI concepts by interacting with Gemini models to generate text, analyze outputs, and understand prompt engineering. Strengthened skills in automation, creativity, and data interpretation. Gained practical experience leveraging AI tools for insights, content generation, and problem-solving—building essential capabilities for modern data-science and AI-driven workflows.",
-        "keywords": ["ai", "generative ai", "machine learning", "nlp", "prompt engineering", "llm"]
-    },
-    {
-        "title": "Prompt Engineering & Generative AI Optimization Project",
-        "description": "Developed effective prompt-engineering techniques to guide generative AI models in producing accurate, structured outputs. Explored instruction tuning, context design, and iterative refinement. Strengthened analytical reasoning, problem decomposition, and AI-assisted automation skills—key abilities for enhancing model performance, improving data workflows, and leveraging generative systems in modern data-science environments",
-        "keywords": ["prompt engineering", "ai", "generative ai", "optimization", "nlp", "llm"]
-    },
-    {
-        "title": "SQL Database Management & Data Querying Project",
-        "description": "Built strong foundational skills in database management by working with SQLite to create tables, insert records, and perform essential SQL queries. Strengthened understanding of structured data, relational design, and efficient data retrieval. Enhanced analytical thinking and data-handling accuracy—core abilities for real-world data science, reporting, and data-driven decision-making",
-        "keywords": ["sql", "database", "data management", "queries", "sqlite", "rdbms"]
-    },
-    {
-        "title": "NoSQL Database Operations & Document Data Management Project",
-        "description": "Gained hands-on experience with MongoDB by creating collections, inserting documents, and performing query operations. Strengthened understanding of unstructured data, schema flexibility, and efficient retrieval techniques. Enhanced analytical thinking, data organization, and database-handling skills essential for modern data-science workflows involving large-scale, semi-structured, or rapidly evolving datasets.",
-        "keywords": ["nosql", "mongodb", "database", "data management", "document database", "json"]
-    },
-    {
-        "title": "Data Visualization & Insight Communication Using Matplotlib",
-        "description": "Created clear, meaningful visualizations using Matplotlib to analyze patterns, compare variables, and communicate insights effectively. Practiced plotting techniques, customization, and visual storytelling. Strengthened analytical reasoning, data interpretation, and presentation skills—core abilities for transforming raw data into understandable narratives in real-world data-science and decision-making environments.",
-        "keywords": ["matplotlib", "data visualization", "python", "analytics", "storytelling", "charts"]
-    },
-    {
-        "title": "Advanced Data Visualization & Pattern Exploration with Matplotlib",
-        "description": "Developed advanced visualization skills using Matplotlib to explore trends, compare relationships, and present complex insights clearly. Practiced customizing plots, handling datasets, and choosing effective visual formats. Strengthened analytical interpretation, storytelling abilities, and data-driven communication—key capabilities for delivering meaningful insights in professional data-science and business decision-making environments.",
-        "keywords": ["matplotlib", "visualization", "analytics", "python", "data science", "dashboards"]
-    },
-    {
-        "title": "Data Manipulation & Analysis Using Pandas",
-        "description": "Built strong data-science skills by using Pandas to clean, filter, transform, and analyze structured datasets. Practiced handling DataFrames, performing aggregations, managing missing values, and deriving insights. Strengthened analytical thinking, data-wrangling efficiency, and problem-solving—foundational abilities for preparing high-quality data and supporting accurate, real-world analytical and machine-learning workflows.",
-        "keywords": ["pandas", "python", "data analysis", "data wrangling", "dataframes", "etl"]
-    },
-    {
-        "title": "Numerical Computing & Array Operations Using NumPy",
-        "description": "Developed strong numerical analysis skills by working with NumPy arrays, vectorized operations, indexing, and mathematical functions. Practiced efficient data handling, transformations, and computations essential for large datasets. Strengthened analytical reasoning, performance-focused coding, and foundational quantitative abilities crucial for machine learning, scientific computing, and real-world data-science applications.",
-        "keywords": ["numpy", "python", "numerical computing", "arrays", "machine learning", "linear algebra"]
-    },
-    {
-        "title": "Data Import, Export & File Handling Automation Project",
-        "description": "Strengthened data-engineering skills by reading, writing, and managing files in multiple formats using Python. Automated data-loading workflows, cleaned raw inputs, and organized datasets for analysis. Enhanced accuracy, efficiency, and problem-solving abilities—core capabilities for building reliable data pipelines and supporting real-world data-science and machine-learning processes.",
-        "keywords": ["python", "file handling", "automation", "data engineering", "etl", "pipelines"]
-    },
-    {
-        "title": "Machine Learning Model Development & Predictive Analysis Project",
-        "description": "Built and evaluated machine-learning models using Python to understand classification, regression, and performance metrics. practiced data preprocessing, feature selection, and model tuning to improve accuracy. Strengthened analytical reasoning, algorithmic understanding, and predictive insight—key skills for solving real-world problems and delivering data-driven solutions in professional data-science environments.",
-        "keywords": ["machine learning", "python", "predictive modeling", "classification", "regression", "sklearn"]
-    },
-    {
-        "title": "Advanced Machine Learning Techniques & Model Optimization Project",
-        "description": "Explored advanced machine-learning concepts by building and tuning models, evaluating performance, and applying preprocessing techniques. Strengthened skills in feature engineering, algorithm selection, and interpreting model outcomes. Enhanced analytical decision-making, predictive accuracy, and problem-solving abilities—crucial for developing reliable, high-performing machine-learning solutions in real-world data-science environments",
-        "keywords": ["machine learning", "optimization", "feature engineering", "python", "modeling", "hyperparameter tuning"]
-    },
-    {
-        "title": "Model Evaluation & Performance Improvement in Machine Learning",
-        "description": "Practiced evaluating machine-learning models using metrics, validation techniques, and error analysis to improve predictive performance. Applied preprocessing, feature scaling, and algorithm comparison to understand model behavior. Strengthened analytical reasoning, optimization skills, and data-driven decision-making—key abilities for building accurate, reliable machine-learning systems in real-world data-science applications.",
-        "keywords": ["machine learning", "model evaluation", "optimization", "python", "metrics", "cross-validation"]
-    }
-]
-
 # Main application
 st.set_page_config(page_title="ATS Resume Builder", page_icon="📄", layout="wide")
 
 st.title("📄 ATS-Optimized Resume Builder v4.0")
 st.markdown("Smart resume builder with AI-powered project selection and interview preparation")
 
+if os.environ.get('ATS_METRICS_PORT'):
+    metrics.start_metrics_server(int(os.environ['ATS_METRICS_PORT']))
+
+session_store = get_session_store()
+# The session id lives in the URL (?sid=...), so a reload or another replica finds the same saved state.
+# Only ids this app issued are accepted; anything else starts a fresh session
+if 'session_id' not in st.session_state:
+    session_id = st.experimental_get_query_params().get('sid', [''])[0]
+    if not session_issued(session_store, session_id):
+        session_id = issue_session_id(session_store)
+        st.experimental_set_query_params(sid=session_id)
+    st.session_state.session_id = session_id
+# Uploads are kept once in a shared blob store; session state only holds their references
+blob_store = get_blob_store()
+
+
+def load_state(key, default):
+    """Saved value for this session, read from the store only on first access."""
+    return session_store.get(st.session_state.session_id, key, default)
+
+
+def persist(*keys):
+    """Write session values through to the store after they change."""
+    for key in keys:
+        session_store.put(st.session_state.session_id, key, st.session_state[key])
+
+
 # Initialize session state
 if 'resume_data' not in st.session_state:
-    st.session_state.resume_data = {}
-if 'photo_data' not in st.session_state:
-    st.session_state.photo_data = None
-if 'cv_text' not in st.session_state:
-    st.session_state.cv_text = ""
+    st.session_state.resume_data = load_state('resume_data', {})
+if 'photo_ref' not in st.session_state:
+    st.session_state.photo_ref = load_state('photo_ref', None)
+if 'analysis' not in st.session_state:
+    st.session_state.analysis = load_state('analysis', None)
+if 'live_scorer' not in st.session_state:
+    st.session_state.live_scorer = None
+if 'cv_ref' not in st.session_state:
+    st.session_state.cv_ref = load_state('cv_ref', None)
 if 'selected_projects' not in st.session_state:
-    st.session_state.selected_projects = []
+    st.session_state.selected_projects = load_state('selected_projects', [])
 if 'job_description' not in st.session_state:
-    st.session_state.job_description = ""
+    st.session_state.job_description = load_state('job_description', "")
+# Ids of background jobs (see jobs.py); the jobs live in this process only, so they are not persisted
+for job_key in ('extract_job_id', 'analysis_job_id', 'batch_job_id'):
+    if job_key not in st.session_state:
+        st.session_state[job_key] = None
+# Set when a job is still running, so the script reruns at the end to poll it
+jobs_running = False
 
 # Create tabs
 tab1, tab2, tab3, tab4 = st.tabs(["📝 Fill Information", "🎯 ATS Analysis & Smart Projects", "❓ Interview Prep", "👁️ Preview & Download"])
@@ -174,46 +85,60 @@ with tab1:
     st.markdown("Upload your existing CV to **auto-fill the entire form** and extract all information")
     
     uploaded_cv = st.file_uploader("Upload CV (PDF, DOCX, TXT)", type=['pdf', 'docx', 'txt'], key="cv_uploader")
+    cv_text = blob_store.get_text(st.session_state.cv_ref)
     
     if uploaded_cv is not None:
         try:
-            if uploaded_cv.type == "text/plain":
-                st.session_state.cv_text = uploaded_cv.read().decode('utf-8')
-                st.success("✅ CV uploaded successfully!")
-            elif uploaded_cv.type == "application/pdf":
-                try:
-                    # Try pypdf first (newer)
-                    try:
-                        from pypdf import PdfReader
-                        pdf_reader = PdfReader(uploaded_cv)
-                        st.session_state.cv_text = ""
-                        for page in pdf_reader.pages:
-                            st.session_state.cv_text += page.extract_text() + "\n"
-                        st.success("✅ PDF uploaded successfully!")
-                    except ImportError:
-                        # Fallback to PyPDF2 (older)
-                        import PyPDF2
-                        pdf_reader = PyPDF2.PdfReader(uploaded_cv)
-                        st.session_state.cv_text = ""
-                        for page in pdf_reader.pages:
-                            st.session_state.cv_text += page.extract_text() + "\n"
-                        st.success("✅ PDF uploaded successfully!")
-                except Exception as pdf_error:
-                    st.error(f"PDF reading error: {str(pdf_error)}")
-                    st.warning("💡 To fix: Run `pip install pypdf` or `pip install PyPDF2` in terminal")
-            elif uploaded_cv.type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-                try:
-                    import docx
-                    doc = docx.Document(uploaded_cv)
-                    st.session_state.cv_text = "\n".join([para.text for para in doc.paragraphs])
+            previous_cv_text = cv_text
+            cv_kind = KIND_BY_MIME.get(uploaded_cv.type) or kind_from_name(uploaded_cv.name)
+            cv_job = None
+            if cv_kind in ("txt", "pdf", "docx"):
+                # Parsed in a background job; a new file replaces (and cancels) the previous one.
+                # Extraction is cached by content hash, so reruns with the same file skip parsing
+                cv_bytes = uploaded_cv.getvalue()
+                upload_key = f"{cv_kind}-{content_hash(cv_bytes)}"
+                cv_job = jobs.get_job(st.session_state.extract_job_id)
+                if cv_job is None or cv_job.key != upload_key:
+                    if cv_job is not None:
+                        cv_job.cancel()
+                    cv_job = jobs.submit(cached_extract, cv_bytes, cv_kind, stages=("extract",), key=upload_key)
+                    st.session_state.extract_job_id = cv_job.id
+                cv_job.wait(jobs.POLL_SECONDS)
+            
+            if cv_job is None:
+                pass
+            elif not cv_job.done:
+                st.progress(cv_job.progress, text=f"📄 Reading your {cv_kind.upper()}... {cv_job.progress:.0%}")
+                jobs_running = True
+            elif cv_job.status == "done":
+                cv_text = cv_job.result.text
+                if cv_kind == "txt":
+                    st.success("✅ CV uploaded successfully!")
+                elif cv_job.result.truncated_by == "page_limit":
+                    st.warning(f"⚠️ Only the first {cv_job.result.pages_read} of {cv_job.result.page_count} PDF pages "
+                               "were read; longer CVs are cut at that limit. Shorten the file to include the rest.")
+                elif cv_job.result.truncated:
+                    st.warning(f"⚠️ Only {cv_job.result.pages_read} of {cv_job.result.page_count} PDF pages could be read "
+                               "in time; the rest were skipped. Re-upload the file to try again, or shorten it.")
+                elif cv_kind == "pdf":
+                    st.success("✅ PDF uploaded successfully!")
+                else:
                     st.success("✅ DOCX uploaded successfully!")
-                except Exception as docx_error:
-                    st.error(f"DOCX reading error: {str(docx_error)}")
-                    st.warning("💡 To fix: Run `pip install python-docx` in terminal")
+            elif cv_kind == "pdf":
+                st.error(f"PDF reading error: {str(cv_job.error)}")
+                st.warning("💡 To fix: Run `pip install pypdf` or `pip install PyPDF2` in terminal")
+            elif cv_kind == "docx":
+                st.error(f"DOCX reading error: {str(cv_job.error)}")
+                st.warning("💡 To fix: Run `pip install python-docx` in terminal")
+            else:
+                raise cv_job.error
+            if cv_text != previous_cv_text:
+                st.session_state.cv_ref = blob_store.put_text(cv_text) if cv_text else None
+                persist('cv_ref')
             
-            if st.session_state.cv_text:
+            if cv_text:
                 with st.expander("View extracted text"):
-                    st.text_area("Extracted CV Text", st.session_state.cv_text, height=200, disabled=True)
+                    st.text_area("Extracted CV Text", cv_text, height=200, disabled=True)
                 
                 # Auto-fill button
                 st.markdown("---")
@@ -221,193 +146,8 @@ with tab1:
                 with col1:
                     if st.button("🤖 Auto-Fill Form from CV", type="primary", use_container_width=True):
                         with st.spinner("Analyzing CV and extracting information..."):
-                            cv_text = st.session_state.cv_text
-                            cv_lower = cv_text.lower()
-                            lines = [line.strip() for line in cv_text.split('\n') if line.strip()]
-                            
-                            # Initialize extracted data
-                            extracted = {}
-                            
-                            # === IMPROVED EMAIL EXTRACTION ===
-                            email_patterns = [
-                                r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-                                r'email[:\s]+([A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,})',
-                                r'e-mail[:\s]+([A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,})'
-                            ]
-                            for pattern in email_patterns:
-                                email_match = re.search(pattern, cv_text, re.IGNORECASE)
-                                if email_match:
-                                    extracted['email'] = email_match.group() if '@' in email_match.group() else email_match.group(1)
-                                    break
-                            
-                            # === IMPROVED PHONE EXTRACTION ===
-                            phone_patterns = [
-                                r'\+?\d{1,3}[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',
-                                r'\+?\d{10,13}',
-                                r'(?:phone|mobile|cell|tel|contact)[:\s]+([+\d\s\-\(\)]{10,})',
-                                r'\d{3}[-.\s]\d{3}[-.\s]\d{4}',
-                                r'\(\d{3}\)\s*\d{3}[-.\s]\d{4}'
-                            ]
-                            for pattern in phone_patterns:
-                                phone_match = re.search(pattern, cv_text, re.IGNORECASE)
-                                if phone_match:
-                                    phone = phone_match.group() if phone_match.groups() == () else phone_match.group(1)
-                                    phone = re.sub(r'(?:phone|mobile|cell|tel|contact)[:\s]+', '', phone, flags=re.IGNORECASE)
-                                    extracted['phone'] = phone.strip()
-                                    break
-                            
-                            # === IMPROVED NAME EXTRACTION ===
-                            name_found = False
-                            
-                            # Method 1: Look for "Name:" label
-                            for line in lines[:15]:
-                                if re.match(r'^(?:name|candidate|applicant)[:\s]+(.+)', line, re.IGNORECASE):
-                                    match = re.match(r'^(?:name|candidate|applicant)[:\s]+(.+)', line, re.IGNORECASE)
-                                    extracted['name'] = match.group(1).strip()
-                                    name_found = True
-                                    break
-                            
-                            # Method 2: First non-empty line that looks like a name (2-4 words, no numbers, no email)
-                            if not name_found:
-                                for line in lines[:10]:
-                                    words = line.split()
-                                    if (2 <= len(words) <= 4 and 
-                                        not '@' in line and 
-                                        not any(char.isdigit() for char in line) and
-                                        not any(kw in line.lower() for kw in ['resume', 'cv', 'curriculum', 'profile', 'summary']) and
-                                        len(line) < 50):
-                                        extracted['name'] = line.strip()
-                                        name_found = True
-                                        break
-                            
-                            # === IMPROVED LOCATION EXTRACTION ===
-                            location_patterns = [
-                                r'(?:location|address|city|residence|based in)[:\s]+(.+?)(?:\n|$)',
-                                r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?,\s*[A-Z]{2,})',  # City, STATE
-                                r'([A-Z][a-z]+,\s*[A-Z][a-z]+(?:,\s*\d{5})?)'  # City, State, ZIP
-                            ]
-                            for pattern in location_patterns:
-                                loc_match = re.search(pattern, cv_text, re.IGNORECASE)
-                                if loc_match:
-                                    location = loc_match.group(1) if loc_match.groups() else loc_match.group()
-                                    location = re.sub(r'(?:location|address|city|residence|based in)[:\s]+', '', location, flags=re.IGNORECASE)
-                                    extracted['location'] = location.strip()
-                                    break
-                            
-                            # === IMPROVED LINKEDIN EXTRACTION ===
-                            linkedin_patterns = [
-                                r'(?:linkedin\.com/in/[\w-]+)',
-                                r'(?:www\.)?linkedin\.com/in/([\w-]+)',
-                                r'(?:linkedin)[:\s]+(linkedin\.com/in/[\w-]+)',
-                                r'(?:linkedin)[:\s]+(.+?)(?:\n|$)'
-                            ]
-                            for pattern in linkedin_patterns:
-                                li_match = re.search(pattern, cv_text, re.IGNORECASE)
-                                if li_match:
-                                    linkedin = li_match.group()
-                                    if 'linkedin.com' in linkedin.lower():
-                                        if not linkedin.startswith('http'):
-                                            linkedin = 'https://' + linkedin
-                                        extracted['linkedin'] = linkedin.strip()
-                                        break
-                            
-                            # === IMPROVED GITHUB EXTRACTION ===
-                            github_patterns = [
-                                r'(?:github\.com/[\w-]+)',
-                                r'(?:www\.)?github\.com/([\w-]+)',
-                                r'(?:github)[:\s]+(github\.com/[\w-]+)',
-                                r'(?:github)[:\s]+(.+?)(?:\n|$)'
-                            ]
-                            for pattern in github_patterns:
-                                gh_match = re.search(pattern, cv_text, re.IGNORECASE)
-                                if gh_match:
-                                    github = gh_match.group()
-                                    if 'github.com' in github.lower():
-                                        if not github.startswith('http'):
-                                            github = 'https://' + github
-                                        extracted['github'] = github.strip()
-                                        break
-                            
-                            # === IMPROVED SKILLS EXTRACTION ===
-                            skill_section = ""
-                            in_skills = False
-                            end_markers = ['experience', 'education', 'project', 'certification', 'work', 'employment', 'career']
-                            
-                            for i, line in enumerate(lines):
-                                line_lower = line.lower()
-                                
-                                # Start capturing when we find skills section
-                                if any(kw in line_lower for kw in ['skill', 'technical', 'technologies', 'competencies', 'expertise']):
-                                    in_skills = True
-                                    continue
-                                
-                                # Stop when we hit another section
-                                if in_skills and any(marker in line_lower for marker in end_markers):
-                                    break
-                                
-                                # Capture skill lines
-                                if in_skills:
-                                    skill_section += line + ", "
-                                    if i > 100:
-                                        break
-                            
-                            if skill_section:
-                                # Clean skills
-                                skills = re.sub(r'[•\-\*\|\[\]{}]', '', skill_section)
-                                skills = re.sub(r'\s+', ' ', skills)
-                                
-                                # Split by common delimiters
-                                skill_list = []
-                                for delim in [',', '|', '•', ';']:
-                                    if delim in skills:
-                                        skill_list = [s.strip() for s in skills.split(delim) if s.strip() and len(s.strip()) > 1]
-                                        break
-                                
-                                if not skill_list:
-                                    skill_list = skills.split()
-                                
-                                # Remove duplicates and clean
-                                skill_list = list(dict.fromkeys([s.strip() for s in skill_list if len(s.strip()) > 2]))
-                                extracted['skills'] = ', '.join(skill_list[:20])  # Limit to 20 skills
-                            
-                            # If no skills found, look for common tech terms
-                            if not extracted.get('skills'):
-                                tech_keywords = ['python', 'java', 'javascript', 'sql', 'react', 'node', 'aws', 
-                                               'docker', 'kubernetes', 'machine learning', 'data science', 'pandas', 
-                                               'numpy', 'tensorflow', 'pytorch', 'html', 'css', 'git']
-                                found_skills = [kw for kw in tech_keywords if kw in cv_lower]
-                                if found_skills:
-                                    extracted['skills'] = ', '.join(found_skills)
-                            
-                            # === IMPROVED SUMMARY EXTRACTION ===
-                            summary_found = False
-                            summary_keywords = ['summary', 'profile', 'objective', 'about', 'overview', 'introduction']
-                            
-                            for i, line in enumerate(lines):
-                                if any(kw in line.lower() for kw in summary_keywords) and len(line) < 50:
-                                    # Get next 2-5 lines
-                                    summary_lines = []
-                                    for j in range(i+1, min(i+6, len(lines))):
-                                        if any(end in lines[j].lower() for end in ['experience', 'education', 'skill', 'project']):
-                                            break
-                                        summary_lines.append(lines[j])
-                                    
-                                    if summary_lines:
-                                        extracted['summary'] = ' '.join(summary_lines)[:400]
-                                        summary_found = True
-                                        break
-                            
-                            # If no summary found, create from first paragraph
-                            if not summary_found:
-                                first_para = []
-                                for line in lines[3:15]:  # Skip name/contact info
-                                    if len(line) > 30 and not any(kw in line.lower() for kw in ['email', 'phone', 'linkedin', 'github']):
-                                        first_para.append(line)
-                                        if len(' '.join(first_para)) > 200:
-                                            break
-                                
-                                if first_para:
-                                    extracted['summary'] = ' '.join(first_para)[:400]
+                            # One pass over the CV finds every field
+                            extracted = extract_fields(cv_text)
                             
                             # === UPDATE SESSION STATE ===
                             if extracted.get('email'):
@@ -472,8 +212,16 @@ with tab1:
         st.markdown("#### Upload Photo")
         photo = st.file_uploader("Profile Photo (Optional)", type=['jpg', 'jpeg', 'png'])
         if photo:
-            st.session_state.photo_data = photo.read()
-            st.image(st.session_state.photo_data, width=150)
+            # Keep only the downscaled copy; the multi-MB original is decoded once and dropped
+            prepared = prepare_photo(photo.getvalue())
+            if prepared:
+                photo_ref = blob_store.put(prepared.data)
+                if st.session_state.photo_ref != photo_ref:
+                    st.session_state.photo_ref = photo_ref
+                    persist('photo_ref')
+                st.image(prepared.data, width=150)
+            else:
+                st.error("Could not read this image. Please upload a JPG or PNG photo.")
     
     col1, col2, col3 = st.columns(3)
     with col1:
@@ -485,17 +233,11 @@ with tab1:
     
     st.header("Professional Summary")
     
-    if st.session_state.cv_text:
+    if cv_text:
         if st.button("🤖 Auto-Generate Summary from CV"):
             with st.spinner("Generating professional summary..."):
-                lines = st.session_state.cv_text.split('\n')
-                summary_keywords = ['summary', 'profile', 'objective', 'about']
-                extracted_summary = ""
-                
-                for i, line in enumerate(lines):
-                    if any(keyword in line.lower() for keyword in summary_keywords):
-                        extracted_summary = ' '.join(lines[i+1:i+4])
-                        break
+                # Section index is cached per CV, so this is a slice lookup
+                extracted_summary = extract_summary(index_cv(cv_text), max_lines=3)
                 
                 if extracted_summary:
                     st.session_state['summary_text'] = extracted_summary[:300]
@@ -572,28 +314,56 @@ with tab1:
     
     additional_certs = st.text_area("Additional Certifications (one per line, optional)", height=80, key="add_certs")
     
+    cert_fixed = "Bhartiya Vidya Bhavans Sardar Patel Institute Of Technology - Professional Certificate in Artificial Intelligence"
+    all_certs = [cert_fixed]
+    if additional_certs:
+        all_certs.extend([c.strip() for c in additional_certs.split('\n') if c.strip()])
+    
+    draft_resume = {
+        "name": full_name,
+        "email": email,
+        "phone": phone,
+        "linkedin": linkedin,
+        "github": github,
+        "portfolio": portfolio,
+        "location": location,
+        "summary": summary,
+        "experiences": experiences,
+        "education": education,
+        "technical_skills": [s.strip() for s in technical_skills.split(',') if s.strip()],
+        "projects": st.session_state.selected_projects,
+        "certifications": all_certs,
+        "photo": st.session_state.photo_ref
+    }
+    
+    # Live score against the last analyzed job description; only edited sections are re-tokenized
+    if st.session_state.job_description:
+        scorer = st.session_state.live_scorer
+        if scorer is None or scorer.job.text != st.session_state.job_description.lower():
+            scorer = st.session_state.live_scorer = IncrementalScorer(st.session_state.job_description)
+        live_result = scorer.score(draft_resume)
+        with st.sidebar:
+            analysis = st.session_state.analysis
+            st.metric("Live ATS Score", f"{live_result.total_score}%",
+                      delta=f"{live_result.total_score - analysis.result.total_score:+d} vs last analysis" if analysis else None)
+            st.caption("Updates as you edit the form, against the job description last analyzed in Tab 2.")
+    
+    with st.sidebar.expander("🧠 Session Memory"):
+        # Walking the whole session state is not free, so it runs on request rather than on every rerun
+        if st.button("📏 Measure session memory"):
+            st.session_state.memory_rows = session_memory_report(st.session_state, blob_store)
+        memory_rows = st.session_state.get('memory_rows')
+        if memory_rows:
+            st.dataframe(memory_rows, use_container_width=True, hide_index=True)
+            st.caption(f"This session held ~{sum(row['session_bytes'] for row in memory_rows) / 1024:.0f} KB "
+                       "when last measured.")
+        blob_stats = blob_store.stats()
+        st.caption(f"Shared blob cache: {blob_stats['blobs_in_memory']} blobs, "
+                   f"{blob_stats['memory_bytes'] / 1024 ** 2:.1f} of {blob_stats['max_memory_bytes'] / 1024 ** 2:.0f} MB.")
+    
     if st.button("💾 Save Information", type="primary"):
-        cert_fixed = "Bhartiya Vidya Bhavans Sardar Patel Institute Of Technology - Professional Certificate in Artificial Intelligence"
-        all_certs = [cert_fixed]
-        if additional_certs:
-            all_certs.extend([c.strip() for c in additional_certs.split('\n') if c.strip()])
-        
-        st.session_state.resume_data = {
-            "name": full_name,
-            "email": email,
-            "phone": phone,
-            "linkedin": linkedin,
-            "github": github,
-            "portfolio": portfolio,
-            "location": location,
-            "summary": summary,
-            "experiences": experiences,
-            "education": education,
-            "technical_skills": [s.strip() for s in technical_skills.split(',') if s.strip()],
-            "projects": st.session_state.selected_projects,
-            "certifications": all_certs,
-            "photo": st.session_state.photo_data
-        }
+        st.session_state.resume_data = draft_resume
+        persist('resume_data')
         st.success("✅ Information saved! Proceed to ATS Analysis tab.")
 
 with tab2:
@@ -608,332 +378,220 @@ with tab2:
         if st.button("📊 Analyze Resume & Select Best Projects", type="primary"):
             if job_description:
                 st.session_state.job_description = job_description
-                
-                with st.spinner("Running AI-powered analysis..."):
-                    data = st.session_state.resume_data
-                    
-                    # Prepare resume text
-                    resume_text = {
-                        'summary': data.get('summary', '').lower(),
-                        'experience': ' '.join([f"{exp.get('title', '')} {exp.get('company', '')} {' '.join(exp.get('responsibilities', []))}" 
-                                               for exp in data.get('experiences', [])]).lower(),
-                        'education': ' '.join([f"{edu.get('degree', '')} {edu.get('institution', '')}" 
-                                              for edu in data.get('education', [])]).lower(),
-                        'skills': ' '.join(data.get('technical_skills', [])).lower()
-                    }
-                    
-                    full_resume_text = ' '.join(resume_text.values())
-                    job_desc_lower = job_description.lower()
-                    
-                    # Stop words
-                    stop_words = {'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'a', 'an', 
-                                 'is', 'are', 'was', 'were', 'been', 'be', 'have', 'has', 'had', 'do', 'does', 'did',
-                                 'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can', 'this', 'that',
-                                 'these', 'those', 'from', 'into', 'through', 'during', 'before', 'after', 'above',
-                                 'below', 'between', 'under', 'again', 'further', 'then', 'once', 'here', 'there',
-                                 'when', 'where', 'why', 'how', 'all', 'both', 'each', 'few', 'more', 'most', 'other',
-                                 'some', 'such', 'only', 'own', 'same', 'than', 'too', 'very', 'just', 'about'}
-                    
-                    # Extract keywords
-                    job_words = re.findall(r'\b[a-z]+\b', job_desc_lower)
-                    job_keywords = [w for w in job_words if len(w) > 3 and w not in stop_words]
-                    
-                    # Extract multi-word phrases (bigrams and trigrams)
-                    job_phrases = []
-                    words = job_desc_lower.split()
-                    
-                    # Extract 2-word phrases (bigrams)
-                    for i in range(len(words) - 1):
-                        if len(words[i]) > 2 and len(words[i+1]) > 2:
-                            phrase = f"{words[i]} {words[i+1]}"
-                            if not any(stop in phrase for stop in ['the ', ' the', 'and ', ' and', 'or ', ' or']):
-                                job_phrases.append(phrase)
-                    
-                    # Extract 3-word phrases (trigrams) for better matching
-                    for i in range(len(words) - 2):
-                        if len(words[i]) > 2 and len(words[i+1]) > 2 and len(words[i+2]) > 2:
-                            phrase = f"{words[i]} {words[i+1]} {words[i+2]}"
-                            if not any(stop in phrase for stop in ['the ', ' the', 'and ', ' and', 'or ', ' or', 'a ', ' a ']):
-                                job_phrases.append(phrase)
-                    
-                    # Tech skills list (EXPANDED)
-                    tech_skills = ['python', 'java', 'javascript', 'react', 'angular', 'vue', 'node', 'sql', 
-                                  'mongodb', 'aws', 'azure', 'gcp', 'google cloud', 'docker', 'kubernetes', 'git', 'agile', 'scrum',
-                                  'machine learning', 'artificial intelligence', 'data science', 'tensorflow',
-                                  'pytorch', 'scikit-learn', 'sklearn', 'pandas', 'numpy', 'html', 'css', 'api', 'rest',
-                                  'graphql', 'typescript', 'c++', 'c#', 'golang', 'rust', 'swift', 'kotlin', 'deep learning',
-                                  'nlp', 'natural language processing', 'computer vision', 'data analysis', 'statistical analysis', 
-                                  'matplotlib', 'seaborn', 'tableau', 'power bi', 'powerbi', 'excel', 'spark', 'hadoop', 
-                                  'kafka', 'redis', 'postgresql', 'mysql', 'oracle', 'nosql', 'etl', 'data warehouse',
-                                  'data engineering', 'devops', 'ci/cd', 'jenkins', 'gitlab', 'github', 'bitbucket',
-                                  'linux', 'unix', 'bash', 'shell scripting', 'microservices', 'serverless', 'lambda',
-                                  'ec2', 's3', 'rds', 'dynamodb', 'cloudformation', 'terraform', 'ansible', 'chef', 'puppet',
-                                  'jira', 'confluence', 'slack', 'trello', 'asana', 'django', 'flask', 'fastapi', 'spring',
-                                  'express', 'nest', 'next', 'vue', 'svelte', 'webpack', 'babel', 'eslint', 'jest', 'pytest',
-                                  'selenium', 'cypress', 'postman', 'swagger', 'openapi', 'json', 'xml', 'yaml', 'csv',
-                                  'jupyter', 'colab', 'anaconda', 'conda', 'pip', 'npm', 'yarn', 'maven', 'gradle',
-                                  'scipy', 'statsmodels', 'xgboost', 'lightgbm', 'catboost', 'keras', 'hugging face',
-                                  'bert', 'gpt', 'transformer', 'lstm', 'rnn', 'cnn', 'gan', 'reinforcement learning',
-                                  'supervised learning', 'unsupervised learning', 'classification', 'regression', 'clustering',
-                                  'time series', 'forecasting', 'optimization', 'ab testing', 'a/b testing', 'hypothesis testing',
-                                  'statistical modeling', 'predictive modeling', 'data mining', 'data visualization',
-                                  'business intelligence', 'bi', 'analytics', 'big data', 'streaming', 'batch processing',
-                                  'api development', 'web development', 'frontend', 'backend', 'full stack', 'fullstack',
-                                  'mobile development', 'ios', 'android', 'react native', 'flutter', 'xamarin',
-                                  'cloud computing', 'cloud architecture', 'solution architecture', 'system design',
-                                  'database design', 'data modeling', 'schema design', 'query optimization',
-                                  'performance tuning', 'scalability', 'high availability', 'disaster recovery',
-                                  'security', 'authentication', 'authorization', 'encryption', 'oauth', 'jwt',
-                                  'version control', 'code review', 'unit testing', 'integration testing', 'testing',
-                                  'debugging', 'troubleshooting', 'monitoring', 'logging', 'alerting', 'observability',
-                                  'grafana', 'prometheus', 'elk', 'elasticsearch', 'logstash', 'kibana', 'splunk',
-                                  'datadog', 'new relic', 'cloudwatch', 'azure monitor', 'google analytics',
-                                  'seo', 'sem', 'digital marketing', 'crm', 'salesforce', 'hubspot', 'marketo',
-                                  'product management', 'project management', 'stakeholder management', 'requirements gathering',
-                                  'documentation', 'technical writing', 'presentation', 'communication', 'collaboration',
-                                  'leadership', 'mentoring', 'training', 'coaching', 'team building', 'problem solving',
-                                  'critical thinking', 'analytical skills', 'attention to detail', 'time management']
-                    
-                    # Action verbs (EXPANDED)
-                    action_verbs = ['developed', 'managed', 'led', 'created', 'implemented', 'designed',
-                                   'built', 'improved', 'increased', 'reduced', 'launched', 'delivered',
-                                   'coordinated', 'analyzed', 'optimized', 'automated', 'established',
-                                   'architected', 'engineered', 'deployed', 'maintained', 'migrated',
-                                   'integrated', 'configured', 'administered', 'monitored', 'troubleshot',
-                                   'debugged', 'refactored', 'enhanced', 'streamlined', 'standardized',
-                                   'consolidated', 'modernized', 'transformed', 'revolutionized', 'pioneered',
-                                   'spearheaded', 'initiated', 'founded', 'established', 'drove', 'accelerated',
-                                   'scaled', 'expanded', 'grew', 'boosted', 'maximized', 'elevated',
-                                   'strengthened', 'fortified', 'secured', 'protected', 'validated',
-                                   'verified', 'tested', 'evaluated', 'assessed', 'audited', 'reviewed',
-                                   'researched', 'investigated', 'identified', 'discovered', 'uncovered',
-                                   'resolved', 'fixed', 'corrected', 'addressed', 'mitigated', 'prevented',
-                                   'eliminated', 'minimized', 'decreased', 'lowered', 'cut', 'saved',
-                                   'generated', 'produced', 'achieved', 'accomplished', 'executed', 'performed',
-                                   'conducted', 'facilitated', 'orchestrated', 'supervised', 'oversaw',
-                                   'directed', 'guided', 'mentored', 'trained', 'educated', 'coached',
-                                   'advised', 'consulted', 'recommended', 'proposed', 'suggested', 'advocated',
-                                   'presented', 'communicated', 'collaborated', 'partnered', 'liaised',
-                                   'negotiated', 'influenced', 'persuaded', 'convinced', 'motivated',
-                                   'inspired', 'empowered', 'enabled', 'supported', 'assisted', 'helped',
-                                   'contributed', 'participated', 'engaged', 'volunteered', 'organized',
-                                   'planned', 'strategized', 'forecasted', 'predicted', 'projected',
-                                   'budgeted', 'allocated', 'distributed', 'prioritized', 'scheduled',
-                                   'documented', 'recorded', 'reported', 'tracked', 'measured', 'quantified',
-                                   'calculated', 'computed', 'processed', 'aggregated', 'synthesized',
-                                   'compiled', 'collected', 'gathered', 'extracted', 'retrieved', 'queried',
-                                   'filtered', 'sorted', 'organized', 'structured', 'formatted', 'normalized',
-                                   'cleaned', 'validated', 'transformed', 'converted', 'migrated', 'imported',
-                                   'exported', 'transferred', 'synchronized', 'integrated', 'connected',
-                                   'linked', 'mapped', 'modeled', 'simulated', 'prototyped', 'demoed',
-                                   'showcased', 'demonstrated', 'illustrated', 'visualized', 'charted',
-                                   'graphed', 'plotted', 'rendered', 'published', 'released', 'shipped']
-                    
-                    # Calculate matches
-                    keyword_matches = []
-                    tech_skill_matches = []
-                    phrase_matches = []
-                    action_verb_matches = []
-                    
-                    for keyword in set(job_keywords):
-                        if keyword in full_resume_text:
-                            keyword_matches.append(keyword)
-                            if keyword in tech_skills:
-                                tech_skill_matches.append(keyword)
-                    
-                    for phrase in set(job_phrases):
-                        if phrase in full_resume_text:
-                            phrase_matches.append(phrase)
-                    
-                    for verb in action_verbs:
-                        if verb in resume_text['experience']:
-                            action_verb_matches.append(verb)
-                    
-                    # Calculate weighted scores (IMPROVED ALGORITHM)
-                    # More generous scoring to help users reach 100%
-                    
-                    # Keywords score (40 points) - base + bonus
-                    base_keyword_score = (len(keyword_matches) / max(len(set(job_keywords)), 1)) * 35
-                    bonus_keywords = min(5, len(keyword_matches) // 10)  # Bonus for having many keywords
-                    keyword_score = min(40, base_keyword_score + bonus_keywords)
-                    
-                    # Tech skills score (25 points) - weighted higher if tech job
-                    tech_keywords_in_job = [k for k in set(job_keywords) if k in tech_skills]
-                    if tech_keywords_in_job:
-                        tech_score = (len(tech_skill_matches) / max(len(tech_keywords_in_job), 1)) * 25
-                    else:
-                        # If not a tech-heavy job, give partial credit
-                        tech_score = (len(tech_skill_matches) / max(len(tech_skills[:20]), 1)) * 25
-                    tech_score = min(25, tech_score)
-                    
-                    # Phrase score (20 points) - bonus for exact matches
-                    unique_phrases = list(set(job_phrases))
-                    base_phrase_score = (len(phrase_matches) / max(len(unique_phrases), 1)) * 18
-                    bonus_phrases = min(2, len(phrase_matches) // 5)  # Bonus for many phrase matches
-                    phrase_score = min(20, base_phrase_score + bonus_phrases)
-                    
-                    # Action verb score (10 points) - easier to max out
-                    action_verb_score = min(10, (len(action_verb_matches) / 5) * 10)  # Need only 5 verbs for full score
-                    
-                    # Format score (5 points) - always full since we use good template
-                    format_score = 5
-                    
-                    total_score = min(100, int(keyword_score + tech_score + phrase_score + action_verb_score + format_score))
-                    
-                    # Quality checks
-                    has_quantifiable = bool(re.search(r'\d+%|\d+\+|increased|decreased|improved|reduced', resume_text['experience']))
-                    has_email = bool(data.get('email'))
-                    has_phone = bool(data.get('phone'))
-                    contact_complete = has_email and has_phone
-                    
-                    # Smart Project Selection
-                    st.markdown("---")
-                    st.markdown("## 🚀 AI-Powered Project Selection")
-                    st.info("Analyzing all 27 projects and selecting the top 5 that best match this job...")
-                    
-                    project_scores = []
-                    for project in ALL_PROJECTS:
-                        score = 0
-                        project_text = f"{project['title']} {project['description']}".lower()
-                        
-                        # Match job keywords in project
-                        for keyword in job_keywords:
-                            if keyword in project_text:
-                                score += 2
-                        
-                        # Bonus for project keywords matching job
-                        for pk in project['keywords']:
-                            if pk in job_desc_lower:
-                                score += 5
-                        
-                        # Extra bonus for tech skills match
-                        for tech in tech_skill_matches:
-                            if tech in project_text:
-                                score += 3
-                        
-                        project_scores.append((project, score))
-                    
-                    # Sort and select top 5
-                    project_scores.sort(key=lambda x: x[1], reverse=True)
-                    top_projects = [p[0] for p in project_scores[:5]]
+                previous_job = jobs.get_job(st.session_state.analysis_job_id)
+                if previous_job is not None:
+                    previous_job.cancel()
+                # Runs in the background; the block below shows its progress and pulls in the result
+                analysis_job = jobs.submit(analyze, dict(st.session_state.resume_data), job_description,
+                                           stages=ANALYSIS_STAGES, key=job_description,
+                                           max_similarity=PROJECT_MAX_SIMILARITY)
+                st.session_state.analysis_job_id = analysis_job.id
+            else:
+                st.error("⚠️ Please paste a job description to analyze!")
+        
+        analysis_job = jobs.get_job(st.session_state.analysis_job_id)
+        if analysis_job is not None:
+            if not analysis_job.done and job_description != analysis_job.key:
+                analysis_job.cancel()
+                st.session_state.analysis_job_id = None
+                st.info("✏️ Analysis cancelled because the job description changed. Click Analyze to run it again.")
+            elif analysis_job.wait(jobs.POLL_SECONDS):
+                st.session_state.analysis_job_id = None
+                if analysis_job.status == "done":
+                    analysis = analysis_job.result
+                    top_projects = [p[0] for p in analysis.project_scores]
+                    st.session_state.analysis = analysis
                     st.session_state.selected_projects = top_projects
                     
                     # Update resume data with selected projects
                     st.session_state.resume_data['projects'] = top_projects
+                    persist('job_description', 'analysis', 'selected_projects', 'resume_data')
                     
-                    st.success("✅ Top 5 Projects Selected Based on Job Requirements!")
-                    
-                    for i, proj in enumerate(top_projects, 1):
-                        relevance_score = project_scores[i-1][1]
-                        with st.expander(f"🔹 Project {i}: {proj['title']} (Relevance: {relevance_score} points)", expanded=i<=2):
-                            st.markdown(f"**Description:**")
-                            st.write(proj['description'])
-                            st.markdown(f"**Key Skills:** {', '.join(proj['keywords'])}")
-                    
-                    # ATS Score Display
-                    st.markdown("---")
-                    st.markdown("## 📊 Comprehensive ATS Score Analysis")
-                    
-                    col1, col2, col3, col4 = st.columns(4)
-                    with col1:
-                        st.metric("Overall Score", f"{total_score}%", 
-                                 delta="Excellent" if total_score >= 85 else "Strong" if total_score >= 70 else "Good" if total_score >= 60 else "Needs Work")
-                    with col2:
-                        st.metric("Keywords", f"{len(keyword_matches)}/{len(set(job_keywords))}")
-                    with col3:
-                        st.metric("Tech Skills", f"{len(tech_skill_matches)}")
-                    with col4:
-                        st.metric("Phrases", f"{len(phrase_matches)}")
-                    
-                    if total_score >= 85:
-                        st.success("🏆 **Outstanding Match!** You're in the top 10%. Your resume is perfectly optimized.")
-                    elif total_score >= 70:
-                        st.success("✅ **Strong Match!** Your resume is highly competitive for this role.")
-                    elif total_score >= 60:
-                        st.warning("⚠️ **Good Match** - Solid foundation, but room for improvement exists.")
-                    else:
-                        st.error("❌ **Needs Improvement** - Add more relevant keywords and tailor your experience.")
-                    
-                    with st.expander("📊 Detailed Score Breakdown", expanded=True):
-                        col1, col2 = st.columns(2)
-                        
-                        with col1:
-                            st.markdown("#### Score Components")
-                            st.progress(keyword_score / 40, text=f"Keywords: {int(keyword_score)}/40")
-                            st.progress(tech_score / 25, text=f"Technical Skills: {int(tech_score)}/25")
-                            st.progress(phrase_score / 20, text=f"Key Phrases: {int(phrase_score)}/20")
-                            st.progress(action_verb_score / 10, text=f"Action Verbs: {int(action_verb_score)}/10")
-                            st.progress(format_score / 5, text=f"Format: {int(format_score)}/5")
-                        
-                        with col2:
-                            st.markdown("#### Quality Checks")
-                            st.write("✅ Contact Info Complete" if contact_complete else "❌ Add Contact Info")
-                            st.write("✅ Quantifiable Results" if has_quantifiable else "⚠️ Add Metrics/Numbers")
-                            st.write(f"✅ {len(action_verb_matches)} Action Verbs" if action_verb_matches else "⚠️ Use Action Verbs")
-                            st.write(f"✅ {len(tech_skill_matches)} Tech Skills" if tech_skill_matches else "⚠️ List Tech Skills")
-                            st.write(f"✅ {len(top_projects)} Relevant Projects")
-                    
-                    with st.expander("🔑 Matched Keywords & Skills"):
-                        if tech_skill_matches:
-                            st.markdown("**🔧 Technical Skills Found:**")
-                            st.info(", ".join(sorted(set(tech_skill_matches))))
-                        
-                        if phrase_matches:
-                            st.markdown("**📝 Key Phrases Found:**")
-                            st.success(", ".join(list(set(phrase_matches))[:15]))
-                        
-                        if action_verb_matches:
-                            st.markdown("**💪 Action Verbs Used:**")
-                            st.write(", ".join(sorted(set(action_verb_matches))))
-                    
-                    with st.expander("💡 Personalized Recommendations"):
-                        missing_keywords = list(set(job_keywords) - set(keyword_matches))
-                        missing_tech = [k for k in job_keywords if k in tech_skills and k not in tech_skill_matches]
-                        
-                        recommendations = []
-                        
-                        if missing_tech:
-                            recommendations.append(f"**🔧 Add Technical Skills:** {', '.join(missing_tech[:5])}")
-                        
-                        if missing_keywords and len(missing_keywords) > 5:
-                            recommendations.append(f"**🎯 Include Keywords:** {', '.join(missing_keywords[:8])}")
-                        
-                        if not has_quantifiable:
-                            recommendations.append("**📊 Add Metrics:** Include numbers (e.g., 'Increased efficiency by 30%', 'Processed 10,000+ records')")
-                        
-                        if len(action_verb_matches) < 5:
-                            recommendations.append("**💪 Use Action Verbs:** Start bullets with: Developed, Led, Implemented, Optimized, Delivered")
-                        
-                        if len(phrase_matches) < 5:
-                            recommendations.append("**📝 Mirror Job Language:** Use exact phrases from the job description")
-                        
-                        if recommendations:
-                            for i, rec in enumerate(recommendations, 1):
-                                st.markdown(f"{i}. {rec}")
-                        else:
-                            st.success("✨ Excellent! Your resume is well-optimized. Consider minor tweaks for perfection.")
-                    
-                    st.markdown("---")
-                    st.markdown("### 📈 Industry Benchmark Comparison")
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        st.metric("Your Score", f"{total_score}%")
-                    with col2:
-                        st.metric("Industry Average", "65%")
-                    with col3:
-                        st.metric("Top 10% Threshold", "85%+")
-                    
-                    if total_score >= 85:
+                    if analysis.result.total_score >= 85:
                         st.balloons()
-                        st.success("🏆 **You're in the Top 10%!** Your resume stands out from the competition.")
-                    elif total_score >= 65:
-                        st.info("📊 **Above Average** - You're competitive. Keep refining for top tier!")
-                    else:
-                        st.warning("📉 **Below Average** - Focus on keywords, skills, and tailoring to this specific role.")
+                elif analysis_job.status == "failed":
+                    st.error(f"Analysis failed: {analysis_job.error}")
             else:
-                st.error("⚠️ Please paste a job description to analyze!")
+                st.progress(analysis_job.progress,
+                            text=f"🔍 Running AI-powered analysis: {analysis_job.stage or 'queued'}...")
+                jobs_running = True
+        
+        # Results stay on screen across reruns until the next analysis
+        analysis = st.session_state.analysis
+        if analysis is not None:
+            result = analysis.result
+            project_scores = analysis.project_scores
+            top_projects = [p[0] for p in project_scores]
+            
+            if analysis.key != analysis_key(st.session_state.resume_data, job_description,
+                                            max_similarity=PROJECT_MAX_SIMILARITY):
+                st.warning("✏️ Your resume or the job description changed since this analysis. Click Analyze to refresh it.")
+            
+            # Smart Project Selection
+            st.markdown("---")
+            st.markdown("## 🚀 AI-Powered Project Selection")
+            st.info(f"Analyzing all {len(PROJECT_CATALOG)} projects and selecting the top {TOP_PROJECTS} that best match this job...")
+            
+            st.success(f"✅ Top {len(top_projects)} Projects Selected Based on Job Requirements!")
+            
+            for i, (proj, relevance_score) in enumerate(project_scores, 1):
+                with st.expander(f"🔹 Project {i}: {proj['title']} (Relevance: {relevance_score:.1f})", expanded=i<=2):
+                    st.markdown(f"**Description:**")
+                    st.write(proj['description'])
+                    st.markdown(f"**Key Skills:** {', '.join(proj['keywords'])}")
+            
+            # ATS Score Display
+            st.markdown("---")
+            st.markdown("## 📊 Comprehensive ATS Score Analysis")
+            
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("Overall Score", f"{result.total_score}%", 
+                         delta="Excellent" if result.total_score >= 85 else "Strong" if result.total_score >= 70 else "Good" if result.total_score >= 60 else "Needs Work")
+            with col2:
+                st.metric("Keywords", f"{len(result.keyword_matches)}/{len(set(result.job_keywords))}")
+            with col3:
+                st.metric("Tech Skills", f"{len(result.tech_skill_matches)}")
+            with col4:
+                st.metric("Phrases", f"{len(result.phrase_matches)}")
+            
+            if result.total_score >= 85:
+                st.success("🏆 **Outstanding Match!** You're in the top 10%. Your resume is perfectly optimized.")
+            elif result.total_score >= 70:
+                st.success("✅ **Strong Match!** Your resume is highly competitive for this role.")
+            elif result.total_score >= 60:
+                st.warning("⚠️ **Good Match** - Solid foundation, but room for improvement exists.")
+            else:
+                st.error("❌ **Needs Improvement** - Add more relevant keywords and tailor your experience.")
+            
+            with st.expander("📊 Detailed Score Breakdown", expanded=True):
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    st.markdown("#### Score Components")
+                    st.progress(result.keyword_score / 40, text=f"Keywords: {int(result.keyword_score)}/40")
+                    st.progress(result.tech_score / 25, text=f"Technical Skills: {int(result.tech_score)}/25")
+                    st.progress(result.phrase_score / 20, text=f"Key Phrases: {int(result.phrase_score)}/20")
+                    st.progress(result.action_verb_score / 10, text=f"Action Verbs: {int(result.action_verb_score)}/10")
+                    st.progress(result.format_score / 5, text=f"Format: {int(result.format_score)}/5")
+                
+                with col2:
+                    st.markdown("#### Quality Checks")
+                    st.write("✅ Contact Info Complete" if result.contact_complete else "❌ Add Contact Info")
+                    st.write("✅ Quantifiable Results" if result.has_quantifiable else "⚠️ Add Metrics/Numbers")
+                    st.write(f"✅ {len(result.action_verb_matches)} Action Verbs" if result.action_verb_matches else "⚠️ Use Action Verbs")
+                    st.write(f"✅ {len(result.tech_skill_matches)} Tech Skills" if result.tech_skill_matches else "⚠️ List Tech Skills")
+                    st.write(f"✅ {len(top_projects)} Relevant Projects")
+            
+            with st.expander("🔑 Matched Keywords & Skills"):
+                if result.tech_skill_matches:
+                    st.markdown("**🔧 Technical Skills Found:**")
+                    st.info(", ".join(sorted(set(result.tech_skill_matches))))
+                
+                if result.phrase_matches:
+                    st.markdown("**📝 Key Phrases Found:**")
+                    st.success(", ".join(list(set(result.phrase_matches))[:15]))
+                
+                if result.action_verb_matches:
+                    st.markdown("**💪 Action Verbs Used:**")
+                    st.write(", ".join(sorted(set(result.action_verb_matches))))
+            
+            with st.expander("💡 Personalized Recommendations"):
+                missing_keywords = result.missing_keywords
+                missing_tech = result.missing_tech
+                
+                recommendations = []
+                
+                if missing_tech:
+                    recommendations.append(f"**🔧 Add Technical Skills:** {', '.join(missing_tech[:5])}")
+                
+                if missing_keywords and len(missing_keywords) > 5:
+                    recommendations.append(f"**🎯 Include Keywords:** {', '.join(missing_keywords[:8])}")
+                
+                if not result.has_quantifiable:
+                    recommendations.append("**📊 Add Metrics:** Include numbers (e.g., 'Increased efficiency by 30%', 'Processed 10,000+ records')")
+                
+                if len(result.action_verb_matches) < 5:
+                    recommendations.append("**💪 Use Action Verbs:** Start bullets with: Developed, Led, Implemented, Optimized, Delivered")
+                
+                if len(result.phrase_matches) < 5:
+                    recommendations.append("**📝 Mirror Job Language:** Use exact phrases from the job description")
+                
+                if recommendations:
+                    for i, rec in enumerate(recommendations, 1):
+                        st.markdown(f"{i}. {rec}")
+                else:
+                    st.success("✨ Excellent! Your resume is well-optimized. Consider minor tweaks for perfection.")
+            
+            st.markdown("---")
+            st.markdown("### 📈 Industry Benchmark Comparison")
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Your Score", f"{result.total_score}%")
+            with col2:
+                st.metric("Industry Average", "65%")
+            with col3:
+                st.metric("Top 10% Threshold", "85%+")
+            
+            if result.total_score >= 85:
+                st.success("🏆 **You're in the Top 10%!** Your resume stands out from the competition.")
+            elif result.total_score >= 65:
+                st.info("📊 **Above Average** - You're competitive. Keep refining for top tier!")
+            else:
+                st.warning("📉 **Below Average** - Focus on keywords, skills, and tailoring to this specific role.")
     else:
         st.info("👈 Please fill your information in Tab 1 first.")
+    
+    st.markdown("---")
+    with st.expander("📦 Batch Mode: Rank Many CVs Against Many Jobs"):
+        st.markdown("Upload a **.zip of CVs** (PDF, DOCX, TXT) and score every CV against each job description.")
+        cv_zip = st.file_uploader("CV archive (.zip)", type=['zip'], key="batch_cv_zip")
+        batch_jd_files = st.file_uploader("Job descriptions (.txt, optional)", type=['txt'],
+                                          accept_multiple_files=True, key="batch_jd_files")
+        batch_jobs = {f.name.rsplit('.', 1)[0]: f.read().decode('utf-8') for f in batch_jd_files or []}
+        if st.session_state.job_description:
+            batch_jobs.setdefault("job_description", st.session_state.job_description)
+        
+        if st.button("🚀 Run Batch Analysis", disabled=not (cv_zip and batch_jobs)):
+            previous_job = jobs.get_job(st.session_state.batch_job_id)
+            if previous_job is not None:
+                previous_job.cancel()
+            with zipfile.ZipFile(cv_zip) as archive:
+                batch_cvs = list(batch.read_cv_zip(archive))
+            # Scored on all cores in a background job; results stay here until the next run
+            batch_job = jobs.submit(batch.score_matrix, batch_cvs, batch_jobs, stages=("score",), key=list(batch_jobs))
+            st.session_state.batch_job_id = batch_job.id
+        
+        batch_job = jobs.get_job(st.session_state.batch_job_id)
+        if batch_job is not None and not batch_job.wait(jobs.POLL_SECONDS):
+            st.progress(batch_job.progress, text=f"Scoring CVs on all cores... {batch_job.progress:.0%}")
+            if batch_job.cancelled:
+                st.caption("Cancelling; the CVs already being scored finish first.")
+            elif st.button("⏹️ Cancel Batch Analysis"):
+                batch_job.cancel()
+            jobs_running = True
+        elif batch_job is not None and batch_job.status == "cancelled":
+            st.info("Batch analysis cancelled.")
+        elif batch_job is not None and batch_job.status == "failed":
+            st.error(f"Batch analysis failed: {batch_job.error}")
+        elif batch_job is not None and batch_job.status == "done":
+            batch_rows, batch_errors = batch_job.result
+            batch_names = batch_job.key
+            
+            st.success(f"✅ Scored {len(batch_rows)} CVs against {len(batch_names)} job descriptions")
+            st.dataframe([{"resume": name, **scores} for name, scores in batch_rows.items()], use_container_width=True)
+            if batch_errors:
+                st.warning(f"⚠️ Skipped {len(batch_errors)} unreadable files: {', '.join(batch_errors)}")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                st.download_button("📥 Download Scores (CSV)", data=batch.matrix_to_csv(batch_rows, batch_names),
+                                   file_name="ats_scores.csv", mime="text/csv")
+            with col2:
+                st.download_button("📥 Download Scores (JSON)", data=batch.matrix_to_json(batch_rows, batch_names, batch_errors),
+                                   file_name="ats_scores.json", mime="application/json")
+        elif not batch_jobs:
+            st.caption("Paste a job description above or upload job description files to enable batch mode.")
 
 with tab3:
     st.header("❓ AI-Powered Interview Preparation")
@@ -951,7 +609,7 @@ with tab3:
             skills_list = data.get('technical_skills', [])[:5]
             cert_name = "Professional Certificate in Artificial Intelligence from Bhartiya Vidya Bhavans Sardar Patel Institute Of Technology"
             
-            with st.spinner("Generating personalized interview preparation..."):
+            with st.spinner("Generating personalized interview preparation..."), metrics.timer("interview_qa"):
                 st.success("✅ Your Personalized Interview Prep is Ready!")
                 
                 questions = [
@@ -1073,214 +731,21 @@ with tab4:
     st.header("👁️ Resume Preview & Download")
     
     if st.session_state.resume_data:
-        data = st.session_state.resume_data
+        # Exporters need the photo bytes, not the blob reference kept in session state
+        data = resolve_blobs(st.session_state.resume_data, blob_store)
         
-        # Convert photo to base64
-        photo_base64 = ""
-        if data.get('photo'):
-            photo_base64 = base64.b64encode(data['photo']).decode()
-        
-        # Generate HTML
-        resume_html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <style>
-                body {{
-                    font-family: Arial, Helvetica, sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                    max-width: 850px;
-                    margin: 0 auto;
-                    padding: 20px;
-                }}
-                .header {{
-                    text-align: center;
-                    margin-bottom: 20px;
-                }}
-                .profile-photo {{
-                    width: 120px;
-                    height: 120px;
-                    border-radius: 50%;
-                    object-fit: cover;
-                    margin: 0 auto 15px;
-                    display: block;
-                    border: 3px solid #2c3e50;
-                }}
-                h1 {{
-                    font-size: 32px;
-                    margin: 10px 0 5px 0;
-                    color: #2c3e50;
-                }}
-                h2 {{
-                    font-size: 18px;
-                    border-bottom: 2px solid #2c3e50;
-                    padding-bottom: 5px;
-                    margin-top: 20px;
-                    margin-bottom: 10px;
-                    text-transform: uppercase;
-                    color: #2c3e50;
-                }}
-                .contact {{
-                    text-align: center;
-                    margin-bottom: 20px;
-                    font-size: 14px;
-                    line-height: 1.8;
-                }}
-                .contact a {{
-                    color: #2980b9;
-                    text-decoration: none;
-                    font-weight: 500;
-                }}
-                .contact a:hover {{
-                    text-decoration: underline;
-                }}
-                
-                /* Print styles - show full URLs */
-                @media print {{
-                    .contact a {{
-                        color: #2980b9;
-                        text-decoration: underline;
-                    }}
-                    .contact a:after {{
-                        content: "";
-                    }}
-                }}
-                .section {{
-                    margin-bottom: 20px;
-                }}
-                .job, .edu, .project {{
-                    margin-bottom: 15px;
-                }}
-                .job-header, .edu-header, .project-header {{
-                    display: flex;
-                    justify-content: space-between;
-                    margin-bottom: 5px;
-                }}
-                .job-title, .degree, .project-name {{
-                    font-weight: bold;
-                    font-size: 16px;
-                }}
-                .company, .institution {{
-                    font-style: italic;
-                }}
-                .date {{
-                    color: #7f8c8d;
-                    font-size: 14px;
-                }}
-                ul {{
-                    margin: 5px 0;
-                    padding-left: 20px;
-                }}
-                li {{
-                    margin-bottom: 3px;
-                }}
-                .skills {{
-                    display: flex;
-                    flex-wrap: wrap;
-                    gap: 5px;
-                }}
-                .skill {{
-                    background: #ecf0f1;
-                    padding: 5px 10px;
-                    border-radius: 3px;
-                    font-size: 14px;
-                }}
-                .project-desc {{
-                    margin-top: 5px;
-                    text-align: justify;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                {f'<img src="data:image/png;base64,{photo_base64}" class="profile-photo">' if photo_base64 else ''}
-                <h1>{data.get('name', 'Your Name')}</h1>
-            </div>
-            <div class="contact">
-                {f"{data.get('location', '')}" if data.get('location') else ''}
-                {f" | {data.get('phone', '')}" if data.get('phone') else ''}
-                {f" | {data.get('email', '')}" if data.get('email') else ''}
-                {f" | <a href='{data.get('linkedin')}' target='_blank'>{data.get('linkedin')}</a>" if data.get('linkedin') else ''}
-                {f" | <a href='{data.get('github')}' target='_blank'>{data.get('github')}</a>" if data.get('github') else ''}
-                {f" | <a href='{data.get('portfolio')}' target='_blank'>{data.get('portfolio')}</a>" if data.get('portfolio') else ''}
-            </div>
-            
-            <div class="section">
-                <h2>Professional Summary</h2>
-                <p>{data.get('summary', '')}</p>
-            </div>
-        """
-        
-        if data.get('experiences'):
-            resume_html += "<div class='section'><h2>Work Experience</h2>"
-            for exp in data['experiences']:
-                resume_html += f"""
-                <div class="job">
-                    <div class="job-header">
-                        <div>
-                            <div class="job-title">{exp['title']}</div>
-                            <div class="company">{exp['company']}</div>
-                        </div>
-                        <div class="date">{exp['start']} - {exp['end']}</div>
-                    </div>
-                    <ul>
-                """
-                for resp in exp['responsibilities']:
-                    if resp.strip():
-                        resume_html += f"<li>{resp.strip()}</li>"
-                resume_html += "</ul></div>"
-            resume_html += "</div>"
-        
-        if data.get('projects') and len(data['projects']) > 0:
-            resume_html += "<div class='section'><h2>Key Projects</h2>"
-            for proj in data['projects']:
-                resume_html += f"""
-                <div class="project">
-                    <div class="project-name">{proj['title']}</div>
-                    <p class="project-desc">{proj['description']}</p>
-                </div>
-                """
-            resume_html += "</div>"
-        
-        if data.get('education'):
-            resume_html += "<div class='section'><h2>Education</h2>"
-            for edu in data['education']:
-                resume_html += f"""
-                <div class="edu">
-                    <div class="edu-header">
-                        <div>
-                            <div class="degree">{edu['degree']}</div>
-                            <div class="institution">{edu['institution']}</div>
-                        </div>
-                        <div class="date">{edu['start']} - {edu['end']}</div>
-                    </div>
-                    {f"<div>GPA: {edu['gpa']}</div>" if edu.get('gpa') else ''}
-                </div>
-                """
-            resume_html += "</div>"
-        
-        if data.get('technical_skills'):
-            resume_html += "<div class='section'><h2>Technical Skills</h2><div class='skills'>"
-            for skill in data['technical_skills']:
-                resume_html += f"<span class='skill'>{skill}</span>"
-            resume_html += "</div></div>"
-        
-        if data.get('certifications'):
-            resume_html += "<div class='section'><h2>Certifications</h2><ul>"
-            for cert in data['certifications']:
-                resume_html += f"<li>{cert}</li>"
-            resume_html += "</ul></div>"
-        
-        resume_html += "</body></html>"
+        resume_html = render_resume(data)
         
         # Preview
         st.markdown("### 📄 Your Professional Resume")
         st.components.v1.html(resume_html, height=800, scrolling=True)
         
         # Download
-        col1, col2 = st.columns(2)
+        missing_chars = unencodable_chars(data)
+        if missing_chars:
+            st.warning(f"⚠️ The PDF fonts cannot show {' '.join(missing_chars)}; those characters appear as '?' "
+                       "in the PDF. Download the HTML or DOCX version to keep them.")
+        col1, col2, col3 = st.columns(3)
         with col1:
             st.download_button(
                 label="📥 Download Resume (HTML)",
@@ -1290,9 +755,38 @@ with tab4:
                 type="primary"
             )
         with col2:
-            st.info("💡 **To convert to PDF:** Open the HTML file in a browser, press Ctrl+P, and select 'Save as PDF'")
+            # Generated server-side and cached per resume content, so reruns reuse the same bytes
+            st.download_button(
+                label="📄 Download Resume (PDF)",
+                data=render_pdf(data),
+                file_name=f"{data.get('name', 'resume').replace(' ', '_')}_ATS_Resume.pdf",
+                mime="application/pdf"
+            )
+        with col3:
+            st.download_button(
+                label="📝 Download Resume (DOCX)",
+                data=render_docx(data),
+                file_name=f"{data.get('name', 'resume').replace(' ', '_')}_ATS_Resume.docx",
+                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+            )
         
         if st.session_state.get('selected_projects'):
             st.success(f"✅ Resume includes {len(st.session_state.selected_projects)} AI-selected projects optimized for your target role!")
     else:
-        st.info("👈 Please complete Tab 1 (Fill Information) to generate your resume.")
\ No newline at end of file
+        st.info("👈 Please complete Tab 1 (Fill Information) to generate your resume.")
+
+# Drawn last so the numbers include everything this rerun did
+if metrics.enabled():
+    with st.sidebar.expander("⏱️ Performance (debug)"):
+        stage_rows, event_counts = metrics.snapshot()
+        st.dataframe(stage_rows, use_container_width=True, hide_index=True)
+        if event_counts:
+            st.caption(", ".join(f"{event}: {value}" for event, value in sorted(event_counts.items())))
+        st.download_button("📥 Metrics (Prometheus)", data=metrics.prometheus_text(),
+                           file_name="ats_metrics.txt", mime="text/plain")
+        if st.button("Reset Timers"):
+            metrics.reset()
+
+# Background jobs are still running: rerun to redraw their progress (and pick up results) without a click
+if jobs_running:
+    st.rerun()
@@ -0,0 +1,556 @@
+"""UI-free ATS scoring engine.
+
+Everything the "Analyze Resume & Select Best Projects" button computes lives
+here so it can be called from batch jobs and workers without importing
+Streamlit. ``score`` rates a saved resume against a job description and
+``select_projects`` ranks the project catalog (see ``projects``) for the
+same posting. ``analyze`` runs both and memoizes the outcome per
+(resume, job description) fingerprint in a process-wide cache.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from dataclasses import asdict, dataclass, field
+
+import metrics
+from keyword_matcher import KeywordMatcher, tokenize
+from projects import DEFAULT_CATALOG_PATH, ProjectCatalog
+
+
+# Vocabularies are immutable and built once at import, not on every Streamlit rerun.
+# Stop words ignored when extracting job keywords
+STOP_WORDS = frozenset({
+    'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'a', 'an', 'is', 'are',
+    'was', 'were', 'been', 'be', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would',
+    'could', 'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those', 'from',
+    'into', 'through', 'during', 'before', 'after', 'above', 'below', 'between', 'under', 'again',
+    'further', 'then', 'once', 'here', 'there', 'when', 'where', 'why', 'how', 'all', 'both',
+    'each', 'few', 'more', 'most', 'other', 'some', 'such', 'only', 'own', 'same', 'than', 'too',
+    'very', 'just', 'about'
+})
+
+# Tech skills list (EXPANDED)
+TECH_SKILLS = (
+    'python', 'java', 'javascript', 'react', 'angular', 'vue', 'node', 'sql', 'mongodb', 'aws',
+    'azure', 'gcp', 'google cloud', 'docker', 'kubernetes', 'git', 'agile', 'scrum',
+    'machine learning', 'artificial intelligence', 'data science', 'tensorflow', 'pytorch',
+    'scikit-learn', 'sklearn', 'pandas', 'numpy', 'html', 'css', 'api', 'rest', 'graphql',
+    'typescript', 'c++', 'c#', 'golang', 'rust', 'swift', 'kotlin', 'deep learning', 'nlp',
+    'natural language processing', 'computer vision', 'data analysis', 'statistical analysis',
+    'matplotlib', 'seaborn', 'tableau', 'power bi', 'powerbi', 'excel', 'spark', 'hadoop', 'kafka',
+    'redis', 'postgresql', 'mysql', 'oracle', 'nosql', 'etl', 'data warehouse', 'data engineering',
+    'devops', 'ci/cd', 'jenkins', 'gitlab', 'github', 'bitbucket', 'linux', 'unix', 'bash',
+    'shell scripting', 'microservices', 'serverless', 'lambda', 'ec2', 's3', 'rds', 'dynamodb',
+    'cloudformation', 'terraform', 'ansible', 'chef', 'puppet', 'jira', 'confluence', 'slack',
+    'trello', 'asana', 'django', 'flask', 'fastapi', 'spring', 'express', 'nest', 'next', 'vue',
+    'svelte', 'webpack', 'babel', 'eslint', 'jest', 'pytest', 'selenium', 'cypress', 'postman',
+    'swagger', 'openapi', 'json', 'xml', 'yaml', 'csv', 'jupyter', 'colab', 'anaconda', 'conda',
+    'pip', 'npm', 'yarn', 'maven', 'gradle', 'scipy', 'statsmodels', 'xgboost', 'lightgbm',
+    'catboost', 'keras', 'hugging face', 'bert', 'gpt', 'transformer', 'lstm', 'rnn', 'cnn', 'gan',
+    'reinforcement learning', 'supervised learning', 'unsupervised learning', 'classification',
+    'regression', 'clustering', 'time series', 'forecasting', 'optimization', 'ab testing',
+    'a/b testing', 'hypothesis testing', 'statistical modeling', 'predictive modeling',
+    'data mining', 'data visualization', 'business intelligence', 'bi', 'analytics', 'big data',
+    'streaming', 'batch processing', 'api development', 'web development', 'frontend', 'backend',
+    'full stack', 'fullstack', 'mobile development', 'ios', 'android', 'react native', 'flutter',
+    'xamarin', 'cloud computing', 'cloud architecture', 'solution architecture', 'system design',
+    'database design', 'data modeling', 'schema design', 'query optimization',
+    'performance tuning', 'scalability', 'high availability', 'disaster recovery', 'security',
+    'authentication', 'authorization', 'encryption', 'oauth', 'jwt', 'version control',
+    'code review', 'unit testing', 'integration testing', 'testing', 'debugging',
+    'troubleshooting', 'monitoring', 'logging', 'alerting', 'observability', 'grafana',
+    'prometheus', 'elk', 'elasticsearch', 'logstash', 'kibana', 'splunk', 'datadog', 'new relic',
+    'cloudwatch', 'azure monitor', 'google analytics', 'seo', 'sem', 'digital marketing', 'crm',
+    'salesforce', 'hubspot', 'marketo', 'product management', 'project management',
+    'stakeholder management', 'requirements gathering', 'documentation', 'technical writing',
+    'presentation', 'communication', 'collaboration', 'leadership', 'mentoring', 'training',
+    'coaching', 'team building', 'problem solving', 'critical thinking', 'analytical skills',
+    'attention to detail', 'time management'
+)
+
+# Action verbs (EXPANDED)
+ACTION_VERBS = (
+    'developed', 'managed', 'led', 'created', 'implemented', 'designed', 'built', 'improved',
+    'increased', 'reduced', 'launched', 'delivered', 'coordinated', 'analyzed', 'optimized',
+    'automated', 'established', 'architected', 'engineered', 'deployed', 'maintained', 'migrated',
+    'integrated', 'configured', 'administered', 'monitored', 'troubleshot', 'debugged',
+    'refactored', 'enhanced', 'streamlined', 'standardized', 'consolidated', 'modernized',
+    'transformed', 'revolutionized', 'pioneered', 'spearheaded', 'initiated', 'founded',
+    'established', 'drove', 'accelerated', 'scaled', 'expanded', 'grew', 'boosted', 'maximized',
+    'elevated', 'strengthened', 'fortified', 'secured', 'protected', 'validated', 'verified',
+    'tested', 'evaluated', 'assessed', 'audited', 'reviewed', 'researched', 'investigated',
+    'identified', 'discovered', 'uncovered', 'resolved', 'fixed', 'corrected', 'addressed',
+    'mitigated', 'prevented', 'eliminated', 'minimized', 'decreased', 'lowered', 'cut', 'saved',
+    'generated', 'produced', 'achieved', 'accomplished', 'executed', 'performed', 'conducted',
+    'facilitated', 'orchestrated', 'supervised', 'oversaw', 'directed', 'guided', 'mentored',
+    'trained', 'educated', 'coached', 'advised', 'consulted', 'recommended', 'proposed',
+    'suggested', 'advocated', 'presented', 'communicated', 'collaborated', 'partnered', 'liaised',
+    'negotiated', 'influenced', 'persuaded', 'convinced', 'motivated', 'inspired', 'empowered',
+    'enabled', 'supported', 'assisted', 'helped', 'contributed', 'participated', 'engaged',
+    'volunteered', 'organized', 'planned', 'strategized', 'forecasted', 'predicted', 'projected',
+    'budgeted', 'allocated', 'distributed', 'prioritized', 'scheduled', 'documented', 'recorded',
+    'reported', 'tracked', 'measured', 'quantified', 'calculated', 'computed', 'processed',
+    'aggregated', 'synthesized', 'compiled', 'collected', 'gathered', 'extracted', 'retrieved',
+    'queried', 'filtered', 'sorted', 'organized', 'structured', 'formatted', 'normalized',
+    'cleaned', 'validated', 'transformed', 'converted', 'migrated', 'imported', 'exported',
+    'transferred', 'synchronized', 'integrated', 'connected', 'linked', 'mapped', 'modeled',
+    'simulated', 'prototyped', 'demoed', 'showcased', 'demonstrated', 'illustrated', 'visualized',
+    'charted', 'graphed', 'plotted', 'rendered', 'published', 'released', 'shipped'
+)
+
+TECH_SKILL_SET = frozenset(TECH_SKILLS)
+ACTION_VERB_SET = frozenset(ACTION_VERBS)
+
+# Built once at import: one pass over a text finds every tech skill and
+# action verb it mentions, on whole-token boundaries.
+VOCABULARY_MATCHER = KeywordMatcher(TECH_SKILLS + ACTION_VERBS)
+
+# Loaded on first use and reloaded when the file changes; set
+# ATS_PROJECT_CATALOG to point at a team's own JSON/JSONL/SQLite catalog.
+PROJECT_CATALOG = ProjectCatalog(os.environ.get("ATS_PROJECT_CATALOG", DEFAULT_CATALOG_PATH), VOCABULARY_MATCHER)
+# Projects shown in Tab 2; near-duplicates (word Jaccard above the limit) are skipped.
+# On the shipped catalog pairs range up to ~0.4 and the median is ~0.17, so
+# 0.25 only separates the closest variations of the same project
+TOP_PROJECTS = 5
+PROJECT_MAX_SIMILARITY = 0.25
+
+# Phrases containing any of these words are treated as noise
+PHRASE_STOP_TOKENS = frozenset({'the', 'and', 'or', 'a'})
+
+QUANTIFIABLE_PATTERN = re.compile(r'\d+%|\d+\+|increased|decreased|improved|reduced')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# Resume fields that do not affect the analysis: the photo, and the projects
+# the analysis itself writes back into the resume
+FINGERPRINT_EXCLUDED_FIELDS = frozenset({'photo', 'projects'})
+MAX_CACHED_ANALYSES = 256
+ANALYSIS_TTL_SECONDS = 3600
+ANALYSIS_STAGES = ("tokenize", "score", "select")
+
+
+@dataclass
+class JobTerms:
+    """Keywords and phrases extracted from a single job description.
+
+    The sets and tech skills that ``score`` needs are derived once here, so
+    scoring many resumes against one job (batch mode, live re-scoring) does
+    not rebuild them per pair.
+    """
+    text: str
+    keywords: list
+    phrases: list
+    vocabulary_hits: list = field(default_factory=list)
+    tokens: list = field(default_factory=list)
+    unique_keywords: set = field(init=False, repr=False)
+    unique_phrases: set = field(init=False, repr=False)
+    tech_skills: list = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.unique_keywords = set(self.keywords)
+        self.unique_phrases = set(self.phrases)
+        self.tech_skills = [term for term in self.vocabulary_hits if term in TECH_SKILL_SET]
+
+
+@dataclass
+class ResumeTokens:
+    """A resume tokenized once into per-section tokens and n-gram sets.
+
+    N-grams and vocabulary hits never span two sections. The n-gram and hit
+    containers only need ``in``; ``IncrementalScorer`` passes counters.
+    """
+    texts: dict
+    sections: dict
+    unigrams: set
+    bigrams: set
+    trigrams: set
+    vocabulary_hits: set
+    section_hits: dict = field(default_factory=dict)
+    contact_complete: bool = False
+
+
+@dataclass
+class AtsResult:
+    """Structured outcome of scoring one resume against one job description."""
+    total_score: int
+    keyword_score: float
+    tech_score: float
+    phrase_score: float
+    action_verb_score: float
+    format_score: int
+    job_keywords: list
+    job_phrases: list
+    keyword_matches: list = field(default_factory=list)
+    tech_skill_matches: list = field(default_factory=list)
+    phrase_matches: list = field(default_factory=list)
+    action_verb_matches: list = field(default_factory=list)
+    missing_keywords: list = field(default_factory=list)
+    missing_tech: list = field(default_factory=list)
+    has_quantifiable: bool = False
+    contact_complete: bool = False
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def build_resume_text(resume_data):
+    """Flatten the saved resume into lowercase text per section."""
+    return {
+        'summary': resume_data.get('summary', '').lower(),
+        'experience': ' '.join([f"{exp.get('title', '')} {exp.get('company', '')} {' '.join(exp.get('responsibilities', []))}"
+                               for exp in resume_data.get('experiences', [])]).lower(),
+        'education': ' '.join([f"{edu.get('degree', '')} {edu.get('institution', '')}"
+                              for edu in resume_data.get('education', [])]).lower(),
+        'skills': ' '.join(resume_data.get('technical_skills', [])).lower()
+    }
+
+
+def build_ngrams(tokens):
+    """Collect unigram, bigram and trigram sets from a token list in one pass."""
+    unigrams, bigrams, trigrams = set(), set(), set()
+    previous = before_previous = None
+    for token in tokens:
+        unigrams.add(token)
+        if previous is not None:
+            bigrams.add(f"{previous} {token}")
+            if before_previous is not None:
+                trigrams.add(f"{before_previous} {previous} {token}")
+        before_previous, previous = previous, token
+    return unigrams, bigrams, trigrams
+
+
+def tokenize_section(text):
+    """Return a section's tokens, its n-gram sets and its ordered vocabulary hits."""
+    tokens = tokenize(text)
+    return tokens, build_ngrams(tokens), VOCABULARY_MATCHER.find_tokens(tokens)
+
+
+def contact_complete(resume_data):
+    return bool(resume_data.get('email')) and bool(resume_data.get('phone'))
+
+
+@metrics.timed("tokenize")
+def tokenize_resume(resume_data):
+    """Tokenize every resume section once so matching becomes set lookups."""
+    texts = build_resume_text(resume_data)
+    sections, section_hits = {}, {}
+    unigrams, bigrams, trigrams, vocabulary_hits = set(), set(), set(), set()
+    for name, text in texts.items():
+        tokens, (section_unigrams, section_bigrams, section_trigrams), hits = tokenize_section(text)
+        sections[name] = tokens
+        section_hits[name] = hits
+        unigrams |= section_unigrams
+        bigrams |= section_bigrams
+        trigrams |= section_trigrams
+        vocabulary_hits.update(hits)
+    return ResumeTokens(
+        texts=texts,
+        sections=sections,
+        unigrams=unigrams,
+        bigrams=bigrams,
+        trigrams=trigrams,
+        vocabulary_hits=vocabulary_hits,
+        section_hits=section_hits,
+        contact_complete=contact_complete(resume_data),
+    )
+
+
+@metrics.timed("tokenize")
+def extract_job_terms(job_description):
+    """Pull keywords plus bigram/trigram phrases out of a job description."""
+    job_desc_lower = job_description.lower()
+    tokens = tokenize(job_desc_lower)
+
+    # Extract keywords
+    job_keywords = [t for t in tokens if t.isalpha() and len(t) > 3 and t not in STOP_WORDS]
+
+    # Extract multi-word phrases (bigrams and trigrams)
+    job_phrases = []
+
+    for i in range(len(tokens) - 1):
+        pair = tokens[i:i+2]
+        if all(len(t) > 2 for t in pair) and PHRASE_STOP_TOKENS.isdisjoint(pair):
+            job_phrases.append(' '.join(pair))
+
+    for i in range(len(tokens) - 2):
+        triple = tokens[i:i+3]
+        if all(len(t) > 2 for t in triple) and PHRASE_STOP_TOKENS.isdisjoint(triple):
+            job_phrases.append(' '.join(triple))
+
+    return JobTerms(text=job_desc_lower, keywords=job_keywords, phrases=job_phrases,
+                    vocabulary_hits=VOCABULARY_MATCHER.find_tokens(tokens),
+                    tokens=[t for t in tokens if len(t) > 1 and t not in STOP_WORDS])
+
+
+@metrics.timed("score")
+def score(resume_data, job_description):
+    """Score a resume against a job description.
+
+    ``resume_data`` may be the saved resume dict or a precomputed
+    ``ResumeTokens``; ``job_description`` may be raw text or a precomputed
+    ``JobTerms``, so batch callers can prepare each side once. Weights are
+    keywords 40, tech skills 25, phrases 20, action verbs 10 and format 5.
+    """
+    job = job_description if isinstance(job_description, JobTerms) else extract_job_terms(job_description)
+    resume = resume_data if isinstance(resume_data, ResumeTokens) else tokenize_resume(resume_data)
+
+    unique_keywords = job.unique_keywords
+    unique_phrases = job.unique_phrases
+
+    # Calculate matches as set lookups against the tokenized resume
+    keyword_matches = [keyword for keyword in unique_keywords if keyword in resume.unigrams]
+    phrase_matches = [phrase for phrase in unique_phrases
+                      if phrase in resume.bigrams or phrase in resume.trigrams]
+
+    tech_keywords_in_job = job.tech_skills
+    tech_skill_matches = [skill for skill in tech_keywords_in_job if skill in resume.vocabulary_hits]
+    action_verb_matches = [verb for verb in resume.section_hits['experience'] if verb in ACTION_VERB_SET]
+
+    # Keywords score (40 points) - base + bonus
+    base_keyword_score = (len(keyword_matches) / max(len(unique_keywords), 1)) * 35
+    bonus_keywords = min(5, len(keyword_matches) // 10)  # Bonus for having many keywords
+    keyword_score = min(40, base_keyword_score + bonus_keywords)
+
+    # Tech skills score (25 points) - weighted higher if tech job
+    if tech_keywords_in_job:
+        tech_score = (len(tech_skill_matches) / max(len(tech_keywords_in_job), 1)) * 25
+    else:
+        # If not a tech-heavy job, give partial credit
+        tech_score = (len(tech_skill_matches) / max(len(TECH_SKILLS[:20]), 1)) * 25
+    tech_score = min(25, tech_score)
+
+    # Phrase score (20 points) - bonus for exact matches
+    base_phrase_score = (len(phrase_matches) / max(len(unique_phrases), 1)) * 18
+    bonus_phrases = min(2, len(phrase_matches) // 5)  # Bonus for many phrase matches
+    phrase_score = min(20, base_phrase_score + bonus_phrases)
+
+    # Action verb score (10 points) - need only 5 verbs for full score
+    action_verb_score = min(10, (len(action_verb_matches) / 5) * 10)
+
+    # Format score (5 points) - always full since we use good template
+    format_score = 5
+
+    total_score = min(100, int(keyword_score + tech_score + phrase_score + action_verb_score + format_score))
+
+    return AtsResult(
+        total_score=total_score,
+        keyword_score=keyword_score,
+        tech_score=tech_score,
+        phrase_score=phrase_score,
+        action_verb_score=action_verb_score,
+        format_score=format_score,
+        job_keywords=job.keywords,
+        job_phrases=job.phrases,
+        keyword_matches=keyword_matches,
+        tech_skill_matches=tech_skill_matches,
+        phrase_matches=phrase_matches,
+        action_verb_matches=action_verb_matches,
+        missing_keywords=list(unique_keywords - set(keyword_matches)),
+        missing_tech=[skill for skill in tech_keywords_in_job if skill not in resume.vocabulary_hits],
+        has_quantifiable=bool(QUANTIFIABLE_PATTERN.search(resume.texts['experience'])),
+        contact_complete=resume.contact_complete,
+    )
+
+
+class IncrementalScorer:
+    """Score one job description against a resume that is edited over time.
+
+    The scorer keeps each section's tokens, n-grams and vocabulary hits, plus
+    counters summed over all sections. ``update`` re-tokenizes only the
+    sections whose text changed and adjusts the counters by the difference,
+    so ``score`` costs about the size of the job description, not the resume.
+    It gives the same result as ``score(resume_data, job_description)``.
+    """
+
+    def __init__(self, job_description):
+        self.job = job_description if isinstance(job_description, JobTerms) else extract_job_terms(job_description)
+        self.texts = {}
+        self.sections = {}
+        self.section_hits = {}
+        self._section_grams = {}
+        self.unigrams = Counter()
+        self.bigrams = Counter()
+        self.trigrams = Counter()
+        self.vocabulary_hits = Counter()
+        self.contact_complete = False
+
+    def _apply(self, grams, hits, sign):
+        for counter, items in zip((self.unigrams, self.bigrams, self.trigrams, self.vocabulary_hits),
+                                  (*grams, hits)):
+            for item in items:
+                counter[item] += sign
+                if counter[item] <= 0:
+                    del counter[item]
+
+    @metrics.timed("tokenize")
+    def update(self, resume_data):
+        """Bring the scorer up to date with ``resume_data``; return the changed section names."""
+        changed = []
+        for name, text in build_resume_text(resume_data).items():
+            if self.texts.get(name) == text:
+                continue
+            if name in self._section_grams:
+                self._apply(self._section_grams[name], self.section_hits[name], -1)
+            tokens, grams, hits = tokenize_section(text)
+            self._apply(grams, hits, 1)
+            self.texts[name] = text
+            self.sections[name] = tokens
+            self.section_hits[name] = hits
+            self._section_grams[name] = grams
+            changed.append(name)
+        self.contact_complete = contact_complete(resume_data)
+        return changed
+
+    def tokens(self):
+        """Return the current state as ``ResumeTokens`` (sharing the live counters)."""
+        return ResumeTokens(
+            texts=self.texts,
+            sections=self.sections,
+            unigrams=self.unigrams,
+            bigrams=self.bigrams,
+            trigrams=self.trigrams,
+            vocabulary_hits=self.vocabulary_hits,
+            section_hits=self.section_hits,
+            contact_complete=self.contact_complete,
+        )
+
+    def score(self, resume_data=None):
+        """Return the ``AtsResult``, first applying ``resume_data`` if given."""
+        if resume_data is not None:
+            self.update(resume_data)
+        return score(self.tokens(), self.job)
+
+
+@metrics.timed("select")
+def select_projects(job_description, tech_skill_matches, index=None, limit=TOP_PROJECTS, method="bm25",
+                    max_similarity=None):
+    """Rank projects for a job and return the best ``(project, score)`` pairs.
+
+    ``method="bm25"`` ranks by BM25 relevance of the job text, with the
+    resume's matched tech skills added to the query as a boost;
+    ``method="points"`` uses the original hand-tuned points (+2 per job
+    keyword, +5 per project keyword, +3 per matched tech skill). Only the
+    top ``limit`` projects are kept (see ``ProjectIndex.top_k``), and
+    ``max_similarity`` skips projects too similar to one already picked.
+    Uses the current ``PROJECT_CATALOG`` index unless ``index`` is given.
+    """
+    job = job_description if isinstance(job_description, JobTerms) else extract_job_terms(job_description)
+    if index is None:
+        index = PROJECT_CATALOG.index()
+
+    if method == "bm25":
+        query = job.tokens + [token for skill in tech_skill_matches for token in tokenize(skill)]
+        scores = index.relevance(query)
+    elif method == "points":
+        scores = index.score(job.keywords, job.text, tech_skill_matches)
+    else:
+        raise ValueError(f"Unknown ranking method: {method}")
+
+    top = index.top_k(scores, limit, max_similarity=max_similarity)
+    return [(index.projects[project_id], round(score, 2)) for project_id, score in top]
+
+
+@dataclass
+class Analysis:
+    """Score plus selected projects for one (resume, job description) pair."""
+    key: str
+    result: AtsResult
+    project_scores: list
+
+    def to_dict(self):
+        return {"key": self.key, "result": self.result.to_dict(),
+                "project_scores": [[project, score] for project, score in self.project_scores]}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(key=data["key"], result=AtsResult(**data["result"]),
+                   project_scores=[(project, score) for project, score in data["project_scores"]])
+
+
+class AnalysisCache:
+    """Thread-safe LRU of ``Analysis`` results whose entries expire after ``ttl`` seconds."""
+
+    def __init__(self, max_entries=MAX_CACHED_ANALYSES, ttl=ANALYSIS_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Shared by every session in the process
+ANALYSIS_CACHE = AnalysisCache()
+
+
+def analysis_key(resume_data, job_description, **options):
+    """Return a stable fingerprint of the normalized resume, job description and options.
+
+    Whitespace runs in the job description are collapsed and case is ignored;
+    the current catalog version is included so a reloaded catalog is re-ranked.
+    """
+    resume = {k: v for k, v in resume_data.items() if k not in FINGERPRINT_EXCLUDED_FIELDS}
+    payload = json.dumps({
+        'resume': resume,
+        'job': WHITESPACE_PATTERN.sub(' ', job_description).strip().lower(),
+        'options': options,
+        'catalog': PROJECT_CATALOG.version,
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def analyze(resume_data, job_description, cache=ANALYSIS_CACHE, progress=None, **options):
+    """Score the resume and select projects, reusing a cached ``Analysis`` when possible.
+
+    ``options`` are passed to ``select_projects``. Pass ``cache=None`` to
+    always recompute. ``progress(stage)`` is called as each of
+    ``ANALYSIS_STAGES`` starts; it may raise to abort the analysis.
+    """
+    key = analysis_key(resume_data, job_description, **options)
+    if cache is not None:
+        analysis = cache.get(key)
+        if analysis is not None:
+            metrics.count("analysis_cache_hit")
+            return analysis
+
+    if progress:
+        progress("tokenize")
+    job_terms = extract_job_terms(job_description)
+    if progress:
+        progress("score")
+    result = score(resume_data, job_terms)
+    if progress:
+        progress("select")
+    project_scores = select_projects(job_terms, result.tech_skill_matches, **options)
+    analysis = Analysis(key=key, result=result, project_scores=project_scores)
+    if cache is not None:
+        cache.put(key, analysis)
+    return analysis
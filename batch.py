@@ -0,0 +1,185 @@
+"""Batch ATS mode: score many CVs against many job descriptions.
+
+Each job description is turned into ``JobTerms`` once and shipped to every
+worker process; each CV is extracted and tokenized once and then scored
+against all jobs, producing a resumes x jobs matrix of ATS scores.
+
+Usage::
+
+    python batch.py --cvs cvs.zip --jobs jobs/ --output scores.csv
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from ats_engine import extract_job_terms, score, tokenize_resume
+from cv_extract import POOL_CONTEXT, extract_text, kind_from_name
+from cv_fields import extract_fields
+
+# Job terms shared by every task in a worker process
+_worker_jobs = {}
+
+
+def resume_data_from_text(cv_text):
+    """Wrap raw CV text in the resume_data shape the scorer expects.
+
+    Uploaded CVs carry no form structure, so every line is scored as an
+    experience bullet; email and phone are picked up for the contact check.
+    """
+    fields = extract_fields(cv_text)
+    return {
+        "email": fields.get("email", ""),
+        "phone": fields.get("phone", ""),
+        "experiences": [{"responsibilities": [line for line in cv_text.splitlines() if line.strip()]}],
+    }
+
+
+def read_cvs(path):
+    """Yield ``(name, kind, bytes)`` for every supported CV in a folder or zip."""
+    path = Path(path)
+    if path.is_dir():
+        for file in sorted(path.rglob("*")):
+            kind = kind_from_name(file.name)
+            if kind and file.is_file():
+                yield str(file.relative_to(path)), kind, file.read_bytes()
+    else:
+        with zipfile.ZipFile(path) as archive:
+            yield from read_cv_zip(archive)
+
+
+def read_cv_zip(archive):
+    """Yield ``(name, kind, bytes)`` for every supported CV in an open zip."""
+    for info in archive.infolist():
+        kind = kind_from_name(info.filename)
+        if kind and not info.is_dir() and not info.filename.startswith("__MACOSX/"):
+            yield info.filename, kind, archive.read(info)
+
+
+def read_jobs(path):
+    """Load job descriptions from a folder of .txt files or a JSON file.
+
+    The JSON file may be an object mapping job name to text, or a list of
+    texts (named job_1, job_2, ...).
+    """
+    path = Path(path)
+    if path.is_dir():
+        return {file.stem: file.read_text(encoding="utf-8") for file in sorted(path.glob("*.txt"))}
+    if path.suffix.lower() == ".json":
+        jobs = json.loads(path.read_text(encoding="utf-8"))
+        if isinstance(jobs, list):
+            return {f"job_{i}": text for i, text in enumerate(jobs, 1)}
+        return jobs
+    return {path.stem: path.read_text(encoding="utf-8")}
+
+
+def _init_worker(job_terms):
+    _worker_jobs.clear()
+    _worker_jobs.update(job_terms)
+
+
+def _score_cv(task):
+    name, kind, data = task
+    try:
+        resume = tokenize_resume(resume_data_from_text(extract_text(data, kind, parallel=False)))
+    except Exception as e:
+        return name, None, str(e)
+    return name, {job: score(resume, terms).total_score for job, terms in _worker_jobs.items()}, None
+
+
+def score_matrix(cvs, jobs, workers=None, progress=None):
+    """Score every CV against every job description.
+
+    ``cvs`` is an iterable of ``(name, kind, bytes)`` and ``jobs`` maps job
+    names to description text. Returns ``(rows, errors)`` where ``rows`` maps
+    each CV name to ``{job name: score}`` and ``errors`` maps unreadable CV
+    names to the error message. ``progress("score", fraction)`` is called as
+    CVs complete (the fraction stays 0 unless ``cvs`` is a list); if it
+    raises, e.g. because a background job was cancelled, queued CVs are
+    dropped and the call returns without waiting for the ones in progress.
+    """
+    total = len(cvs) if isinstance(cvs, (list, tuple)) else None
+    job_terms = {name: extract_job_terms(text) for name, text in jobs.items()}
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        _init_worker(job_terms)
+        results = map(_score_cv, cvs)
+        return _collect(results, total, progress)
+
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=POOL_CONTEXT,
+                               initializer=_init_worker, initargs=(job_terms,))
+    finished = False
+    try:
+        result = _collect(pool.map(_score_cv, cvs, chunksize=16), total, progress)
+        finished = True
+        return result
+    finally:
+        pool.shutdown(wait=finished, cancel_futures=True)
+
+
+def _collect(results, total=None, progress=None):
+    rows, errors = {}, {}
+    for done, (name, scores, error) in enumerate(results, 1):
+        if progress:
+            progress("score", done / total if total else 0.0)
+        if error is None:
+            rows[name] = scores
+        else:
+            errors[name] = error
+    return rows, errors
+
+
+def matrix_to_csv(rows, jobs):
+    """Render a score matrix as CSV text with one row per CV."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["resume"] + list(jobs))
+    for name, scores in rows.items():
+        writer.writerow([name] + [scores[job] for job in jobs])
+    return buffer.getvalue()
+
+
+def matrix_to_json(rows, jobs, errors=None):
+    """Render a score matrix as a JSON document."""
+    return json.dumps({"jobs": list(jobs), "scores": rows, "errors": errors or {}}, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a folder or zip of CVs against job descriptions.")
+    parser.add_argument("--cvs", required=True, help="Folder or .zip of PDF/DOCX/TXT CVs")
+    parser.add_argument("--jobs", required=True, help="Folder of .txt job descriptions, a .json file or a single .txt")
+    parser.add_argument("--output", default="-", help="Output .csv or .json file (default: CSV on stdout)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    args = parser.parse_args(argv)
+
+    jobs = read_jobs(args.jobs)
+    if not jobs:
+        parser.error(f"No job descriptions found in {args.jobs}")
+
+    rows, errors = score_matrix(read_cvs(args.cvs), jobs, workers=args.workers)
+
+    if args.output.lower().endswith(".json"):
+        output = matrix_to_json(rows, jobs, errors)
+    else:
+        output = matrix_to_csv(rows, jobs)
+
+    if args.output == "-":
+        sys.stdout.write(output)
+    else:
+        Path(args.output).write_text(output, encoding="utf-8")
+        print(f"Scored {len(rows)} CVs against {len(jobs)} jobs -> {args.output}", file=sys.stderr)
+
+    for name, error in errors.items():
+        print(f"Skipped {name}: {error}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""Per-CV latency of the Auto-Fill field extractor on 1-20 page CVs.
+
+Run from the repository root::
+
+    python benchmarks/bench_autofill.py
+"""
+
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cv_fields import extract_fields  # noqa: E402
+from cv_sections import clear_index_cache  # noqa: E402
+
+LINES_PER_PAGE = 50
+PAGE_COUNTS = [1, 2, 5, 10, 20]
+REPEATS = 20
+
+WORDS = ("developed managed python sql pipelines machine learning analytics team cloud "
+         "aws docker dashboards reporting stakeholders delivered improved reduced data").split()
+
+
+def synthetic_cv(pages, with_links=True, seed=0):
+    """Build a plain-text CV with a contact block, sections and filler bullets.
+
+    Without links the extractor cannot stop early and has to scan every line.
+    """
+    rng = random.Random(seed)
+    lines = [
+        "Jane A. Doe",
+        "Email: jane.doe@example.com | Phone: +1 (555) 123-4567",
+        "Location: Austin, TX",
+        "linkedin.com/in/janedoe | github.com/janedoe" if with_links else "Open to relocation",
+        "Summary",
+        "Data professional building analytics platforms and reliable pipelines.",
+        "Technical Skills",
+        "Python, SQL, Pandas, NumPy, AWS, Docker",
+        "Experience",
+    ]
+    while len(lines) < pages * LINES_PER_PAGE:
+        lines.append("- " + " ".join(rng.choice(WORDS) for _ in range(14)))
+    return "\n".join(lines)
+
+
+def measure(cv_text):
+    timings = []
+    for _ in range(REPEATS):
+        clear_index_cache()  # measure a cold CV, including section indexing
+        start = time.perf_counter()
+        extract_fields(cv_text)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+
+def main():
+    print(f"{'pages':>5} {'links':>6} {'chars':>8} {'median ms':>10} {'p95 ms':>8}")
+    for pages in PAGE_COUNTS:
+        for with_links in (True, False):
+            cv_text = synthetic_cv(pages, with_links)
+            median, p95 = measure(cv_text)
+            print(f"{pages:>5} {'yes' if with_links else 'no':>6} {len(cv_text):>8} {median:>10.3f} {p95:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Generation time of the HTML, PDF and DOCX resume exports.
+
+Builds a resume with 10 experiences (8 bullets each) and 20 projects and
+times each exporter cold (cache cleared before every run) and warm (same
+data again, served from the cache).
+
+Run from the repository root::
+
+    python benchmarks/bench_export.py
+"""
+
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from resume_docx import clear_docx_cache, render_docx  # noqa: E402
+from resume_pdf import clear_pdf_cache, render_pdf  # noqa: E402
+from resume_template import clear_render_cache, render_resume  # noqa: E402
+
+EXPERIENCES = 10
+PROJECTS = 20
+REPEATS = 10
+
+
+def synthetic_resume(experiences=EXPERIENCES, projects=PROJECTS):
+    return {
+        "name": "Jane A. Doe",
+        "email": "jane.doe@example.com",
+        "phone": "+1 (555) 123-4567",
+        "location": "Austin, TX",
+        "linkedin": "https://linkedin.com/in/janedoe",
+        "github": "https://github.com/janedoe",
+        "summary": "Data professional building analytics platforms and reliable pipelines. " * 3,
+        "experiences": [{
+            "title": f"Senior Data Engineer {i}",
+            "company": f"Company {i}",
+            "start": f"Jan {2010 + i}",
+            "end": f"Dec {2011 + i}",
+            "responsibilities": [f"Developed pipeline {j} processing 10,000+ records daily with Python and SQL"
+                                 for j in range(8)],
+        } for i in range(experiences)],
+        "projects": [{
+            "title": f"Project {i}: Data Analysis & Visualization",
+            "description": "Explored and cleaned datasets with pandas, built dashboards and reported insights. " * 2,
+            "keywords": ["python", "pandas"],
+        } for i in range(projects)],
+        "education": [{"degree": "BSc Computer Science", "institution": "State University",
+                       "start": "2005", "end": "2009", "gpa": "3.8"}],
+        "technical_skills": ["Python", "SQL", "Pandas", "NumPy", "AWS", "Docker", "Machine Learning"],
+        "certifications": ["Professional Certificate in Artificial Intelligence"],
+    }
+
+
+def measure(render, clear, data):
+    """Return (median cold ms, median warm ms) for one exporter."""
+    cold, warm = [], []
+    for _ in range(REPEATS):
+        clear()
+        start = time.perf_counter()
+        render(data)
+        cold.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        render(data)
+        warm.append(time.perf_counter() - start)
+    return statistics.median(cold) * 1000, statistics.median(warm) * 1000
+
+
+def main():
+    data = synthetic_resume()
+    exporters = [
+        ("html", render_resume, clear_render_cache),
+        ("pdf", render_pdf, clear_pdf_cache),
+        ("docx", render_docx, clear_docx_cache),
+    ]
+    print(f"Resume with {EXPERIENCES} experiences and {PROJECTS} projects, median of {REPEATS} runs")
+    print(f"{'format':<8} {'cold ms':>10} {'cached ms':>10} {'bytes':>10}")
+    for name, render, clear in exporters:
+        cold, warm = measure(render, clear, data)
+        print(f"{name:<8} {cold:>10.2f} {warm:>10.3f} {len(render(data)):>10}")
+
+
+if __name__ == "__main__":
+    main()
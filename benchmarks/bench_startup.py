@@ -0,0 +1,69 @@
+"""Import-time cost of the engine vs. the per-rerun cost it saves.
+
+Before the vocabularies and the resume stylesheet moved into modules, every
+Streamlit rerun rebuilt them as literals and tech-skill checks scanned a
+list. This script measures the one-off import cost, the cost of rebuilding
+the literals on each rerun, and list vs. frozenset membership.
+
+Run from the repository root::
+
+    python benchmarks/bench_startup.py
+"""
+
+import importlib
+import sys
+import time
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+MODULES = ["keyword_matcher", "projects", "ats_engine", "resume_template"]
+REPEATS = 2000
+
+
+def measure_imports():
+    """Return seconds spent importing the engine modules from a cold state."""
+    for name in MODULES + ["project_index", "relevance"]:
+        sys.modules.pop(name, None)
+    start = time.perf_counter()
+    for name in MODULES:
+        importlib.import_module(name)
+    return time.perf_counter() - start
+
+
+def per_call_ms(statement, namespace):
+    return timeit.timeit(statement, globals=namespace, number=REPEATS) / REPEATS * 1000
+
+
+def main():
+    import_seconds = measure_imports()
+
+    import ats_engine
+    from resume_template import RESUME_STYLE
+
+    # The old app.py evaluated these literals on every rerun
+    literals = compile(f"({list(ats_engine.STOP_WORDS)!r}, {list(ats_engine.TECH_SKILLS)!r}, "
+                       f"{list(ats_engine.ACTION_VERBS)!r}, {RESUME_STYLE!r})", "<rerun>", "eval")
+    stop_words = compile(f"set({list(ats_engine.STOP_WORDS)!r})", "<rerun>", "eval")
+    namespace = {
+        "literals": literals,
+        "stop_words": stop_words,
+        "skill_list": list(ats_engine.TECH_SKILLS),
+        "skill_set": ats_engine.TECH_SKILL_SET,
+        "probes": ["python", "pandas", "time management", "cobol", "excel"] * 20,
+    }
+
+    rebuild = per_call_ms("eval(literals); eval(stop_words)", namespace)
+    list_lookup = per_call_ms("[p in skill_list for p in probes]", namespace)
+    set_lookup = per_call_ms("[p in skill_set for p in probes]", namespace)
+
+    print(f"{'measurement':<40} {'ms':>10}")
+    print(f"{'import engine modules (once)':<40} {import_seconds * 1000:>10.2f}")
+    print(f"{'rebuild vocab + CSS literals (per rerun)':<40} {rebuild:>10.4f}")
+    print(f"{'100 tech-skill checks, list':<40} {list_lookup:>10.4f}")
+    print(f"{'100 tech-skill checks, frozenset':<40} {set_lookup:>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""End-to-end benchmark suite over a synthetic corpus of CVs and job descriptions.
+
+Generates seeded CVs as TXT, DOCX and PDF (1-30 pages) and job descriptions
+of three lengths, then measures every stage of the app on them: extraction,
+Auto-Fill, ATS scoring, project selection and HTML/PDF/DOCX rendering. For
+each case it records median and p95 latency, throughput and the peak Python
+heap of one cold run (``tracemalloc``; PDF pages parsed in worker processes
+are not included). Caches are cleared before every run, so the numbers are
+cold-path costs.
+
+Each run is written as JSON to ``benchmarks/results/bench_<UTC time>.json``
+(ignored by git), so earlier runs stay around to compare against::
+
+    python benchmarks/bench_suite.py
+    python benchmarks/bench_suite.py --compare benchmarks/results/bench_20260101T120000Z.json
+    python benchmarks/bench_suite.py --quick         # smaller corpus, fewer repeats
+    python benchmarks/bench_suite.py --output after.json
+"""
+
+import argparse
+import json
+import math
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from io import BytesIO
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from ats_engine import ANALYSIS_CACHE, score, select_projects  # noqa: E402
+from bench_autofill import LINES_PER_PAGE, WORDS, synthetic_cv  # noqa: E402
+from bench_export import synthetic_resume  # noqa: E402
+from cv_extract import extract_text  # noqa: E402
+from cv_fields import extract_fields  # noqa: E402
+from cv_sections import clear_index_cache  # noqa: E402
+from resume_docx import clear_docx_cache, render_docx  # noqa: E402
+from resume_pdf import clear_pdf_cache, render_pdf, render_text_pdf  # noqa: E402
+from resume_template import clear_render_cache, render_resume  # noqa: E402
+
+PAGE_COUNTS = [1, 5, 15, 30]
+JD_WORDS = [50, 300, 1500]
+REPEATS = 7
+QUICK_PAGE_COUNTS = [1, 5]
+QUICK_JD_WORDS = [50, 300]
+QUICK_REPEATS = 3
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+JD_TERMS = ("python sql pandas numpy aws docker kubernetes machine learning data pipelines dashboards "
+            "tableau spark statistics communication stakeholders experience required preferred team").split()
+
+
+def synthetic_job(words, seed=0):
+    rng = random.Random(seed)
+    return "Senior Data Scientist\n" + " ".join(rng.choice(JD_TERMS + WORDS) for _ in range(words))
+
+
+def cv_as_docx(text):
+    import docx
+    doc = docx.Document()
+    for line in text.split("\n"):
+        doc.add_paragraph(line)
+    buffer = BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def cv_as_pdf(text):
+    lines = text.split("\n")
+    # Same page breaks as the TXT/DOCX page count
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)]
+    return render_text_pdf(pages, "Synthetic CV", size=8)
+
+
+def build_corpus(page_counts):
+    """Return ``{(format, pages): bytes}`` plus the plain text per page count."""
+    texts = {pages: synthetic_cv(pages, with_links=False, seed=pages) for pages in page_counts}
+    files = {}
+    for pages, text in texts.items():
+        files["txt", pages] = text.encode("utf-8")
+        files["docx", pages] = cv_as_docx(text)
+        files["pdf", pages] = cv_as_pdf(text)
+    return files, texts
+
+
+def clear_caches():
+    clear_index_cache()
+    clear_render_cache()
+    clear_pdf_cache()
+    clear_docx_cache()
+    ANALYSIS_CACHE.clear()
+
+
+def measure(run, repeats):
+    """Time ``run`` cold ``repeats`` times, then once more under tracemalloc for the peak heap.
+
+    One untimed run first pays for one-off setup (worker pools, catalog and index loading).
+    """
+    run()
+    timings = []
+    for _ in range(repeats):
+        clear_caches()
+        start = time.perf_counter()
+        run()
+        timings.append((time.perf_counter() - start) * 1000)
+    clear_caches()
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    timings.sort()
+    mean = statistics.fmean(timings)
+    return {
+        "median_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(timings[math.ceil(len(timings) * 0.95) - 1], 3),
+        "per_second": round(1000 / mean, 2) if mean else None,
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def cases(page_counts, jd_words):
+    """Yield ``(stage, parameters, callable)`` for every benchmark case."""
+    files, texts = build_corpus(page_counts)
+    jobs = {words: synthetic_job(words, seed=words) for words in jd_words}
+    # Resume size scales with the same numbers: one experience (8 bullets) per CV page
+    resumes = {pages: synthetic_resume(experiences=pages, projects=5) for pages in page_counts}
+
+    for (kind, pages), data in files.items():
+        yield "extract", {"format": kind, "pages": pages, "bytes": len(data)}, lambda d=data, k=kind: extract_text(d, k)
+    for pages, text in texts.items():
+        yield "autofill", {"pages": pages}, lambda t=text: extract_fields(t)
+    for pages, resume in resumes.items():
+        for words, job in jobs.items():
+            yield "score", {"experiences": pages, "jd_words": words}, lambda r=resume, j=job: score(r, j)
+    for words, job in jobs.items():
+        matches = score(resumes[page_counts[0]], job).tech_skill_matches
+        yield "select", {"jd_words": words}, lambda j=job, m=matches: select_projects(j, m)
+    for pages, resume in resumes.items():
+        for stage, render in (("render_html", render_resume), ("render_pdf", render_pdf),
+                              ("render_docx", render_docx)):
+            yield stage, {"experiences": pages}, lambda r=resume, f=render: f(r)
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def case_key(row):
+    return (row["stage"], row.get("format"), row.get("pages"), row.get("experiences"), row.get("jd_words"))
+
+
+def run_suite(page_counts, jd_words, repeats):
+    rows = []
+    print(f"{'stage':<12} {'case':<30} {'median ms':>10} {'p95 ms':>10} {'per s':>9} {'peak KB':>9}")
+    for stage, params, run in cases(page_counts, jd_words):
+        row = {"stage": stage, **params, **measure(run, repeats)}
+        rows.append(row)
+        label = " ".join(f"{k}={v}" for k, v in params.items() if k != "bytes")
+        print(f"{stage:<12} {label:<30} {row['median_ms']:>10.3f} {row['p95_ms']:>10.3f} "
+              f"{row['per_second'] or 0:>9.1f} {row['peak_kb']:>9.1f}")
+    return rows
+
+
+def compare(rows, baseline_path):
+    baseline = {case_key(row): row for row in json.loads(Path(baseline_path).read_text())["results"]}
+    print(f"\nMedian latency vs {baseline_path} (ratio < 1 is faster)")
+    for row in rows:
+        before = baseline.get(case_key(row))
+        if before and before["median_ms"]:
+            ratio = row["median_ms"] / before["median_ms"]
+            label = " ".join(str(part) for part in case_key(row)[1:] if part is not None)
+            print(f"{row['stage']:<12} {label:<16} {before['median_ms']:>10.3f} -> {row['median_ms']:>10.3f}  x{ratio:.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--output", help="where to write the JSON results (default: a new file in benchmarks/results/)")
+    parser.add_argument("--compare", help="earlier results JSON to compare against")
+    parser.add_argument("--quick", action="store_true", help="small corpus and fewer repeats")
+    parser.add_argument("--repeats", type=int, help="timed runs per case")
+    args = parser.parse_args(argv)
+
+    page_counts = QUICK_PAGE_COUNTS if args.quick else PAGE_COUNTS
+    jd_words = QUICK_JD_WORDS if args.quick else JD_WORDS
+    repeats = args.repeats or (QUICK_REPEATS if args.quick else REPEATS)
+
+    rows = run_suite(page_counts, jd_words, repeats)
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {"page_counts": page_counts, "jd_words": jd_words, "repeats": repeats},
+        "results": rows,
+    }
+    if args.output:
+        output = Path(args.output)
+    else:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        output = RESULTS_DIR / f"bench_{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}.json"
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nWrote {len(rows)} results to {output}")
+    if args.compare:
+        compare(rows, args.compare)
+
+
+if __name__ == "__main__":
+    main()
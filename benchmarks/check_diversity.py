@@ -0,0 +1,46 @@
+"""Check that the default diversity limit changes the top projects on the shipped catalog.
+
+The catalog has several variations of "Python data processing/automation"
+projects. A job asking for exactly that should not get five of them: with
+``PROJECT_MAX_SIMILARITY`` at least two of the unlimited top five must be
+replaced, and no two picked projects may be more similar than the limit.
+
+Run from the repository root::
+
+    python benchmarks/check_diversity.py
+"""
+
+import itertools
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ats_engine import PROJECT_CATALOG, PROJECT_MAX_SIMILARITY, TOP_PROJECTS, select_projects  # noqa: E402
+from project_index import jaccard  # noqa: E402
+
+JOB = ("Python Data Processing Automation Engineer. Build Python data processing pipelines "
+       "and automation scripts for data cleaning and transformation.")
+MIN_REPLACED = 2
+
+
+def main():
+    index = PROJECT_CATALOG.index()
+    unlimited = [p['title'] for p, _ in select_projects(JOB, [], limit=TOP_PROJECTS)]
+    diverse = select_projects(JOB, [], limit=TOP_PROJECTS, max_similarity=PROJECT_MAX_SIMILARITY)
+    titles = [p['title'] for p, _ in diverse]
+
+    print("Without limit:     ", *unlimited, sep="\n  ")
+    print(f"max_similarity={PROJECT_MAX_SIMILARITY}:", *titles, sep="\n  ")
+
+    replaced = len(set(titles) - set(unlimited))
+    signatures = {p['title']: index.signatures[index.projects.index(p)] for p, _ in diverse}
+    closest = max(jaccard(signatures[a], signatures[b]) for a, b in itertools.combinations(titles, 2))
+    print(f"\n{replaced} of {TOP_PROJECTS} projects replaced; closest picked pair {closest:.2f}")
+    if len(titles) < TOP_PROJECTS or replaced < MIN_REPLACED or closest > PROJECT_MAX_SIMILARITY:
+        raise SystemExit("FAIL: the diversity limit does not diversify this job's top projects")
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
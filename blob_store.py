@@ -0,0 +1,262 @@
+"""Content-addressed storage for uploaded binaries (photos, CV text).
+
+Session state holds only a short reference (``"sha256:<hex>"``) instead of
+the bytes themselves, so an upload shared by many sessions - or kept in
+several places of one session, like the photo inside ``resume_data`` - is
+held once. Blobs are written through to a directory on ``put`` and kept in a
+memory-capped LRU; evicted blobs are read back from disk on the next ``get``.
+Point ``ATS_BLOB_DIR`` at a shared volume when running several app replicas
+against one session store.
+
+Blobs are personal data (CV text, photos), so the directory is private to
+the app's user (0700, files 0600). Disk use is bounded: blobs unused for
+``max_age`` seconds are deleted, and then the least recently used ones
+until the store fits in ``max_disk_bytes``. Blobs held in memory are in use
+and never collected.
+"""
+
+import hashlib
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+REF_PREFIX = "sha256:"
+REF_PATTERN = re.compile(r"sha256:[0-9a-f]{64}")
+DEFAULT_MEMORY_MB = 64
+DEFAULT_DISK_MB = 1024
+DEFAULT_MAX_AGE_DAYS = 30
+# At most one garbage collection per interval, run by the ``put`` that finds it due
+GC_INTERVAL_SECONDS = 600
+
+
+def is_ref(value):
+    return isinstance(value, str) and REF_PATTERN.fullmatch(value) is not None
+
+
+class BlobStore:
+    """Deduplicated blobs: an in-memory LRU capped at ``max_memory_bytes`` over a directory."""
+
+    def __init__(self, directory, max_memory_bytes=DEFAULT_MEMORY_MB * 1024 * 1024,
+                 max_disk_bytes=DEFAULT_DISK_MB * 1024 * 1024, max_age=DEFAULT_MAX_AGE_DAYS * 86400):
+        self.directory = Path(directory)
+        self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        try:
+            self.directory.chmod(0o700)  # also tighten a directory left by an older version
+        except OSError:
+            pass
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.max_age = max_age
+        self._blobs = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._last_gc = 0.0
+
+    def _path(self, digest):
+        return self.directory / digest[:2] / digest
+
+    def _remember(self, digest, data):
+        """Add to the LRU and evict; caller holds the lock."""
+        if digest in self._blobs:
+            self._blobs.move_to_end(digest)
+            return
+        if len(data) > self.max_memory_bytes:
+            return  # larger than the whole cache: always served from disk
+        self._blobs[digest] = data
+        self._memory_bytes += len(data)
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._blobs.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def put(self, data):
+        """Store ``data`` and return its reference; storing the same bytes again is free."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        if path.exists():
+            _touch(path)
+        else:
+            path.parent.mkdir(mode=0o700, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        with self._lock:
+            self._remember(digest, data)
+            gc_due = time.monotonic() - self._last_gc > GC_INTERVAL_SECONDS
+            if gc_due:
+                self._last_gc = time.monotonic()
+        if gc_due:
+            self.collect_garbage()
+        return REF_PREFIX + digest
+
+    def put_text(self, text):
+        return self.put(text.encode("utf-8"))
+
+    def get(self, ref, default=None):
+        """Return the bytes for ``ref``, or ``default`` if the blob is gone."""
+        if not is_ref(ref):
+            return default
+        digest = ref[len(REF_PREFIX):]
+        with self._lock:
+            data = self._blobs.get(digest)
+            if data is not None:
+                self._blobs.move_to_end(digest)
+                return data
+        path = self._path(digest)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return default
+        _touch(path)
+        with self._lock:
+            self._remember(digest, data)
+        return data
+
+    def get_text(self, ref, default=""):
+        data = self.get(ref)
+        return default if data is None else data.decode("utf-8")
+
+    def size(self, ref):
+        """Stored size of a blob in bytes, or 0 if it does not exist."""
+        if not is_ref(ref):
+            return 0
+        digest = ref[len(REF_PREFIX):]
+        with self._lock:
+            if digest in self._blobs:
+                return len(self._blobs[digest])
+        try:
+            return self._path(digest).stat().st_size
+        except OSError:
+            return 0
+
+    def in_memory(self, ref):
+        with self._lock:
+            return is_ref(ref) and ref[len(REF_PREFIX):] in self._blobs
+
+    def stats(self):
+        with self._lock:
+            return {"blobs_in_memory": len(self._blobs), "memory_bytes": self._memory_bytes,
+                    "max_memory_bytes": self.max_memory_bytes}
+
+    def collect_garbage(self):
+        """Delete blobs unused for ``max_age``, then the oldest until under ``max_disk_bytes``.
+
+        A blob's modification time is its last use (``put`` or a read from
+        disk). Returns the number of files removed.
+        """
+        with self._lock:
+            in_use = set(self._blobs)
+        files = []
+        for path in self.directory.glob("*/*"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        files.sort()
+
+        oldest_kept = time.time() - self.max_age
+        disk_bytes = sum(size for _, size, _ in files)
+        removed = 0
+        for mtime, size, path in files:
+            if mtime >= oldest_kept and disk_bytes <= self.max_disk_bytes:
+                break
+            if path.name in in_use:
+                continue
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            disk_bytes -= size
+            removed += 1
+        return removed
+
+    def clear_memory(self):
+        with self._lock:
+            self._blobs.clear()
+            self._memory_bytes = 0
+
+
+def _touch(path):
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def resolve_blobs(resume_data, store):
+    """Copy of ``resume_data`` with a photo reference replaced by the photo bytes, for the exporters."""
+    if not is_ref(resume_data.get("photo")):
+        return resume_data
+    return dict(resume_data, photo=store.get(resume_data["photo"]))
+
+
+def deep_sizeof(value, _seen=None):
+    """Approximate bytes held by ``value`` and everything it references."""
+    seen = set() if _seen is None else _seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in value)
+    elif hasattr(value, "__dict__"):
+        size += deep_sizeof(vars(value), seen)
+    return size
+
+
+def _refs_in(value):
+    if is_ref(value):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _refs_in(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _refs_in(item)
+
+
+def session_memory_report(state, store):
+    """One row per session key: bytes held by the session and bytes of the blobs it references.
+
+    Referenced blobs are shared across sessions and counted once per key, so
+    ``blob_bytes`` is an upper bound on what the session itself costs.
+    """
+    rows = []
+    for key in sorted(state.keys(), key=str):
+        value = state[key]
+        refs = set(_refs_in(value))
+        rows.append({
+            "key": str(key),
+            "type": type(value).__name__,
+            "session_bytes": deep_sizeof(value),
+            "blob_bytes": sum(store.size(ref) for ref in refs),
+            "blobs_in_memory": sum(store.in_memory(ref) for ref in refs),
+        })
+    return sorted(rows, key=lambda row: row["session_bytes"], reverse=True)
+
+
+# Opened on first use; ATS_BLOB_DIR, ATS_BLOB_MEMORY_MB, ATS_BLOB_DISK_MB and ATS_BLOB_MAX_AGE_DAYS configure it
+_blob_store = None
+_blob_store_lock = threading.Lock()
+
+
+def get_blob_store():
+    global _blob_store
+    with _blob_store_lock:
+        if _blob_store is None:
+            directory = os.environ.get("ATS_BLOB_DIR") or os.path.join(tempfile.gettempdir(), "ats_blobs")
+            memory_mb = float(os.environ.get("ATS_BLOB_MEMORY_MB", DEFAULT_MEMORY_MB))
+            disk_mb = float(os.environ.get("ATS_BLOB_DISK_MB", DEFAULT_DISK_MB))
+            max_age_days = float(os.environ.get("ATS_BLOB_MAX_AGE_DAYS", DEFAULT_MAX_AGE_DAYS))
+            _blob_store = BlobStore(directory, max_memory_bytes=int(memory_mb * 1024 * 1024),
+                                    max_disk_bytes=int(disk_mb * 1024 * 1024), max_age=max_age_days * 86400)
+        return _blob_store
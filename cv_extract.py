@@ -0,0 +1,286 @@
+"""Text extraction for uploaded CVs (PDF, DOCX and TXT).
+
+Works on raw bytes so it can be shared by the Streamlit uploader and by
+batch jobs that read CVs from disk or from a zip archive. Results are cached
+by the SHA-256 of the uploaded bytes, so re-running the script with the same
+file costs a hash instead of a full PDF parse. Text cut short by the PDF
+page or time budget is returned marked as truncated and never cached, so one
+slow parse cannot stand in for the whole document later.
+"""
+
+import hashlib
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from io import BytesIO
+from pathlib import Path, PurePath
+
+import metrics
+
+try:
+    from pypdf import PdfReader
+except ImportError:
+    # Fallback to PyPDF2 (older)
+    from PyPDF2 import PdfReader
+
+
+KIND_BY_MIME = {
+    "text/plain": "txt",
+    "application/pdf": "pdf",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": "docx",
+}
+SUPPORTED_EXTENSIONS = {".txt": "txt", ".pdf": "pdf", ".docx": "docx"}
+
+# Budget for a single PDF: pages past the limit or the deadline are dropped
+MAX_PDF_PAGES = 100
+PDF_TIME_BUDGET = 15.0  # seconds
+# Documents longer than this are split across worker processes
+PARALLEL_PAGE_THRESHOLD = 8
+MIN_PAGES_PER_TASK = 4
+PAGE_WORKERS = min(4, os.cpu_count() or 1)
+
+# Worker pools are created from threads (background jobs, the API server). Forking a
+# multithreaded process copies locks other threads may hold, so workers start from
+# a forkserver (or are spawned where it is unavailable) instead. Workers re-import the
+# main script, so scripts that use these pools need an ``if __name__ == "__main__"`` guard
+POOL_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn")
+
+_page_pool = None
+_page_pool_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class Extraction:
+    """Text extracted from one CV; for PDFs, how many of its pages were read."""
+    text: str
+    pages_read: int = 0
+    page_count: int = 0
+
+    @property
+    def truncated(self):
+        """True when the page or time budget dropped pages from the end."""
+        return self.pages_read < self.page_count
+
+    @property
+    def truncated_by(self):
+        """``"page_limit"`` or ``"time_budget"`` for a truncated extraction, else None."""
+        if not self.truncated:
+            return None
+        return "page_limit" if self.pages_read >= MAX_PDF_PAGES else "time_budget"
+
+
+def kind_from_name(filename):
+    """Return 'pdf', 'docx' or 'txt' for a file name, or None if unsupported."""
+    return SUPPORTED_EXTENSIONS.get(PurePath(filename).suffix.lower())
+
+
+def _get_page_pool():
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is None:
+            _page_pool = ProcessPoolExecutor(max_workers=PAGE_WORKERS, mp_context=POOL_CONTEXT)
+        return _page_pool
+
+
+def _reset_page_pool(pool):
+    """Drop a broken pool so the next extraction starts a fresh one."""
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is pool:
+            _page_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _extract_page_range(data, start, stop, deadline):
+    """Text of pages ``start:stop``, stopping early once the wall-clock ``deadline`` passes.
+
+    Workers check the deadline themselves: cancelling a future cannot stop a
+    range that is already being parsed.
+    """
+    pdf_reader = PdfReader(BytesIO(data))
+    pages = []
+    for i in range(start, stop):
+        if time.time() > deadline:
+            break
+        pages.append(pdf_reader.pages[i].extract_text() or "")
+    return pages
+
+
+def iter_pdf_pages(data, max_pages=MAX_PDF_PAGES, time_budget=PDF_TIME_BUDGET, parallel=True, progress=None):
+    """Yield the text of each PDF page in order as soon as it is parsed.
+
+    Long documents are split into page ranges parsed by a shared process
+    pool; short ones are parsed inline. Iteration stops early once
+    ``max_pages`` pages have been produced or ``time_budget`` seconds have
+    passed, so one huge upload cannot hold the caller indefinitely; workers
+    stop at the same deadline, so they are free for the next upload. If a
+    worker crashes, the pool is replaced and the remaining pages are parsed
+    inline.
+    ``progress("extract", fraction)`` is called after each page. The
+    generator's return value is the document's total page count, so callers
+    can tell whether pages were dropped (see ``extract_cv``).
+    """
+    # Wall-clock time, so worker processes can check the same deadline
+    deadline = time.time() + time_budget
+    pdf_reader = PdfReader(BytesIO(data))
+    total_pages = len(pdf_reader.pages)
+    page_count = min(total_pages, max_pages)
+    done = 0
+
+    if parallel and PAGE_WORKERS > 1 and page_count >= PARALLEL_PAGE_THRESHOLD:
+        # Each task re-opens the PDF, so hand out a few large ranges rather than single pages
+        pages_per_task = max(MIN_PAGES_PER_TASK, -(-page_count // (PAGE_WORKERS * 2)))
+        pool = _get_page_pool()
+        futures = []
+        try:
+            for start in range(0, page_count, pages_per_task):
+                stop = min(start + pages_per_task, page_count)
+                futures.append((pool.submit(_extract_page_range, data, start, stop, deadline), stop - start))
+            for future, expected in futures:
+                try:
+                    pages = future.result(timeout=max(0.0, deadline - time.time()))
+                except TimeoutError:
+                    return total_pages
+                yield from pages
+                done += len(pages)
+                if progress:
+                    progress("extract", done / page_count)
+                if len(pages) < expected:  # the worker hit the deadline
+                    return total_pages
+            return total_pages
+        except BrokenProcessPool:
+            _reset_page_pool(pool)
+        finally:
+            for future, _ in futures:
+                future.cancel()
+
+    for i in range(done, page_count):
+        if time.time() > deadline:
+            return total_pages
+        yield pdf_reader.pages[i].extract_text() or ""
+        if progress:
+            progress("extract", (i + 1) / page_count)
+    return total_pages
+
+
+@metrics.timed("extract")
+def extract_cv(data, kind, parallel=True, progress=None):
+    """Extract CV bytes of the given kind into an ``Extraction``.
+
+    ``parallel=False`` keeps PDF parsing in the calling process, for callers
+    that already run inside a worker pool. ``progress`` receives per-page
+    progress for PDFs (see ``iter_pdf_pages``).
+    """
+    if kind == "txt":
+        return Extraction(data.decode('utf-8'))
+    if kind == "pdf":
+        pages = iter_pdf_pages(data, parallel=parallel, progress=progress)
+        texts = []
+        while True:
+            try:
+                texts.append(next(pages) + "\n")
+            except StopIteration as end:
+                return Extraction("".join(texts), pages_read=len(texts), page_count=end.value)
+    if kind == "docx":
+        import docx
+        doc = docx.Document(BytesIO(data))
+        return Extraction("\n".join([para.text for para in doc.paragraphs]))
+    raise ValueError(f"Unsupported CV format: {kind}")
+
+
+def extract_text(data, kind, parallel=True, progress=None):
+    """Plain text of ``extract_cv``, for callers that do not report truncation."""
+    return extract_cv(data, kind, parallel=parallel, progress=progress).text
+
+
+class ExtractionCache:
+    """Content-addressed LRU cache of extracted CV text.
+
+    Entries are keyed by the SHA-256 of the file bytes and bounded by the
+    total number of cached characters. When ``directory`` is set, texts are
+    also written there so they survive restarts and are shared between
+    processes.
+    """
+
+    def __init__(self, max_chars=32_000_000, directory=None):
+        self.max_chars = max_chars
+        self.directory = Path(directory) if directory else None
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    def get(self, key):
+        with self._lock:
+            text = self._entries.get(key)
+            if text is not None:
+                self._entries.move_to_end(key)
+                return text
+        if self.directory:
+            path = self.directory / f"{key}.txt"
+            if path.exists():
+                text = path.read_text(encoding="utf-8")
+                self._remember(key, text)
+                return text
+        return None
+
+    def put(self, key, text):
+        self._remember(key, text)
+        if self.directory:
+            path = self.directory / f"{key}.txt"
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(text, encoding="utf-8")
+            os.replace(tmp, path)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _remember(self, key, text):
+        with self._lock:
+            if key in self._entries:
+                self._size -= len(self._entries.pop(key))
+            self._entries[key] = text
+            self._size += len(text)
+            while self._size > self.max_chars and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+
+# Shared by every session in the process; set ATS_EXTRACT_CACHE_DIR to also keep texts on disk
+EXTRACTION_CACHE = ExtractionCache(directory=os.environ.get("ATS_EXTRACT_CACHE_DIR"))
+
+
+def content_hash(data):
+    """Return the SHA-256 hex digest used as the cache key for file bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def cached_extract(data, kind, cache=EXTRACTION_CACHE, progress=None):
+    """Like ``extract_cv`` but reuses earlier results for identical bytes.
+
+    Only complete extractions are cached; a truncated one is returned as is
+    and the next call parses the file again.
+    """
+    key = f"{kind}-{content_hash(data)}"
+    text = cache.get(key)
+    if text is not None:
+        metrics.count("extract_cache_hit")
+        return Extraction(text)
+    extraction = extract_cv(data, kind, progress=progress)
+    if not extraction.truncated:
+        cache.put(key, extraction.text)
+    return extraction
+
+
+def cached_extract_text(data, kind, cache=EXTRACTION_CACHE, progress=None):
+    """Text of ``cached_extract``."""
+    return cached_extract(data, kind, cache=cache, progress=progress).text
@@ -0,0 +1,172 @@
+"""Single-pass field extraction for the "Auto-Fill Form from CV" button.
+
+``extract_fields`` walks the CV lines once: contact details come from one
+combined, precompiled scanner, and name and location are tracked in the same
+loop, which stops as soon as every field is settled. Skills and summary are
+slices of the cached section index from ``cv_sections``. The keyword
+fallback for skills only runs when the CV has no skills section.
+"""
+
+import re
+
+import metrics
+from cv_sections import index_cv
+from keyword_matcher import KeywordMatcher
+
+# One scanner for every contact field; the first hit of each group wins
+CONTACT_PATTERN = re.compile(
+    r'(?P<email>\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b)'
+    r'|(?P<linkedin>(?:https?://)?(?:www\.)?linkedin\.com/in/[\w-]+)'
+    r'|(?P<github>(?:https?://)?(?:www\.)?github\.com/[\w-]+)'
+    r'|(?P<phone>\+?\d{1,3}[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
+    r'|\(\d{3}\)\s*\d{3}[-.\s]\d{4}'
+    r'|\d{3}[-.\s]\d{3}[-.\s]\d{4}'
+    r'|\+?\d{10,13})',
+    re.IGNORECASE,
+)
+CONTACT_FIELDS = ('email', 'phone', 'linkedin', 'github')
+
+NAME_LABEL_PATTERN = re.compile(r'^(?:name|candidate|applicant)[:\s]+(.+)', re.IGNORECASE)
+LOCATION_LABEL_PATTERN = re.compile(r'(?:location|address|city|residence|based in)[:\s]+(.+)', re.IGNORECASE)
+# Capitalisation matters here: "Austin, TX" or "Pune, Maharashtra, 41100". Only tried in the
+# header block, since skill lists ("Python, SQL") have the same shape
+CITY_STATE_PATTERN = re.compile(r'[A-Z][a-z]+(?:\s+[A-Z][a-z]+)?,\s*[A-Z]{2}\b'
+                                r'|[A-Z][a-z]+,\s*[A-Z][a-z]+(?:,\s*\d{5})?')
+
+NAME_EXCLUDED_WORDS = ('resume', 'cv', 'curriculum', 'profile', 'summary')
+CONTACT_WORDS = ('email', 'phone', 'linkedin', 'github')
+
+SKILL_NOISE_PATTERN = re.compile(r'[•\-\*\|\[\]{}]')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+FALLBACK_SKILLS = ['python', 'java', 'javascript', 'sql', 'react', 'node', 'aws',
+                   'docker', 'kubernetes', 'machine learning', 'data science', 'pandas',
+                   'numpy', 'tensorflow', 'pytorch', 'html', 'css', 'git']
+FALLBACK_SKILLS_MATCHER = KeywordMatcher(FALLBACK_SKILLS)
+
+MAX_SKILL_LINES = 100
+MAX_SKILLS = 20
+MAX_SUMMARY_LINES = 5
+MAX_SUMMARY_CHARS = 400
+
+
+def _looks_like_name(line, lower):
+    words = line.split()
+    return (2 <= len(words) <= 4 and
+            '@' not in line and
+            not any(char.isdigit() for char in line) and
+            not any(kw in lower for kw in NAME_EXCLUDED_WORDS) and
+            len(line) < 50)
+
+
+def _contact_value(field, value):
+    value = value.strip()
+    if field in ('linkedin', 'github') and not value.lower().startswith('http'):
+        value = 'https://' + value
+    return value
+
+
+def _split_skills(skill_section):
+    skills = SKILL_NOISE_PATTERN.sub('', skill_section)
+    skills = WHITESPACE_PATTERN.sub(' ', skills)
+
+    # Split by common delimiters
+    skill_list = []
+    for delim in [',', '|', '•', ';']:
+        if delim in skills:
+            skill_list = [s.strip() for s in skills.split(delim) if s.strip() and len(s.strip()) > 1]
+            break
+
+    if not skill_list:
+        skill_list = skills.split()
+
+    # Remove duplicates and clean
+    skill_list = list(dict.fromkeys([s.strip() for s in skill_list if len(s.strip()) > 2]))
+    return ', '.join(skill_list[:MAX_SKILLS])
+
+
+def extract_summary(index, max_lines=MAX_SUMMARY_LINES):
+    """Return the first lines of the summary section, or '' if there is none."""
+    return ' '.join(index.section_lines('summary')[:max_lines])
+
+
+@metrics.timed("autofill")
+def extract_fields(cv_text):
+    """Extract name, contact details, location, skills and summary from CV text.
+
+    Returns a dict containing only the fields that were found.
+    """
+    index = index_cv(cv_text)
+    lines = index.lines
+    extracted = {}
+
+    label_name = guessed_name = None
+    label_location = city_location = None
+    first_para = []
+    # The name/contact block ends at the first section heading
+    header_end = min([15] + [start - 1 for start, _ in index.sections.values()])
+
+    for i, line in enumerate(lines):
+        lower = line.lower()
+
+        # Contact details; cheap substring checks decide whether the scanner runs at all
+        if (('email' not in extracted and '@' in line) or
+                ('linkedin' not in extracted and 'linkedin.com' in lower) or
+                ('github' not in extracted and 'github.com' in lower) or
+                ('phone' not in extracted and any(char.isdigit() for char in line))):
+            for match in CONTACT_PATTERN.finditer(line):
+                field = match.lastgroup
+                if field not in extracted:
+                    extracted[field] = _contact_value(field, match.group())
+
+        # Name: an explicit label wins over the first name-like line
+        if i < 15 and label_name is None:
+            match = NAME_LABEL_PATTERN.match(line)
+            if match:
+                label_name = match.group(1).strip()
+        if i < 10 and guessed_name is None and _looks_like_name(line, lower):
+            guessed_name = line
+
+        # Location: an explicit label wins over a "City, ST" pattern
+        if label_location is None:
+            match = LOCATION_LABEL_PATTERN.search(line)
+            if match:
+                label_location = match.group(1).strip()
+            elif city_location is None and i < header_end:
+                match = CITY_STATE_PATTERN.search(line)
+                if match:
+                    city_location = match.group().strip()
+
+        # Summary fallback: first long lines after the name/contact block
+        if 3 <= i < 15 and len(' '.join(first_para)) <= 200:
+            if len(line) > 30 and not any(kw in lower for kw in CONTACT_WORDS):
+                first_para.append(line)
+
+        # Stop as soon as nothing later in the CV can change the result
+        if i >= 15 and label_location is not None and all(field in extracted for field in CONTACT_FIELDS):
+            break
+
+    name = label_name or guessed_name
+    if name:
+        extracted['name'] = name
+
+    location = label_location or city_location
+    if location:
+        extracted['location'] = location
+
+    skill_lines = index.section_lines('skills')[:MAX_SKILL_LINES]
+    if skill_lines:
+        skills = _split_skills(', '.join(skill_lines) + ', ')
+        if skills:
+            extracted['skills'] = skills
+    if not extracted.get('skills'):
+        hits = set(FALLBACK_SKILLS_MATCHER.find(cv_text))
+        found_skills = [kw for kw in FALLBACK_SKILLS if kw in hits]
+        if found_skills:
+            extracted['skills'] = ', '.join(found_skills)
+
+    summary = extract_summary(index) or ' '.join(first_para)
+    if summary:
+        extracted['summary'] = summary[:MAX_SUMMARY_CHARS]
+
+    return extracted
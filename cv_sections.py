@@ -0,0 +1,107 @@
+"""Section segmentation for uploaded CVs.
+
+``index_cv`` splits a CV into non-empty lines once and records the line range
+of each recognised section (summary, skills, experience, education, projects,
+certifications). Downstream extractors slice ``CvIndex.lines`` instead of
+rescanning the text for headers. Indexes are cached by the SHA-256 of the
+text, so every button that needs sections reuses the same index.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from cv_extract import content_hash
+
+SECTION_WORDS = {
+    'summary': 'summary', 'profile': 'summary', 'objective': 'summary', 'about': 'summary',
+    'overview': 'summary', 'introduction': 'summary',
+    'skills': 'skills', 'skill': 'skills', 'competencies': 'skills', 'technologies': 'skills',
+    'expertise': 'skills', 'proficiencies': 'skills',
+    'experience': 'experience', 'employment': 'experience', 'history': 'experience',
+    'education': 'education', 'qualifications': 'education', 'academics': 'education',
+    'projects': 'projects', 'project': 'projects', 'portfolio': 'projects',
+    'certifications': 'certifications', 'certification': 'certifications',
+    'certificates': 'certifications', 'licenses': 'certifications', 'courses': 'certifications',
+}
+# Words allowed around a section word in a header, e.g. "Professional Summary"
+HEADER_FILLER_WORDS = {
+    'professional', 'technical', 'work', 'key', 'core', 'relevant', 'career', 'personal',
+    'academic', 'selected', 'other', 'additional', 'and', 'my', 'of', 'me', 'highlights',
+}
+HEADER_WORD_PATTERN = re.compile(r'[a-z]+')
+MAX_HEADER_WORDS = 5
+MAX_HEADER_LENGTH = 50
+MAX_CACHED_INDEXES = 64
+
+_index_cache = OrderedDict()
+_index_cache_lock = threading.Lock()
+
+
+@dataclass
+class CvIndex:
+    """Non-empty CV lines plus the ``[start, end)`` line range of each section."""
+    lines: list
+    sections: dict = field(default_factory=dict)
+
+    def section_lines(self, name):
+        """Return the lines under a section header, or [] if there is none."""
+        start, end = self.sections.get(name, (0, 0))
+        return self.lines[start:end]
+
+
+def classify_header(line):
+    """Return the section a line introduces, or None if it is not a header."""
+    if len(line) >= MAX_HEADER_LENGTH or line[0] in '-•*':
+        return None
+    words = HEADER_WORD_PATTERN.findall(line.lower())
+    if not words or len(words) > MAX_HEADER_WORDS:
+        return None
+    section = None
+    for word in words:
+        if word in SECTION_WORDS:
+            section = section or SECTION_WORDS[word]
+        elif word not in HEADER_FILLER_WORDS:
+            return None
+    return section
+
+
+def segment_lines(lines):
+    """Map each section to the line range between its header and the next one."""
+    sections = {}
+    current, start = None, 0
+    for i, line in enumerate(lines):
+        section = classify_header(line)
+        if section is None:
+            continue
+        if current is not None and current not in sections:
+            sections[current] = (start, i)
+        current, start = section, i + 1
+    if current is not None and current not in sections:
+        sections[current] = (start, len(lines))
+    return sections
+
+
+def clear_index_cache():
+    with _index_cache_lock:
+        _index_cache.clear()
+
+
+def index_cv(cv_text):
+    """Return the (cached) section index for a CV text."""
+    key = content_hash(cv_text.encode('utf-8'))
+    with _index_cache_lock:
+        index = _index_cache.get(key)
+        if index is not None:
+            _index_cache.move_to_end(key)
+            return index
+
+    lines = [line.strip() for line in cv_text.split('\n') if line.strip()]
+    index = CvIndex(lines=lines, sections=segment_lines(lines))
+
+    with _index_cache_lock:
+        _index_cache[key] = index
+        while len(_index_cache) > MAX_CACHED_INDEXES:
+            _index_cache.popitem(last=False)
+    return index
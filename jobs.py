@@ -0,0 +1,119 @@
+"""Background jobs for work too slow to run in the Streamlit script thread.
+
+CV extraction and analysis are submitted to one executor shared by every
+session. The script keeps only the job id in session state and checks the
+job on each rerun: it shows the current stage and progress while the job
+runs and pulls the result in once it is done, so a large PDF never blocks
+the session (or its websocket) for the whole parse.
+
+Work functions take a ``progress(stage, fraction)`` keyword, which the job
+supplies. It records the stage and raises ``JobCancelled`` once the job has
+been cancelled, so work stops at its next checkpoint instead of running to
+the end for a result nobody wants.
+"""
+
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+JOB_WORKERS = int(os.environ.get("ATS_JOB_WORKERS", min(8, (os.cpu_count() or 1) + 2)))
+MAX_TRACKED_JOBS = 256
+# How long a rerun waits on a running job before drawing its progress and polling again
+POLL_SECONDS = 0.25
+
+_executor = None
+_jobs = OrderedDict()
+_jobs_lock = threading.Lock()
+
+
+class JobCancelled(Exception):
+    """Raised inside a job's work function after ``Job.cancel``."""
+
+
+class Job:
+    """One unit of background work: its stage, progress, status and result."""
+
+    def __init__(self, stages, key=None):
+        self.id = uuid.uuid4().hex
+        self.stages = tuple(stages)
+        # What the job computes (e.g. the job description), so callers can tell if it is still wanted
+        self.key = key
+        self.stage = None
+        self.progress = 0.0
+        self.status = "queued"
+        self.result = None
+        self.error = None
+        self._cancelled = threading.Event()
+        self._finished = threading.Event()
+
+    @property
+    def done(self):
+        return self._finished.is_set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def report(self, stage, fraction=0.0):
+        """Record progress within ``stage``; raises ``JobCancelled`` if the job was cancelled."""
+        if self._cancelled.is_set():
+            raise JobCancelled(self.id)
+        self.stage = stage
+        index = self.stages.index(stage) if stage in self.stages else 0
+        self.progress = min(1.0, (index + fraction) / max(1, len(self.stages)))
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def wait(self, timeout=None):
+        """Block up to ``timeout`` seconds; return True if the job has finished."""
+        return self._finished.wait(timeout)
+
+    def _run(self, func, args, kwargs):
+        try:
+            if self._cancelled.is_set():
+                raise JobCancelled(self.id)
+            self.status = "running"
+            self.result = func(*args, progress=self.report, **kwargs)
+            self.progress = 1.0
+            self.status = "done"
+        except JobCancelled:
+            self.status = "cancelled"
+        except Exception as e:
+            self.error = e
+            self.status = "failed"
+        finally:
+            self._finished.set()
+
+
+def _get_executor():
+    global _executor
+    with _jobs_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="ats-job")
+        return _executor
+
+
+def submit(func, *args, stages, key=None, **kwargs):
+    """Run ``func(*args, progress=..., **kwargs)`` in the background and return its ``Job``."""
+    job = Job(stages, key=key)
+    executor = _get_executor()
+    with _jobs_lock:
+        _jobs[job.id] = job
+        # Forget the oldest finished jobs, so results nobody came back for do not pile up
+        excess = len(_jobs) - MAX_TRACKED_JOBS
+        if excess > 0:
+            for job_id in [job_id for job_id, tracked in _jobs.items() if tracked.done][:excess]:
+                del _jobs[job_id]
+    executor.submit(job._run, func, args, kwargs)
+    return job
+
+
+def get_job(job_id):
+    """Return the job with this id, or None if it is unknown (or was forgotten)."""
+    if not job_id:
+        return None
+    with _jobs_lock:
+        return _jobs.get(job_id)
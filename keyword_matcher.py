@@ -0,0 +1,60 @@
+"""Token-boundary vocabulary matching.
+
+``KeywordMatcher`` compiles a fixed vocabulary (single words and multi-word
+terms such as "machine learning" or "ci/cd") into a trie of tokens once, then
+finds every term in a text with a single left-to-right pass. Matching works on
+whole tokens, so "java" does not hit inside "javascript" and "cut" does not
+hit inside "executed".
+"""
+
+import re
+
+# Letters, digits, "+" and "#" so that c++ and c# stay single tokens
+TOKEN_PATTERN = re.compile(r'[\w+#]+')
+
+# Trie key marking the end of a vocabulary term
+_TERMINAL = None
+
+
+def tokenize(text):
+    """Split text into lowercase tokens using the matcher's boundaries."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class KeywordMatcher:
+    """Find vocabulary terms in text in one pass over its tokens."""
+
+    def __init__(self, terms):
+        self._root = {}
+        self.max_term_length = 0
+        for term in terms:
+            tokens = tokenize(term)
+            if not tokens:
+                continue
+            node = self._root
+            for token in tokens:
+                node = node.setdefault(token, {})
+            node.setdefault(_TERMINAL, term.lower())
+            self.max_term_length = max(self.max_term_length, len(tokens))
+
+    def find_tokens(self, tokens):
+        """Return the terms found in a token list, in order of first appearance."""
+        hits = {}
+        root = self._root
+        count = len(tokens)
+        for start in range(count):
+            node = root.get(tokens[start])
+            position = start + 1
+            while node is not None:
+                term = node.get(_TERMINAL)
+                if term is not None and term not in hits:
+                    hits[term] = start
+                if position == count:
+                    break
+                node = node.get(tokens[position])
+                position += 1
+        return list(hits)
+
+    def find(self, text):
+        """Return the terms found in ``text``, in order of first appearance."""
+        return self.find_tokens(tokenize(text))
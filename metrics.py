@@ -0,0 +1,179 @@
+"""Per-stage timers and counters for the resume pipeline.
+
+Library functions are wrapped with ``@timed("stage")`` (or ``with
+timer("stage")`` for inline blocks) and cache hits are recorded with
+``count("event")``. Collection is off unless ``ATS_METRICS=1`` (or
+``ATS_METRICS_PORT``) is set; while off, a timed call costs one flag check
+and nothing is stored.
+
+Stages recorded: ``extract``, ``autofill``, ``tokenize``, ``score``,
+``select``, ``render``, ``render_pdf``, ``render_docx``, ``encode_photo`` and
+``interview_qa``. Stages nest - ``score`` includes the ``tokenize`` it
+triggers - so totals are per stage, not a breakdown of one click.
+
+``snapshot()`` feeds the app's debug panel and ``prometheus_text()`` renders
+the Prometheus text exposition format, served by ``start_metrics_server`` and
+by ``GET /metrics`` on the HTTP API.
+"""
+
+import functools
+import os
+import threading
+import time
+from contextlib import nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Histogram bucket upper bounds in seconds
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_enabled = os.environ.get("ATS_METRICS", "") not in ("", "0") or bool(os.environ.get("ATS_METRICS_PORT"))
+_stages = {}
+_counters = {}
+_lock = threading.Lock()
+_server = None
+_NO_TIMER = nullcontext()
+
+
+class _StageStats:
+    __slots__ = ("calls", "seconds", "max_seconds", "buckets")
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.buckets = [0] * len(BUCKETS)
+
+
+def enabled():
+    return _enabled
+
+
+def enable(flag=True):
+    global _enabled
+    _enabled = flag
+
+
+def reset():
+    with _lock:
+        _stages.clear()
+        _counters.clear()
+
+
+def record(stage, seconds):
+    """Add one timed call of ``stage``."""
+    with _lock:
+        stats = _stages.get(stage)
+        if stats is None:
+            stats = _stages[stage] = _StageStats()
+        stats.calls += 1
+        stats.seconds += seconds
+        stats.max_seconds = max(stats.max_seconds, seconds)
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                stats.buckets[i] += 1
+                break
+
+
+def count(event, amount=1):
+    if not _enabled:
+        return
+    with _lock:
+        _counters[event] = _counters.get(event, 0) + amount
+
+
+class _Timer:
+    __slots__ = ("stage", "start")
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+def timer(stage):
+    """Context manager timing a block as ``stage``; a shared no-op when collection is off."""
+    return _Timer(stage) if _enabled else _NO_TIMER
+
+
+def timed(stage):
+    """Decorator recording every call of the function as ``stage``."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(stage, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def snapshot():
+    """Return ``(stage rows, counters)`` for display, slowest total first."""
+    with _lock:
+        rows = [{
+            "stage": stage,
+            "calls": stats.calls,
+            "total_ms": round(stats.seconds * 1000, 2),
+            "mean_ms": round(stats.seconds * 1000 / stats.calls, 2),
+            "max_ms": round(stats.max_seconds * 1000, 2),
+        } for stage, stats in _stages.items()]
+        counters = dict(_counters)
+    return sorted(rows, key=lambda row: row["total_ms"], reverse=True), counters
+
+
+def prometheus_text():
+    """All stages and counters in the Prometheus text exposition format."""
+    lines = [
+        "# HELP ats_stage_seconds Time spent per pipeline stage.",
+        "# TYPE ats_stage_seconds histogram",
+    ]
+    with _lock:
+        for stage, stats in sorted(_stages.items()):
+            cumulative = 0
+            for bound, hits in zip(BUCKETS, stats.buckets):
+                cumulative += hits
+                lines.append(f'ats_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'ats_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {stats.calls}')
+            lines.append(f'ats_stage_seconds_sum{{stage="{stage}"}} {stats.seconds:.6f}')
+            lines.append(f'ats_stage_seconds_count{{stage="{stage}"}} {stats.calls}')
+        lines += ["# HELP ats_events_total Pipeline events such as cache hits.",
+                  "# TYPE ats_events_total counter"]
+        lines += [f'ats_events_total{{event="{event}"}} {value}' for event, value in sorted(_counters.items())]
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # scrapes every few seconds would flood the app's log
+
+
+def start_metrics_server(port, host="127.0.0.1"):
+    """Serve ``/metrics`` from a daemon thread; later calls reuse the running server."""
+    global _server
+    with _lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+        return _server
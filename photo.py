@@ -0,0 +1,99 @@
+"""Profile photo pipeline shared by the preview and the exports.
+
+Uploaded photos are often multi-megabyte phone JPEGs, while the resume shows
+them at 120 px. ``prepare_photo`` decodes the upload once, centre-crops it to
+a square, downsizes it to twice the display size (sharp in print), and
+re-encodes it as JPEG - or PNG when it has transparency - recording the
+matching MIME type. Results and their base64 data URIs are cached by the
+SHA-256 of the original bytes, so reruns reuse them.
+"""
+
+import base64
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import cached_property
+from io import BytesIO
+
+import metrics
+
+DISPLAY_SIZE = 120  # CSS pixels, as in the resume stylesheet
+PHOTO_PIXELS = DISPLAY_SIZE * 2
+JPEG_QUALITY = 85
+MAX_CACHED_PHOTOS = 32
+
+_photo_cache = OrderedDict()
+_photo_cache_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class PreparedPhoto:
+    """A downscaled, re-encoded photo ready to embed."""
+    data: bytes
+    mime: str
+    size: int
+
+    @cached_property
+    def data_uri(self):
+        return f"data:{self.mime};base64,{base64.b64encode(self.data).decode()}"
+
+
+@metrics.timed("encode_photo")
+def _encode(raw, jpeg_only):
+    from PIL import Image, ImageOps
+
+    image = Image.open(BytesIO(raw))
+    # Already prepared (e.g. the copy kept in session state): avoid a second lossy encode
+    if (image.size == (PHOTO_PIXELS, PHOTO_PIXELS) and image.mode in ('RGB', 'RGBA') and
+            (image.format == 'JPEG' or (image.format == 'PNG' and not jpeg_only))):
+        return PreparedPhoto(data=raw, mime=Image.MIME[image.format], size=PHOTO_PIXELS)
+
+    # JPEGs can be decoded at 1/2 to 1/8 scale directly, which avoids decoding every pixel
+    image.draft('RGB', (PHOTO_PIXELS, PHOTO_PIXELS))
+    image = ImageOps.exif_transpose(image)  # phone photos are often stored rotated
+    image = ImageOps.fit(image, (PHOTO_PIXELS, PHOTO_PIXELS), method=Image.LANCZOS)
+
+    has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+    buffer = BytesIO()
+    if has_alpha and not jpeg_only:
+        image.convert('RGBA').save(buffer, format='PNG', optimize=True)
+        mime = 'image/png'
+    else:
+        if has_alpha:
+            background = Image.new('RGB', image.size, 'white')
+            background.paste(image.convert('RGBA'), mask=image.convert('RGBA').getchannel('A'))
+            image = background
+        image.convert('RGB').save(buffer, format='JPEG', quality=JPEG_QUALITY, optimize=True)
+        mime = 'image/jpeg'
+    return PreparedPhoto(data=buffer.getvalue(), mime=mime, size=PHOTO_PIXELS)
+
+
+def clear_photo_cache():
+    with _photo_cache_lock:
+        _photo_cache.clear()
+
+
+def prepare_photo(raw, jpeg_only=False):
+    """Return a ``PreparedPhoto`` for uploaded image bytes, or None if they are not an image.
+
+    ``jpeg_only`` flattens transparent images onto white so the result is
+    always a JPEG (the PDF export embeds JPEG only).
+    """
+    key = (hashlib.sha256(raw).hexdigest(), jpeg_only)
+    with _photo_cache_lock:
+        if key in _photo_cache:
+            _photo_cache.move_to_end(key)
+            metrics.count("photo_cache_hit")
+            return _photo_cache[key]
+
+    try:
+        photo = _encode(raw, jpeg_only)
+    except Exception:
+        photo = None  # not an image Pillow can read (or Pillow is missing)
+
+    with _photo_cache_lock:
+        _photo_cache[key] = photo
+        while len(_photo_cache) > MAX_CACHED_PHOTOS:
+            _photo_cache.popitem(last=False)
+    return photo
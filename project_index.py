@@ -0,0 +1,125 @@
+"""Inverted index over the project catalog for Smart Project Selection.
+
+Each project is tokenized once when the index is built, and the catalog's
+project keywords are compiled into their own matcher. Selection then walks
+the postings for the job's keywords, project keywords and matched tech
+skills and accumulates points per project, so its cost depends on how many
+projects share terms with the job rather than on the size of the catalog.
+
+The same tokens also feed a ``Bm25Index``, which ranks the whole catalog
+against a job with one sparse dot product.
+"""
+
+import heapq
+from collections import Counter, defaultdict
+
+from keyword_matcher import KeywordMatcher, tokenize
+from relevance import Bm25Index
+
+# Points awarded per match, as in the original hand-tuned scoring
+JOB_KEYWORD_POINTS = 2
+PROJECT_KEYWORD_POINTS = 5
+TECH_SKILL_POINTS = 3
+
+# With a diversity limit, look this many times deeper than k for candidates
+DIVERSITY_POOL_FACTOR = 4
+# Tokens this short (and numbers) are left out of the similarity signatures
+MIN_SIGNATURE_TOKEN_LENGTH = 4
+
+
+def jaccard(a, b):
+    """Jaccard similarity of two sets (0.0 when both are empty)."""
+    union = len(a | b)
+    return len(a & b) / union if union else 0.0
+
+
+class ProjectIndex:
+    """Token, vocabulary-term and project-keyword postings for a catalog.
+
+    ``matcher`` finds the shared vocabulary (tech skills) in project texts.
+    """
+
+    def __init__(self, projects, matcher):
+        self.projects = list(projects)
+        self.token_postings = defaultdict(list)
+        self.term_postings = defaultdict(list)
+        self.keyword_postings = defaultdict(list)
+        self.signatures = []
+
+        documents = []
+        for project_id, project in enumerate(self.projects):
+            tokens = tokenize(f"{project['title']} {project['description']}")
+            documents.append(tokens + tokenize(' '.join(project['keywords'])))
+            # Content words of the title, description and keywords; the few keywords
+            # alone rarely overlap even between near-duplicate projects
+            self.signatures.append(frozenset(token for token in documents[-1]
+                                             if token.isalpha() and len(token) >= MIN_SIGNATURE_TOKEN_LENGTH))
+            for token in set(tokens):
+                self.token_postings[token].append(project_id)
+            for term in matcher.find_tokens(tokens):
+                self.term_postings[term].append(project_id)
+            for keyword in project['keywords']:
+                self.keyword_postings[keyword.lower()].append(project_id)
+
+        self.keyword_matcher = KeywordMatcher(self.keyword_postings)
+        self.bm25 = Bm25Index(documents)
+
+    def __len__(self):
+        return len(self.projects)
+
+    def relevance(self, query_tokens):
+        """Return the BM25 relevance of every project for the query tokens."""
+        return self.bm25.scores(query_tokens)
+
+    def top_k(self, scores, k, max_similarity=None):
+        """Return ``[(project id, score), ...]`` for the ``k`` best projects.
+
+        ``scores`` is indexed by project id (a list, array or ``{id: score}``
+        mapping; missing ids score 0). A heap keeps only ``k`` candidates, so
+        this runs in O(n log k). Ties go to the project listed first in the
+        catalog. With ``max_similarity``, a project whose word overlap
+        (Jaccard of title, description and keyword words) with an already
+        picked one exceeds it is skipped in favour of the next best; skipped
+        projects only fill up a short result.
+        """
+        if isinstance(scores, dict):
+            scores = [scores.get(project_id, 0) for project_id in range(len(self.projects))]
+        elif hasattr(scores, 'tolist'):
+            scores = scores.tolist()
+        if k <= 0:
+            return []
+
+        pool = k if max_similarity is None else k * DIVERSITY_POOL_FACTOR
+        best = heapq.nlargest(pool, range(len(scores)), key=lambda i: (scores[i], -i))
+        if max_similarity is None:
+            return [(i, scores[i]) for i in best]
+
+        picked, skipped = [], []
+        for i in best:
+            if len(picked) == k:
+                break
+            if all(jaccard(self.signatures[i], self.signatures[j]) <= max_similarity for j in picked):
+                picked.append(i)
+            else:
+                skipped.append(i)
+        picked += skipped[:k - len(picked)]
+        picked.sort(key=lambda i: (-scores[i], i))
+        return [(i, scores[i]) for i in picked]
+
+    def score(self, job_keywords, job_text, tech_skill_matches):
+        """Return ``{project id: points}`` for every project that matches the job.
+
+        ``job_keywords`` may repeat; each occurrence counts, as before.
+        ``job_text`` is searched for the catalog's project keywords.
+        """
+        scores = defaultdict(int)
+        for keyword, count in Counter(job_keywords).items():
+            for project_id in self.token_postings.get(keyword, ()):
+                scores[project_id] += JOB_KEYWORD_POINTS * count
+        for term in self.keyword_matcher.find(job_text):
+            for project_id in self.keyword_postings.get(term, ()):
+                scores[project_id] += PROJECT_KEYWORD_POINTS
+        for tech in tech_skill_matches:
+            for project_id in self.term_postings.get(tech, ()):
+                scores[project_id] += TECH_SKILL_POINTS
+        return scores
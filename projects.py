@@ -0,0 +1,89 @@
+"""Project catalog used by Smart Project Selection.
+
+Projects are read from a data file rather than source code, so each team can
+ship its own catalog. Supported formats:
+
+* ``.json``  - a list of ``{"title", "description", "keywords"}`` objects
+* ``.jsonl`` - one such object per line
+* ``.db`` / ``.sqlite`` / ``.sqlite3`` - a ``projects`` table with ``title``,
+  ``description`` and ``keywords`` columns (keywords as a JSON list or a
+  comma-separated string)
+
+A ``ProjectCatalog`` loads its file lazily on first use, keeps the parsed
+projects and their index in memory for the life of the process, and reloads
+them when the file's modification time changes.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+from project_index import ProjectIndex
+
+DEFAULT_CATALOG_PATH = Path(__file__).with_name("projects.json")
+SQLITE_EXTENSIONS = {".db", ".sqlite", ".sqlite3"}
+
+
+def _normalize(project):
+    keywords = project.get("keywords") or []
+    if isinstance(keywords, str):
+        try:
+            keywords = json.loads(keywords)
+        except ValueError:
+            keywords = [k.strip() for k in keywords.split(",") if k.strip()]
+    return {
+        "title": project["title"],
+        "description": project.get("description", ""),
+        "keywords": [k.lower() for k in keywords],
+    }
+
+
+def load_projects(path):
+    """Read a project catalog file into a list of project dicts."""
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix in SQLITE_EXTENSIONS:
+        with sqlite3.connect(f"file:{path}?mode=ro", uri=True) as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute("SELECT title, description, keywords FROM projects ORDER BY rowid").fetchall()
+        return [_normalize(dict(row)) for row in rows]
+    with open(path, encoding="utf-8") as f:
+        if suffix == ".jsonl":
+            return [_normalize(json.loads(line)) for line in f if line.strip()]
+        return [_normalize(project) for project in json.load(f)]
+
+
+class ProjectCatalog:
+    """Lazily loaded, hot-reloading project catalog plus its search index."""
+
+    def __init__(self, path, matcher):
+        self.path = Path(path)
+        self.matcher = matcher
+        self._index = None
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def index(self):
+        """Return the ``ProjectIndex``, reloading the file if it has changed."""
+        mtime = os.stat(self.path).st_mtime_ns
+        if self._index is None or mtime != self._mtime:
+            with self._lock:
+                if self._index is None or mtime != self._mtime:
+                    self._index = ProjectIndex(load_projects(self.path), self.matcher)
+                    self._mtime = mtime
+        return self._index
+
+    @property
+    def version(self):
+        """Modification time of the loaded file; changes whenever the catalog reloads."""
+        self.index()
+        return self._mtime
+
+    @property
+    def projects(self):
+        return self.index().projects
+
+    def __len__(self):
+        return len(self.index())
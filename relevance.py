@@ -0,0 +1,71 @@
+"""BM25 relevance over a tokenized document collection, backed by NumPy.
+
+``Bm25Index`` stores the collection as a term x document sparse matrix in
+CSR form (``indptr``/``indices``/``weights`` arrays) whose entries are the
+precomputed BM25 weight of each term in each document. Scoring a query is a
+single sparse dot product: the posting slices for the query terms are
+gathered and summed per document with ``np.bincount``.
+"""
+
+from collections import Counter
+
+import numpy as np
+
+K1 = 1.5
+B = 0.75
+
+
+class Bm25Index:
+    """BM25 weights for a fixed list of tokenized documents."""
+
+    def __init__(self, documents, k1=K1, b=B):
+        self.k1 = k1
+        self.document_count = len(documents)
+        self.vocabulary = {}
+
+        term_ids, doc_ids, term_freqs = [], [], []
+        lengths = np.zeros(self.document_count, dtype=np.float32)
+        for doc_id, tokens in enumerate(documents):
+            lengths[doc_id] = len(tokens)
+            for token, tf in Counter(tokens).items():
+                term_ids.append(self.vocabulary.setdefault(token, len(self.vocabulary)))
+                doc_ids.append(doc_id)
+                term_freqs.append(tf)
+
+        term_ids = np.asarray(term_ids, dtype=np.int32)
+        doc_ids = np.asarray(doc_ids, dtype=np.int32)
+        term_freqs = np.asarray(term_freqs, dtype=np.float32)
+
+        # Group postings by term to get CSR rows
+        order = np.argsort(term_ids, kind="stable")
+        term_ids, self.indices, term_freqs = term_ids[order], doc_ids[order], term_freqs[order]
+        doc_freqs = np.bincount(term_ids, minlength=len(self.vocabulary))
+        self.indptr = np.zeros(len(self.vocabulary) + 1, dtype=np.int64)
+        np.cumsum(doc_freqs, out=self.indptr[1:])
+
+        idf = np.log1p((self.document_count - doc_freqs + 0.5) / (doc_freqs + 0.5)).astype(np.float32)
+        average_length = lengths.mean() if self.document_count else 0.0
+        norm = k1 * (1 - b + b * lengths[self.indices] / max(average_length, 1.0))
+        self.weights = idf[term_ids] * term_freqs * (k1 + 1) / (term_freqs + norm)
+
+    def __len__(self):
+        return self.document_count
+
+    def scores(self, query_tokens):
+        """Return a float32 array with the BM25 score of every document."""
+        rows, query_weights = [], []
+        for token, count in Counter(query_tokens).items():
+            term_id = self.vocabulary.get(token)
+            if term_id is not None:
+                rows.append(term_id)
+                # Saturate repeated query terms the same way as document terms
+                query_weights.append(count * (self.k1 + 1) / (count + self.k1))
+        if not rows:
+            return np.zeros(self.document_count, dtype=np.float32)
+
+        starts, stops = self.indptr[rows], self.indptr[np.asarray(rows) + 1]
+        lengths = stops - starts
+        positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        weights = self.weights[positions] * np.repeat(np.asarray(query_weights, dtype=np.float32), lengths)
+        return np.bincount(self.indices[positions], weights=weights,
+                           minlength=self.document_count).astype(np.float32)
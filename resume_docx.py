@@ -0,0 +1,129 @@
+"""DOCX export of the Tab 4 resume, built directly from ``resume_data``.
+
+Uses python-docx (already required for reading uploads) and writes the
+document into memory, never to a temp file. The layout is deliberately plain
+- headings, paragraphs and bulleted lists in the default styles - because
+that is what ATS portals parse most reliably. Files are cached by the same
+resume hash as the HTML and PDF exports.
+"""
+
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+import metrics
+from photo import prepare_photo
+from resume_template import resume_key
+
+MAX_CACHED_DOCX = 16
+PHOTO_WIDTH_INCHES = 1.0
+
+_docx_cache = OrderedDict()
+_docx_cache_lock = threading.Lock()
+
+
+def _styled_paragraph(doc, text, style_id):
+    """Add a paragraph with a style id resolved once up front.
+
+    Assigning ``paragraph.style`` by name or object makes python-docx scan the
+    whole style table on every call, which dominated the export time.
+    """
+    paragraph = doc.add_paragraph(text)
+    paragraph._p.get_or_add_pPr().style = style_id
+    return paragraph
+
+
+def _add_entry(doc, heading, subheading, dates):
+    """Bold heading with tab-separated dates, then an italic subheading line."""
+    paragraph = doc.add_paragraph()
+    paragraph.add_run(heading).bold = True
+    if dates:
+        paragraph.add_run(f"\t{dates}")
+    if subheading:
+        doc.add_paragraph().add_run(subheading).italic = True
+
+
+@metrics.timed("render_docx")
+def build_docx(data):
+    """Build the resume document and return it as DOCX bytes."""
+    import docx
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.shared import Inches
+
+    doc = docx.Document()
+    heading_id = doc.styles['Heading 1'].style_id
+    bullet_id = doc.styles['List Bullet'].style_id
+
+    photo = prepare_photo(data['photo']) if data.get('photo') else None
+    if photo:
+        doc.add_picture(BytesIO(photo.data), width=Inches(PHOTO_WIDTH_INCHES))
+        doc.paragraphs[-1].alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+    title = _styled_paragraph(doc, str(data.get('name') or 'Your Name'), doc.styles['Title'].style_id)
+    title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    contact = [str(data[key]) for key in ('location', 'phone', 'email', 'linkedin', 'github', 'portfolio') if data.get(key)]
+    if contact:
+        doc.add_paragraph(' | '.join(contact)).alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+    _styled_paragraph(doc, 'Professional Summary', heading_id)
+    doc.add_paragraph(data.get('summary', ''))
+
+    if data.get('experiences'):
+        _styled_paragraph(doc, 'Work Experience', heading_id)
+        for exp in data['experiences']:
+            _add_entry(doc, exp.get('title', ''), exp.get('company', ''),
+                       f"{exp.get('start', '')} - {exp.get('end', '')}")
+            for resp in exp.get('responsibilities', []):
+                if resp.strip():
+                    _styled_paragraph(doc, resp.strip(), bullet_id)
+
+    if data.get('projects'):
+        _styled_paragraph(doc, 'Key Projects', heading_id)
+        for proj in data['projects']:
+            doc.add_paragraph().add_run(proj.get('title', '')).bold = True
+            doc.add_paragraph(proj.get('description', ''))
+
+    if data.get('education'):
+        _styled_paragraph(doc, 'Education', heading_id)
+        for edu in data['education']:
+            _add_entry(doc, edu.get('degree', ''), edu.get('institution', ''),
+                       f"{edu.get('start', '')} - {edu.get('end', '')}")
+            if edu.get('gpa'):
+                doc.add_paragraph(f"GPA: {edu['gpa']}")
+
+    if data.get('technical_skills'):
+        _styled_paragraph(doc, 'Technical Skills', heading_id)
+        doc.add_paragraph(', '.join(data['technical_skills']))
+
+    if data.get('certifications'):
+        _styled_paragraph(doc, 'Certifications', heading_id)
+        for cert in data['certifications']:
+            _styled_paragraph(doc, cert, bullet_id)
+
+    buffer = BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def clear_docx_cache():
+    with _docx_cache_lock:
+        _docx_cache.clear()
+
+
+def render_docx(data):
+    """Return the resume as DOCX bytes, reusing the cached file for unchanged data."""
+    key = resume_key(data)
+    with _docx_cache_lock:
+        document = _docx_cache.get(key)
+        if document is not None:
+            _docx_cache.move_to_end(key)
+            metrics.count("docx_cache_hit")
+            return document
+
+    document = build_docx(data)
+
+    with _docx_cache_lock:
+        _docx_cache[key] = document
+        while len(_docx_cache) > MAX_CACHED_DOCX:
+            _docx_cache.popitem(last=False)
+    return document
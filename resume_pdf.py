@@ -0,0 +1,339 @@
+"""Server-side PDF export of the Tab 4 resume.
+
+A small pure-Python PDF writer: it lays the resume out with the PDF core
+fonts (Helvetica family, so nothing is embedded and no network or system
+fonts are needed), wraps text using the standard Helvetica metrics and
+compresses page streams with zlib. The photo is embedded as the JPEG from
+``photo.prepare_photo``. Generated PDFs are cached by the same resume hash as
+the HTML, so repeated downloads return the cached bytes.
+
+The core fonts only cover WinAnsiEncoding (cp1252); other characters are
+printed as ``?``. ``unencodable_chars`` lists them so callers can warn and
+point to the HTML or DOCX export, which keep the full text.
+"""
+
+import threading
+import zlib
+from collections import OrderedDict
+from io import BytesIO
+
+import metrics
+from photo import prepare_photo
+from resume_template import resume_key
+
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792  # US Letter, in points
+MARGIN = 54
+PHOTO_SIZE = 72
+MAX_CACHED_PDFS = 16
+
+TEXT_COLOR = (0.2, 0.2, 0.2)
+HEADING_COLOR = (0.17, 0.24, 0.31)  # #2c3e50, as in the HTML stylesheet
+MUTED_COLOR = (0.5, 0.55, 0.55)
+
+FONTS = {'regular': ('F1', 'Helvetica'), 'bold': ('F2', 'Helvetica-Bold'), 'italic': ('F3', 'Helvetica-Oblique')}
+
+# Advance widths (1/1000 em) of printable ASCII, from the standard Helvetica AFM files
+_REGULAR_WIDTHS = [
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+]
+_BOLD_WIDTHS = [
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+    975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+    333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+]
+WIDTHS = {'regular': _REGULAR_WIDTHS, 'bold': _BOLD_WIDTHS, 'italic': _REGULAR_WIDTHS}
+DEFAULT_WIDTH = 556  # characters outside printable ASCII
+BULLET = '•'
+BULLET_WIDTH = 350
+
+_pdf_cache = OrderedDict()
+_pdf_cache_lock = threading.Lock()
+
+
+def text_width(text, style, size):
+    """Width of ``text`` in points when set in the given core font and size."""
+    widths = WIDTHS[style]
+    total = 0
+    for char in text:
+        code = ord(char)
+        if 32 <= code <= 126:
+            total += widths[code - 32]
+        elif char == BULLET:
+            total += BULLET_WIDTH
+        else:
+            total += DEFAULT_WIDTH
+    return total * size / 1000
+
+
+def wrap(text, style, size, width):
+    """Greedy word wrap of ``text`` into lines no wider than ``width`` points."""
+    lines, current = [], ''
+    for word in text.split():
+        candidate = f"{current} {word}" if current else word
+        if current and text_width(candidate, style, size) > width:
+            lines.append(current)
+            current = word
+        else:
+            current = candidate
+    if current:
+        lines.append(current)
+    return lines
+
+
+def _strings(value):
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _strings(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _strings(item)
+
+
+def _encodable(char):
+    try:
+        char.encode('cp1252')
+    except UnicodeEncodeError:
+        return False
+    return True
+
+
+def unencodable_chars(data):
+    """Sorted characters in the resume that the PDF core fonts cannot show."""
+    chars = set()
+    for text in _strings({k: v for k, v in data.items() if k != 'photo'}):
+        if not text.isascii():
+            chars.update(char for char in text if not char.isascii() and not _encodable(char))
+    return sorted(chars)
+
+
+def _pdf_string(text):
+    """Encode text as a PDF literal string in WinAnsiEncoding."""
+    raw = text.encode('cp1252', errors='replace')
+    return b'(' + raw.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)') + b')'
+
+
+class _Layout:
+    """Top-to-bottom text layout that starts a new page when one fills up."""
+
+    def __init__(self):
+        self.pages = []
+        self.images = {}
+        self._new_page()
+
+    def _new_page(self):
+        self.ops = []
+        self.pages.append(self.ops)
+        self.y = PAGE_HEIGHT - MARGIN
+
+    def ensure(self, height):
+        if self.y - height < MARGIN:
+            self._new_page()
+
+    def text(self, x, text, style='regular', size=10, color=TEXT_COLOR):
+        font, _ = FONTS[style]
+        self.ops.append(b'%.3f %.3f %.3f rg BT /%s %.1f Tf %.2f %.2f Td %s Tj ET'
+                        % (*color, font.encode(), size, x, self.y, _pdf_string(text)))
+
+    def line(self, text, style='regular', size=10, color=TEXT_COLOR, x=MARGIN, align='left', leading=1.35):
+        self.ensure(size * leading)
+        self.y -= size * leading
+        width = text_width(text, style, size)
+        if align == 'center':
+            x = (PAGE_WIDTH - width) / 2
+        elif align == 'right':
+            x = PAGE_WIDTH - MARGIN - width
+        self.text(x, text, style, size, color)
+
+    def paragraph(self, text, style='regular', size=10, indent=0, align='left', color=TEXT_COLOR):
+        for line in wrap(text, style, size, PAGE_WIDTH - 2 * MARGIN - indent):
+            self.line(line, style, size, color, x=MARGIN + indent, align=align)
+
+    def bullet(self, text, size=10):
+        indent = 14
+        lines = wrap(text, 'regular', size, PAGE_WIDTH - 2 * MARGIN - indent)
+        for i, line in enumerate(lines):
+            self.line(line, size=size, x=MARGIN + indent)
+            if i == 0:
+                self.text(MARGIN + 4, BULLET, size=size)
+
+    def row(self, left, right, style='bold', size=10.5):
+        """Left-aligned text with a right-aligned muted date on its first line.
+
+        The left text wraps short of the date, so long titles never run into it.
+        """
+        right_width = text_width(right, 'regular', 9) + 12 if right else 0
+        lines = wrap(left, style, size, PAGE_WIDTH - 2 * MARGIN - right_width) or ['']
+        for i, line in enumerate(lines):
+            self.line(line, style, size)
+            if i == 0 and right:
+                self.text(PAGE_WIDTH - MARGIN - text_width(right, 'regular', 9), right, 'regular', 9, MUTED_COLOR)
+
+    def heading(self, title):
+        self.ensure(40)
+        self.y -= 10
+        self.line(title.upper(), 'bold', 11.5, HEADING_COLOR)
+        self.y -= 4
+        self.ops.append(b'%.3f %.3f %.3f RG 1.5 w %.2f %.2f m %.2f %.2f l S'
+                        % (*HEADING_COLOR, MARGIN, self.y, PAGE_WIDTH - MARGIN, self.y))
+        self.y -= 2
+
+    def space(self, points):
+        self.y -= points
+
+    def image(self, name, jpeg, width, height):
+        self.images[name] = (jpeg, width, height)
+        self.ensure(PHOTO_SIZE + 8)
+        self.y -= PHOTO_SIZE
+        self.ops.append(b'q %d 0 0 %d %.2f %.2f cm /%s Do Q'
+                        % (PHOTO_SIZE, PHOTO_SIZE, (PAGE_WIDTH - PHOTO_SIZE) / 2, self.y, name.encode()))
+        self.y -= 8
+
+
+def _layout_resume(data):
+    layout = _Layout()
+
+    photo = prepare_photo(data['photo'], jpeg_only=True) if data.get('photo') else None
+    if photo:
+        layout.image('Im1', photo.data, photo.size, photo.size)
+    layout.line(str(data.get('name') or 'Your Name'), 'bold', 22, HEADING_COLOR, align='center', leading=1.2)
+    contact = [str(data[key]) for key in ('location', 'phone', 'email', 'linkedin', 'github', 'portfolio') if data.get(key)]
+    if contact:
+        layout.space(4)
+        layout.paragraph(' | '.join(contact), size=9.5, align='center')
+
+    layout.heading('Professional Summary')
+    layout.paragraph(data.get('summary', ''))
+
+    if data.get('experiences'):
+        layout.heading('Work Experience')
+        for exp in data['experiences']:
+            layout.space(4)
+            layout.row(exp.get('title', ''), f"{exp.get('start', '')} - {exp.get('end', '')}")
+            layout.line(exp.get('company', ''), 'italic')
+            for resp in exp.get('responsibilities', []):
+                if resp.strip():
+                    layout.bullet(resp.strip())
+
+    if data.get('projects'):
+        layout.heading('Key Projects')
+        for proj in data['projects']:
+            layout.space(4)
+            layout.paragraph(proj.get('title', ''), 'bold', 10.5)
+            layout.paragraph(proj.get('description', ''))
+
+    if data.get('education'):
+        layout.heading('Education')
+        for edu in data['education']:
+            layout.space(4)
+            layout.row(edu.get('degree', ''), f"{edu.get('start', '')} - {edu.get('end', '')}")
+            layout.line(edu.get('institution', ''), 'italic')
+            if edu.get('gpa'):
+                layout.line(f"GPA: {edu['gpa']}")
+
+    if data.get('technical_skills'):
+        layout.heading('Technical Skills')
+        layout.paragraph(', '.join(data['technical_skills']))
+
+    if data.get('certifications'):
+        layout.heading('Certifications')
+        for cert in data['certifications']:
+            layout.bullet(cert)
+
+    return layout
+
+
+def _serialize(layout, title):
+    """Write the laid-out pages as a PDF 1.4 file."""
+    objects = []
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(None)
+    pages = add(None)
+    fonts = {font: add(b'<< /Type /Font /Subtype /Type1 /BaseFont /%s /Encoding /WinAnsiEncoding >>' % base.encode())
+             for font, base in FONTS.values()}
+    images = {}
+    for name, (jpeg, width, height) in layout.images.items():
+        images[name] = add(b'<< /Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace /DeviceRGB '
+                           b'/BitsPerComponent 8 /Filter /DCTDecode /Length %d >>\nstream\n%s\nendstream'
+                           % (width, height, len(jpeg), jpeg))
+    resources = b'<< /Font << %s >> /XObject << %s >> >>' % (
+        b' '.join(b'/%s %d 0 R' % (font.encode(), ref) for font, ref in fonts.items()),
+        b' '.join(b'/%s %d 0 R' % (name.encode(), ref) for name, ref in images.items()),
+    )
+
+    page_refs = []
+    for ops in layout.pages:
+        stream = zlib.compress(b'\n'.join(ops))
+        content = add(b'<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream' % (len(stream), stream))
+        page_refs.append(add(b'<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] /Resources %s /Contents %d 0 R >>'
+                             % (pages, PAGE_WIDTH, PAGE_HEIGHT, resources, content)))
+    objects[catalog - 1] = b'<< /Type /Catalog /Pages %d 0 R >>' % pages
+    objects[pages - 1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (
+        b' '.join(b'%d 0 R' % ref for ref in page_refs), len(page_refs))
+    info = add(b'<< /Title %s /Producer (ATS Resume Builder) >>' % _pdf_string(title))
+
+    out = BytesIO()
+    out.write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b'%d 0 obj\n%s\nendobj\n' % (number, body))
+    xref = out.tell()
+    out.write(b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1))
+    out.write(b''.join(b'%010d 00000 n \n' % offset for offset in offsets))
+    out.write(b'trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n'
+              % (len(objects) + 1, catalog, info, xref))
+    return out.getvalue()
+
+
+def render_text_pdf(pages, title, size=10):
+    """Return a plain PDF of text lines, starting a new page for each entry of ``pages``.
+
+    Each entry is a list of lines, wrapped to the page margins. Used for
+    sample documents such as the benchmark corpus.
+    """
+    layout = _Layout()
+    for i, lines in enumerate(pages):
+        if i:
+            layout.ensure(PAGE_HEIGHT)
+        for line in lines:
+            layout.paragraph(line, size=size)
+    return _serialize(layout, title)
+
+
+def clear_pdf_cache():
+    with _pdf_cache_lock:
+        _pdf_cache.clear()
+
+
+def render_pdf(data):
+    """Return the resume as PDF bytes, reusing the cached file for unchanged data."""
+    key = resume_key(data)
+    with _pdf_cache_lock:
+        pdf = _pdf_cache.get(key)
+        if pdf is not None:
+            _pdf_cache.move_to_end(key)
+            metrics.count("pdf_cache_hit")
+            return pdf
+
+    with metrics.timer("render_pdf"):
+        pdf = _serialize(_layout_resume(data), f"{data.get('name') or 'Resume'} - Resume")
+
+    with _pdf_cache_lock:
+        _pdf_cache[key] = pdf
+        while len(_pdf_cache) > MAX_CACHED_PDFS:
+            _pdf_cache.popitem(last=False)
+    return pdf
@@ -0,0 +1,303 @@
+"""HTML rendering of the resume shown and downloaded in Tab 4.
+
+The document is assembled from small templates that are split into literal
+and field parts once, at import; rendering appends escaped field values and
+literals to a list and joins it once. Rendered documents are cached by a hash
+of the resume data, so Streamlit reruns with unchanged data cost one hash.
+``render_resume`` is shared by the app and the HTTP API.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from html import escape
+from string import Formatter
+from urllib.parse import urlsplit
+
+import metrics
+from photo import prepare_photo
+
+MAX_CACHED_RENDERS = 32
+# Contact links with any other scheme (javascript:, data:, ...) are shown as plain text
+LINK_SCHEMES = frozenset({'http', 'https', 'mailto'})
+
+_render_cache = OrderedDict()
+_render_cache_lock = threading.Lock()
+
+RESUME_STYLE = """<style>
+    body {
+        font-family: Arial, Helvetica, sans-serif;
+        line-height: 1.6;
+        color: #333;
+        max-width: 850px;
+        margin: 0 auto;
+        padding: 20px;
+    }
+    .header {
+        text-align: center;
+        margin-bottom: 20px;
+    }
+    .profile-photo {
+        width: 120px;
+        height: 120px;
+        border-radius: 50%;
+        object-fit: cover;
+        margin: 0 auto 15px;
+        display: block;
+        border: 3px solid #2c3e50;
+    }
+    h1 {
+        font-size: 32px;
+        margin: 10px 0 5px 0;
+        color: #2c3e50;
+    }
+    h2 {
+        font-size: 18px;
+        border-bottom: 2px solid #2c3e50;
+        padding-bottom: 5px;
+        margin-top: 20px;
+        margin-bottom: 10px;
+        text-transform: uppercase;
+        color: #2c3e50;
+    }
+    .contact {
+        text-align: center;
+        margin-bottom: 20px;
+        font-size: 14px;
+        line-height: 1.8;
+    }
+    .contact a {
+        color: #2980b9;
+        text-decoration: none;
+        font-weight: 500;
+    }
+    .contact a:hover {
+        text-decoration: underline;
+    }
+    
+    /* Print styles - show full URLs */
+    @media print {
+        .contact a {
+            color: #2980b9;
+            text-decoration: underline;
+        }
+        .contact a:after {
+            content: "";
+        }
+    }
+    .section {
+        margin-bottom: 20px;
+    }
+    .job, .edu, .project {
+        margin-bottom: 15px;
+    }
+    .job-header, .edu-header, .project-header {
+        display: flex;
+        justify-content: space-between;
+        margin-bottom: 5px;
+    }
+    .job-title, .degree, .project-name {
+        font-weight: bold;
+        font-size: 16px;
+    }
+    .company, .institution {
+        font-style: italic;
+    }
+    .date {
+        color: #7f8c8d;
+        font-size: 14px;
+    }
+    ul {
+        margin: 5px 0;
+        padding-left: 20px;
+    }
+    li {
+        margin-bottom: 3px;
+    }
+    .skills {
+        display: flex;
+        flex-wrap: wrap;
+        gap: 5px;
+    }
+    .skill {
+        background: #ecf0f1;
+        padding: 5px 10px;
+        border-radius: 3px;
+        font-size: 14px;
+    }
+    .project-desc {
+        margin-top: 5px;
+        text-align: justify;
+    }
+</style>"""
+
+
+class Template:
+    """A ``{field}`` template parsed once into ``(literal, field)`` parts."""
+
+    def __init__(self, source):
+        self.parts = [(literal, field) for literal, field, _, _ in Formatter().parse(source)]
+
+    def render_into(self, out, values):
+        """Append the template to ``out``; ``values`` must already be escaped."""
+        for literal, field in self.parts:
+            out.append(literal)
+            if field is not None:
+                out.append(values[field])
+
+
+DOCUMENT_START = '<!DOCTYPE html>\n<html>\n<head>\n<meta charset="UTF-8">\n' + RESUME_STYLE + '\n</head>\n<body>\n'
+DOCUMENT_END = '</body></html>'
+
+HEADER = Template('<div class="header">\n{photo}<h1>{name}</h1>\n</div>\n')
+PHOTO = Template('<img src="{src}" class="profile-photo">\n')
+CONTACT = Template('<div class="contact">\n{items}\n</div>\n')
+LINK = Template("<a href='{url}' target='_blank'>{url}</a>")
+SUMMARY = Template('<div class="section">\n<h2>Professional Summary</h2>\n<p>{summary}</p>\n</div>\n')
+SECTION_START = Template("<div class='section'><h2>{title}</h2>")
+SECTION_END = '</div>\n'
+
+JOB = Template(
+    '<div class="job">\n'
+    '<div class="job-header">\n'
+    '<div>\n<div class="job-title">{title}</div>\n<div class="company">{company}</div>\n</div>\n'
+    '<div class="date">{start} - {end}</div>\n'
+    '</div>\n<ul>\n'
+)
+JOB_END = '</ul></div>\n'
+PROJECT = Template(
+    '<div class="project">\n'
+    '<div class="project-name">{title}</div>\n'
+    '<p class="project-desc">{description}</p>\n'
+    '</div>\n'
+)
+EDUCATION = Template(
+    '<div class="edu">\n'
+    '<div class="edu-header">\n'
+    '<div>\n<div class="degree">{degree}</div>\n<div class="institution">{institution}</div>\n</div>\n'
+    '<div class="date">{start} - {end}</div>\n'
+    '</div>\n{gpa}</div>\n'
+)
+GPA = Template('<div>GPA: {gpa}</div>\n')
+LIST_ITEM = Template('<li>{text}</li>')
+SKILL = Template("<span class='skill'>{skill}</span>")
+
+
+def _escaped(item, *fields):
+    return {name: escape(str(item.get(name, ''))) for name in fields}
+
+
+def safe_link(url):
+    """Return ``url`` as an href if it is http(s) or mailto, else None.
+
+    Bare addresses like ``linkedin.com/in/jane`` get ``https://``.
+    """
+    url = url.strip()
+    try:
+        scheme = urlsplit(url).scheme.lower()
+    except ValueError:
+        return None
+    if not scheme:
+        return 'https://' + url if url else None
+    return url if scheme in LINK_SCHEMES else None
+
+
+def resume_key(data):
+    """Return a stable hash of the resume data, photo bytes included."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps({k: v for k, v in data.items() if k != 'photo'},
+                             sort_keys=True, default=str).encode('utf-8'))
+    if data.get('photo'):
+        digest.update(hashlib.sha256(data['photo']).digest())
+    return digest.hexdigest()
+
+
+def clear_render_cache():
+    with _render_cache_lock:
+        _render_cache.clear()
+
+
+@metrics.timed("render")
+def _render(data):
+    out = [DOCUMENT_START]
+
+    photo = []
+    prepared = prepare_photo(data['photo']) if data.get('photo') else None
+    if prepared:
+        PHOTO.render_into(photo, {'src': prepared.data_uri})
+    HEADER.render_into(out, {'photo': ''.join(photo), 'name': escape(str(data.get('name') or 'Your Name'))})
+
+    contact = [escape(str(data[key])) for key in ('location', 'phone', 'email') if data.get(key)]
+    for key in ('linkedin', 'github', 'portfolio'):
+        if data.get(key):
+            url = safe_link(str(data[key]))
+            if url is None:
+                contact.append(escape(str(data[key])))
+                continue
+            link = []
+            LINK.render_into(link, {'url': escape(url)})
+            contact.append(''.join(link))
+    CONTACT.render_into(out, {'items': ' | '.join(contact)})
+    SUMMARY.render_into(out, {'summary': escape(str(data.get('summary', '')))})
+
+    if data.get('experiences'):
+        SECTION_START.render_into(out, {'title': 'Work Experience'})
+        for exp in data['experiences']:
+            JOB.render_into(out, _escaped(exp, 'title', 'company', 'start', 'end'))
+            for resp in exp.get('responsibilities', []):
+                if resp.strip():
+                    LIST_ITEM.render_into(out, {'text': escape(resp.strip())})
+            out.append(JOB_END)
+        out.append(SECTION_END)
+
+    if data.get('projects'):
+        SECTION_START.render_into(out, {'title': 'Key Projects'})
+        for proj in data['projects']:
+            PROJECT.render_into(out, _escaped(proj, 'title', 'description'))
+        out.append(SECTION_END)
+
+    if data.get('education'):
+        SECTION_START.render_into(out, {'title': 'Education'})
+        for edu in data['education']:
+            gpa = []
+            if edu.get('gpa'):
+                GPA.render_into(gpa, _escaped(edu, 'gpa'))
+            EDUCATION.render_into(out, {**_escaped(edu, 'degree', 'institution', 'start', 'end'), 'gpa': ''.join(gpa)})
+        out.append(SECTION_END)
+
+    if data.get('technical_skills'):
+        SECTION_START.render_into(out, {'title': 'Technical Skills'})
+        out.append("<div class='skills'>")
+        for skill in data['technical_skills']:
+            SKILL.render_into(out, {'skill': escape(skill)})
+        out.append('</div>' + SECTION_END)
+
+    if data.get('certifications'):
+        SECTION_START.render_into(out, {'title': 'Certifications'})
+        out.append('<ul>')
+        for cert in data['certifications']:
+            LIST_ITEM.render_into(out, {'text': escape(cert)})
+        out.append('</ul>' + SECTION_END)
+
+    out.append(DOCUMENT_END)
+    return ''.join(out)
+
+
+def render_resume(data):
+    """Return the complete HTML document for a saved resume dict (cached by content)."""
+    key = resume_key(data)
+    with _render_cache_lock:
+        html = _render_cache.get(key)
+        if html is not None:
+            _render_cache.move_to_end(key)
+            metrics.count("render_cache_hit")
+            return html
+
+    html = _render(data)
+
+    with _render_cache_lock:
+        _render_cache[key] = html
+        while len(_render_cache) > MAX_CACHED_RENDERS:
+            _render_cache.popitem(last=False)
+    return html
@@ -0,0 +1,189 @@
+"""Persistent per-session state for the Streamlit app.
+
+Resume drafts, the uploaded CV text, the photo and analysis results are
+written to a shared store keyed by ``(session id, key)``, so a user's work
+survives process restarts and can be served by any app replica that can
+reach the store. The app reads each key from the store the first time a session
+touches it in a process, instead of keeping every user's state resident.
+
+Backends:
+
+* ``SqliteSessionStore`` - the default; one table in WAL mode, so several
+  processes on the same host can share the file. WAL relies on shared
+  memory, so the file must not live on a network volume (NFS, SMB) used by
+  replicas on other hosts
+* ``FileSessionStore`` - one file per key under a directory (atomic
+  replaces), which also works on a volume shared between hosts
+
+Session ids are random tokens issued by the server (``issue_session_id``)
+and recorded in the store; an id that was never issued is not accepted
+(``session_issued``), so a link cannot pin a victim to an id chosen by
+someone else. Anyone holding an issued id can read that session, so the id
+is a credential.
+
+Values are stored as zlib-compressed JSON. ``bytes`` (photos) are
+base64-encoded and ``ats_engine.Analysis`` results are stored as plain dicts,
+so no pickles are ever loaded back.
+"""
+
+import base64
+import json
+import os
+import re
+import secrets
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+
+from ats_engine import Analysis
+
+SQLITE_EXTENSIONS = {".db", ".sqlite", ".sqlite3"}
+SESSION_ID_PATTERN = re.compile(r'[A-Za-z0-9_-]{8,64}')
+SESSION_ID_BYTES = 32
+# Written when an id is issued; a session without it was never handed out by this app
+ISSUED_KEY = "__issued__"
+
+
+def new_session_id():
+    return secrets.token_urlsafe(SESSION_ID_BYTES)
+
+
+def issue_session_id(store):
+    """Create a session id and record it in ``store`` as issued."""
+    session_id = new_session_id()
+    store.put(session_id, ISSUED_KEY, time.time())
+    return session_id
+
+
+def session_issued(store, session_id):
+    """True if ``session_id`` is well-formed and was issued through ``issue_session_id``."""
+    return valid_session_id(session_id) and store.get(session_id, ISSUED_KEY) is not None
+
+
+def valid_session_id(session_id):
+    """True for ids safe to use as keys and directory names."""
+    return bool(session_id) and SESSION_ID_PATTERN.fullmatch(session_id) is not None
+
+
+def _encode_default(value):
+    if isinstance(value, bytes):
+        return {"__bytes__": base64.b64encode(value).decode("ascii")}
+    if isinstance(value, Analysis):
+        return {"__analysis__": value.to_dict()}
+    raise TypeError(f"Cannot store {type(value).__name__} in the session store")
+
+
+def _decode_hook(obj):
+    if "__bytes__" in obj:
+        return base64.b64decode(obj["__bytes__"])
+    if "__analysis__" in obj:
+        return Analysis.from_dict(obj["__analysis__"])
+    return obj
+
+
+def dumps(value):
+    """Serialize a session value to compact bytes."""
+    return zlib.compress(json.dumps(value, default=_encode_default, separators=(",", ":")).encode("utf-8"))
+
+
+def loads(blob):
+    return json.loads(zlib.decompress(blob).decode("utf-8"), object_hook=_decode_hook)
+
+
+class SqliteSessionStore:
+    """Session values in a SQLite table keyed by ``(session_id, key)``."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS session_values ("
+                " session_id TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, updated REAL NOT NULL,"
+                " PRIMARY KEY (session_id, key))"
+            )
+
+    def get(self, session_id, key, default=None):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM session_values WHERE session_id = ? AND key = ?",
+                                     (session_id, key)).fetchone()
+        return loads(row[0]) if row else default
+
+    def put(self, session_id, key, value):
+        blob = dumps(value)
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO session_values VALUES (?, ?, ?, ?)",
+                               (session_id, key, blob, time.time()))
+
+    def delete(self, session_id):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM session_values WHERE session_id = ?", (session_id,))
+
+    def sizes(self, session_id):
+        """Return ``{key: stored bytes}`` for a session."""
+        with self._lock:
+            rows = self._conn.execute("SELECT key, length(value) FROM session_values WHERE session_id = ?",
+                                      (session_id,)).fetchall()
+        return dict(rows)
+
+
+class FileSessionStore:
+    """Session values as ``<directory>/<session id>/<key>.json.z`` files."""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, session_id, key):
+        return self.directory / session_id / f"{key}.json.z"
+
+    def get(self, session_id, key, default=None):
+        path = self._path(session_id, key)
+        if not path.exists():
+            return default
+        return loads(path.read_bytes())
+
+    def put(self, session_id, key, value):
+        path = self._path(session_id, key)
+        path.parent.mkdir(exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(dumps(value))
+        os.replace(tmp, path)
+
+    def delete(self, session_id):
+        session_dir = self.directory / session_id
+        if session_dir.is_dir():
+            for path in session_dir.iterdir():
+                path.unlink()
+            session_dir.rmdir()
+
+    def sizes(self, session_id):
+        session_dir = self.directory / session_id
+        if not session_dir.is_dir():
+            return {}
+        return {path.name[:-len(".json.z")]: path.stat().st_size for path in session_dir.glob("*.json.z")}
+
+
+def open_session_store(location):
+    """Open a SQLite store for ``.db``/``.sqlite`` paths, otherwise a file store directory."""
+    if Path(location).suffix.lower() in SQLITE_EXTENSIONS:
+        return SqliteSessionStore(location)
+    return FileSessionStore(location)
+
+
+# Opened on first use; set ATS_SESSION_STORE to a shared .db file or a directory
+DEFAULT_SESSION_STORE = "ats_sessions.db"
+_session_store = None
+_session_store_lock = threading.Lock()
+
+
+def get_session_store():
+    global _session_store
+    with _session_store_lock:
+        if _session_store is None:
+            _session_store = open_session_store(os.environ.get("ATS_SESSION_STORE", DEFAULT_SESSION_STORE))
+        return _session_store